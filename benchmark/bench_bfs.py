@@ -0,0 +1,73 @@
+"""Compare breadth first distances computed on a CSRGraph with a
+traversal using the generators of Graph.
+
+usage: python bench_bfs.py [nb_vertices] [nb_sources]
+"""
+
+import sys
+from random import Random
+from timeit import default_timer
+
+import numpy as np
+
+from openalea.container.bfs import bfs_distance_matrix, bfs_distances
+from openalea.container.csr_graph import CSRGraph
+from openalea.container.graph import Graph
+
+
+def random_graph(nb, degree, seed=0):
+    rnd = Random(seed)
+    g = Graph()
+    for vid in xrange(nb):
+        g.add_vertex(vid)
+    for i in xrange(nb * degree):
+        g.add_edge(rnd.randrange(nb), rnd.randrange(nb))
+    return g
+
+
+def naive_distances(graph, source):
+    dist = {source: 0}
+    front = [source]
+    while front:
+        new_front = []
+        for vid in front:
+            for nid in graph.out_neighbors(vid):
+                if nid not in dist:
+                    dist[nid] = dist[vid] + 1
+                    new_front.append(nid)
+        front = new_front
+    return dist
+
+
+def main(nb, nb_sources):
+    g = random_graph(nb, 4)
+    sources = range(nb_sources)
+    print("%d vertices, %d edges, %d sources" % (nb, g.nb_edges(),
+                                                 nb_sources))
+
+    t0 = default_timer()
+    for vid in sources:
+        naive_distances(g, vid)
+    naive = default_timer() - t0
+    print("generator bfs         %10.3f s" % naive)
+
+    t0 = default_timer()
+    csr = CSRGraph(g)
+    print("csr construction      %10.3f s" % (default_timer() - t0))
+
+    t0 = default_timer()
+    for pos in sources:
+        bfs_distances(csr, [pos])
+    print("bfs_distances         %10.3f s" % (default_timer() - t0))
+
+    t0 = default_timer()
+    for start in range(0, nb_sources, 64):
+        bfs_distance_matrix(csr, np.array(sources[start:start + 64]))
+    elapsed = default_timer() - t0
+    print("bfs_distance_matrix   %10.3f s (x%.0f)" % (elapsed,
+                                                     naive / elapsed))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 256)
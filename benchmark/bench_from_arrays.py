@@ -0,0 +1,42 @@
+"""Compare the construction of a graph from arrays of sources and
+targets with a loop calling add_edge.
+
+usage: python bench_from_arrays.py [nb_vertices]
+"""
+
+import sys
+from timeit import default_timer
+
+import numpy as np
+
+from openalea.container.graph import Graph
+
+
+def build_with_loop(nb, sources, targets):
+    g = Graph()
+    for vid in xrange(nb):
+        g.add_vertex(vid)
+    for sid, tid in zip(sources.tolist(), targets.tolist()):
+        g.add_edge(sid, tid)
+    return g
+
+
+def main(nb):
+    rnd = np.random.RandomState(0)
+    sources = rnd.randint(0, nb, 4 * nb)
+    targets = rnd.randint(0, nb, 4 * nb)
+    print("%d vertices, %d edges" % (nb, len(sources)))
+
+    for storage in ("dict", "array"):
+        t0 = default_timer()
+        Graph.from_arrays(sources, targets, np.arange(nb), storage=storage)
+        print("from_arrays (%s storage) %10.2f s"
+              % (storage, default_timer() - t0))
+
+    t0 = default_timer()
+    build_with_loop(nb, sources, targets)
+    print("add_edge loop              %10.2f s" % (default_timer() - t0))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
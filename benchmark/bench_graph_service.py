@@ -0,0 +1,68 @@
+"""Throughput of a GraphServer under concurrent clients, querying the
+neighbors of vertices one at a time versus by batches.
+
+usage: python bench_graph_service.py [nb_clients]
+"""
+
+import sys
+from random import Random
+from threading import Thread
+from timeit import default_timer
+
+from openalea.container.graph_service import (GraphClient,
+                                              GraphServer,
+                                              GraphService)
+from openalea.container.property_graph import PropertyGraph
+
+
+def random_graph(nb, degree=4, seed=0):
+    rnd = Random(seed)
+    g = PropertyGraph()
+    for vid in xrange(nb):
+        g.add_vertex(vid)
+    for i in xrange(nb * degree):
+        g.add_edge(rnd.randrange(nb), rnd.randrange(nb))
+    g.add_vertex_property("val", dict((vid, rnd.random())
+                                      for vid in xrange(nb)))
+    return g
+
+
+def run_clients(address, nb_clients, nb_queries, batch_size):
+    def run():
+        rnd = Random()
+        with GraphClient(address) as client:
+            for i in xrange(nb_queries // batch_size):
+                vids = [rnd.randrange(10000) for j in xrange(batch_size)]
+                client.out_neighbors(vids)
+
+    threads = [Thread(target=run) for i in range(nb_clients)]
+    t0 = default_timer()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return nb_clients * nb_queries / (default_timer() - t0)
+
+
+def main(nb_clients):
+    service = GraphService(random_graph(10000))
+    service.start()
+    server = GraphServer(service)
+    server.start()
+
+    print("%-12s %20s %20s" % ("batch size", "vertices / s", "evaluated"))
+    for batch_size in (1, 10, 100, 1000):
+        nb_evaluations = service.nb_evaluations
+        nb_queries = 2000 if batch_size == 1 else 20000
+        throughput = run_clients(server.address, nb_clients, nb_queries,
+                                 batch_size)
+        ratio = (service.nb_evaluations - nb_evaluations) / float(
+            nb_clients * nb_queries)
+        print("%-12d %20.0f %19.0f%%" % (batch_size, throughput, ratio * 100))
+
+    server.close()
+    service.stop()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 8)
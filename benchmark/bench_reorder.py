@@ -0,0 +1,65 @@
+"""Compare traversal and neighborhood reduction speed of a CSRGraph laid
+out by vertex id versus laid out with a locality preserving order.
+
+usage: python bench_reorder.py [nb_vertices]
+"""
+
+import sys
+from random import Random
+from timeit import default_timer
+
+import numpy as np
+
+from openalea.container.csr_graph import CSRGraph
+from openalea.container.graph import Graph
+from openalea.container.reorder import bfs_order, rcm_order
+
+
+def scrambled_tree(nb, seed=0):
+    """Random tree whose vertex ids are unrelated to its topology.
+    """
+    rnd = Random(seed)
+    vids = range(nb)
+    rnd.shuffle(vids)
+    g = Graph()
+    for vid in vids:
+        g.add_vertex(vid)
+    for i in xrange(1, nb):
+        parent = vids[rnd.randrange(max(0, i - 10), i)]
+        g.add_edge(parent, vids[i])
+    return g, vids[0]
+
+
+def best_time(func, repeat=5):
+    best = None
+    for i in range(repeat):
+        t0 = default_timer()
+        func()
+        duration = default_timer() - t0
+        if best is None or duration < best:
+            best = duration
+    return best
+
+
+def main(nb):
+    g, root = scrambled_tree(nb)
+    layouts = [("vertex id", None)]
+    t0 = default_timer()
+    layouts.append(("bfs", bfs_order(g, [root])))
+    print("bfs order computed in %.2f s" % (default_timer() - t0))
+    t0 = default_timer()
+    layouts.append(("rcm", rcm_order(g)))
+    print("rcm order computed in %.2f s" % (default_timer() - t0))
+
+    print("%-10s %12s %12s" % ("layout", "reduce (ms)", "bfs (ms)"))
+    for name, order in layouts:
+        csr = CSRGraph(g, order)
+        values = np.random.random(nb)
+        start = csr.position(root)
+        t_reduce = best_time(lambda: csr.neighbor_reduce(values))
+        t_bfs = best_time(lambda: csr.bfs(start), repeat=3)
+        print("%-10s %12.2f %12.2f" % (name, t_reduce * 1e3, t_bfs * 1e3))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
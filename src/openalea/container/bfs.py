@@ -0,0 +1,197 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+#       BFS : container package
+#
+#       Distributed under the Cecill-C License.
+#       See accompanying file LICENSE.txt or copy at
+#           http://www.cecill.info/licences/Licence_CeCILL-C_V1-en.html
+#
+"""This module provide breadth first distances computed on a CSRGraph.
+
+Traversals are level synchronous, all the vertices of a level, the
+frontier, are expanded at once with array operations. Vertices are
+identified by their position in the CSRGraph, `CSRGraph.vids` gives the
+id of the vertex at each position and `CSRGraph.positions` the position
+of a list of vertices.
+
+Distances are expressed in number of edges, unreachable vertices
+receive a distance of -1.
+
+This module requires NumPy.
+"""
+
+import numpy as np
+
+_directions = ("out", "in", "both")
+
+
+def _adjacencies(csr, direction):
+    """(indptr, indices) arrays to follow for a direction.
+    """
+    if direction == "out":
+        return [(csr.out_indptr, csr.out_indices)]
+    if direction == "in":
+        return [(csr.in_indptr, csr.in_indices)]
+    if direction == "both":
+        return [(csr.out_indptr, csr.out_indices),
+                (csr.in_indptr, csr.in_indices)]
+    msg = "the required direction (%s) is unknown" % direction
+    msg += "\navailable directions are %s" % str(list(_directions))
+    raise UserWarning(msg)
+
+
+def _expand(adjacencies, frontier):
+    """Neighbors of each vertex of the frontier.
+
+    args:
+     - adjacencies (list of (np.array, np.array)): (indptr, indices)
+     - frontier (np.array of int): positions
+
+    return:
+     - (np.array of int, np.array of int): index in frontier and
+                                           position of each neighbor
+    """
+    owners = []
+    nids = []
+    for indptr, indices in adjacencies:
+        starts = indptr[frontier]
+        counts = indptr[frontier + 1] - starts
+        total = counts.sum()
+        if total == 0:
+            continue
+        owner = np.repeat(np.arange(len(frontier)), counts)
+        # offset of each neighbor in its own row
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts,
+                                               counts)
+        owners.append(owner)
+        nids.append(indices[starts[owner] + offsets])
+    if len(nids) == 0:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+    return np.concatenate(owners), np.concatenate(nids)
+
+
+def _unique(values, scratch):
+    """Remove duplicates from an array of indices without sorting it.
+
+    args:
+     - values (np.array of int): indices in scratch
+     - scratch (np.array of int): work array, content is overwritten
+
+    return:
+     - (np.array of int)
+    """
+    order = np.arange(len(values))
+    scratch[values] = order
+    return values[scratch[values] == order]
+
+
+def _as_positions(csr, sources):
+    sources = np.unique(np.asarray(sources, dtype=int))
+    if len(sources) > 0 and (sources[0] < 0 or
+                             sources[-1] >= csr.nb_vertices()):
+        raise IndexError("source positions out of range")
+    return sources
+
+
+def bfs_distances(csr, sources, direction="out", max_depth=None):
+    """Distance of each vertex to the nearest source.
+
+    args:
+     - csr (CSRGraph)
+     - sources (iter of int): positions of sources
+     - direction (str): 'out' (default) to follow edges, 'in' to walk
+                        them backward, 'both' to ignore their direction
+     - max_depth (int): vertices further than max_depth are considered
+                        unreachable, if None (default) no limit
+
+    return:
+     - (np.array of int): distance of each vertex, indexed by position,
+                          -1 for unreachable vertices
+    """
+    adjacencies = _adjacencies(csr, direction)
+    frontier = _as_positions(csr, sources)
+    dist = np.full(csr.nb_vertices(), -1, dtype=int)
+    dist[frontier] = 0
+    scratch = np.empty_like(dist)
+    level = 0
+    while len(frontier) > 0 and (max_depth is None or level < max_depth):
+        level += 1
+        nids = _expand(adjacencies, frontier)[1]
+        frontier = _unique(nids[dist[nids] < 0], scratch)
+        dist[frontier] = level
+    return dist
+
+
+def bfs_distance_matrix(csr, sources=None, direction="out", max_depth=None):
+    """Distances from each source to each vertex.
+
+    All sources are traversed together, one level at a time. The matrix
+    holds nb_sources * nb_vertices integers, split sources in chunks for
+    large graphs.
+
+    args:
+     - csr (CSRGraph)
+     - sources (iter of int): positions of sources, if None (default)
+                              all vertices in order of position
+     - direction (str): 'out' (default) to follow edges, 'in' to walk
+                        them backward, 'both' to ignore their direction
+     - max_depth (int): vertices further than max_depth are considered
+                        unreachable, if None (default) no limit
+
+    return:
+     - (np.array of int): dist[i, pos] distance from the ith source to
+                          the vertex at position pos, -1 if unreachable
+    """
+    adjacencies = _adjacencies(csr, direction)
+    nb = csr.nb_vertices()
+    if sources is None:
+        sources = np.arange(nb)
+    else:
+        sources = np.asarray(sources, dtype=int)
+        if len(sources) > 0 and (sources.min() < 0 or sources.max() >= nb):
+            raise IndexError("source positions out of range")
+
+    dist = np.full((len(sources), nb), -1, dtype=int)
+    flat = dist.reshape(-1)
+    # frontier of pairs (source index, position)
+    rows = np.arange(len(sources))
+    frontier = sources.copy()
+    dist[rows, frontier] = 0
+    scratch = np.empty_like(flat)
+    level = 0
+    while len(frontier) > 0 and (max_depth is None or level < max_depth):
+        level += 1
+        owners, nids = _expand(adjacencies, frontier)
+        keys = rows[owners] * nb + nids
+        keys = _unique(keys[flat[keys] < 0], scratch)
+        flat[keys] = level
+        rows, frontier = np.divmod(keys, nb)
+    return dist
+
+
+def eccentricity(csr, sources=None, direction="both", chunk=256):
+    """Largest distance from each source to a reachable vertex.
+
+    args:
+     - csr (CSRGraph)
+     - sources (iter of int): positions of sources, if None (default)
+                              all vertices in order of position
+     - direction (str): 'both' (default) to ignore the direction of
+                        edges, 'out' to follow them, 'in' to walk them
+                        backward
+     - chunk (int): number of sources traversed together, bounds the
+                    memory used to chunk * nb_vertices integers
+
+    return:
+     - (np.array of int): eccentricity of each source
+    """
+    if sources is None:
+        sources = np.arange(csr.nb_vertices())
+    sources = np.asarray(sources, dtype=int)
+    res = np.zeros(len(sources), dtype=int)
+    for start in range(0, len(sources), chunk):
+        dist = bfs_distance_matrix(csr, sources[start:start + chunk],
+                                   direction)
+        res[start:start + chunk] = dist.max(axis=1)
+    return res
@@ -0,0 +1,224 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+#       Components : container package
+#
+#       Distributed under the Cecill-C License.
+#       See accompanying file LICENSE.txt or copy at
+#           http://www.cecill.info/licences/Licence_CeCILL-C_V1-en.html
+#
+"""This module provide an incremental tracking of the connected
+components of a graph, ignoring edge directions.
+
+Components are stored in a union-find structure with path compression
+and union by size. Adding a vertex or an edge updates the structure in
+near constant time. Removals may split a component, the component is
+only marked as dirty and recomputed, by a traversal of its own vertices,
+the next time it is queried.
+"""
+
+from graph import GraphObserver, InvalidVertex
+
+
+class ComponentTracker(GraphObserver):
+    """Maintain the connected components of a graph.
+    """
+
+    def __init__(self, graph):
+        """Constructor
+
+        Compute the components of the graph and track its modifications
+        until `detach` is called.
+
+        args:
+         - graph (Graph)
+        """
+        self.graph = graph
+        self._parent = {}
+        self._members = {}
+        self._dirty = set()
+        self.rebuild()
+        graph.add_observer(self)
+        graph._component_tracker = self
+
+    def detach(self):
+        """Stop tracking modifications of the graph.
+        """
+        self.graph.remove_observer(self)
+        del self.graph._component_tracker
+
+    # ##########################################################
+    #
+    # union find
+    #
+    # ##########################################################
+    def _find(self, vid):
+        """Representative of the component of a vertex.
+        """
+        parent = self._parent
+        root = vid
+        while parent[root] != root:
+            root = parent[root]
+        # path compression
+        while parent[vid] != root:
+            parent[vid], vid = root, parent[vid]
+        return root
+
+    def _union(self, vid1, vid2):
+        root1 = self._find(vid1)
+        root2 = self._find(vid2)
+        if root1 == root2:
+            return
+        members = self._members
+        if len(members[root1]) < len(members[root2]):
+            root1, root2 = root2, root1
+        self._parent[root2] = root1
+        members[root1].extend(members.pop(root2))
+        if root2 in self._dirty:
+            self._dirty.discard(root2)
+            self._dirty.add(root1)
+
+    def _label(self, vids):
+        """Compute components of a set of vertices closed under adjacency.
+        """
+        vertices = self.graph._vertices
+        edges = self.graph._edges
+        parent = self._parent
+        for vid in vids:
+            parent.pop(vid, None)
+        for start in vids:
+            if start in parent:
+                continue
+            parent[start] = start
+            component = [start]
+            front = [start]
+            while front:
+                record = vertices[front.pop()]
+                for eid in record.in_edges():
+                    nid = edges[eid][0]
+                    if nid not in parent:
+                        parent[nid] = start
+                        component.append(nid)
+                        front.append(nid)
+                for eid in record.out_edges():
+                    nid = edges[eid][1]
+                    if nid not in parent:
+                        parent[nid] = start
+                        component.append(nid)
+                        front.append(nid)
+            self._members[start] = component
+
+    def _clean(self, root):
+        """Recompute a dirty component.
+        """
+        self._dirty.discard(root)
+        vertices = self.graph._vertices
+        old = self._members.pop(root)
+        for vid in old:
+            del self._parent[vid]
+        self._label([vid for vid in old if vid in vertices])
+
+    def _clean_all(self):
+        for root in list(self._dirty):
+            self._clean(root)
+
+    def rebuild(self):
+        """Compute all components from scratch.
+        """
+        self._parent = {}
+        self._members = {}
+        self._dirty = set()
+        self._label(list(self.graph._vertices))
+
+    # ##########################################################
+    #
+    # queries
+    #
+    # ##########################################################
+    def component(self, vid):
+        """Representative of the component of a vertex.
+
+        The representative is a vertex of the component, it may change
+        when the graph is modified.
+
+        args:
+         - vid (int): id of vertex
+
+        return:
+         - (int): id of vertex
+        """
+        if vid not in self.graph._vertices:
+            raise InvalidVertex(vid)
+        root = self._find(vid)
+        if root in self._dirty:
+            self._clean(root)
+            root = self._find(vid)
+        return root
+
+    def same_component(self, vid1, vid2):
+        """Test whether two vertices are connected.
+
+        args:
+         - vid1 (int): id of vertex
+         - vid2 (int): id of vertex
+
+        return:
+         - (bool)
+        """
+        return self.component(vid1) == self.component(vid2)
+
+    def component_vertices(self, vid):
+        """Vertices connected to a given vertex.
+
+        args:
+         - vid (int): id of vertex
+
+        return:
+         - (list of int): ids of vertices, vid included
+        """
+        return list(self._members[self.component(vid)])
+
+    def nb_components(self):
+        """Number of connected components.
+
+        return:
+         - (int)
+        """
+        self._clean_all()
+        return len(self._members)
+
+    def components(self):
+        """Vertices of each connected component.
+
+        return:
+         - (list of list of int)
+        """
+        self._clean_all()
+        return [list(members) for members in self._members.itervalues()]
+
+    # ##########################################################
+    #
+    # graph observer
+    #
+    # ##########################################################
+    def vertex_added(self, vid):
+        if vid in self._parent:
+            # id of a removed vertex whose component is still dirty
+            self._clean(self._find(vid))
+        else:
+            self._parent[vid] = vid
+            self._members[vid] = [vid]
+
+    def vertex_removed(self, vid):
+        # attached edges have been removed through remove_edge
+        self._dirty.add(self._find(vid))
+
+    def edge_added(self, eid, sid, tid):
+        self._union(sid, tid)
+
+    def edge_removed(self, eid, sid, tid):
+        if sid != tid:
+            self._dirty.add(self._find(sid))
+
+    def reset(self):
+        self.rebuild()
@@ -0,0 +1,235 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+#       CSRGraph : container package
+#
+#       Distributed under the Cecill-C License.
+#       See accompanying file LICENSE.txt or copy at
+#           http://www.cecill.info/licences/Licence_CeCILL-C_V1-en.html
+#
+"""This module provide a frozen, array based, copy of the topology of a
+graph stored in compressed sparse row (CSR) format.
+
+Vertices are identified by their position in the layout. Laying out the
+vertices in an order computed by `reorder` keeps neighbors close in
+memory and speeds up traversals and neighborhood reductions.
+
+This module requires NumPy.
+"""
+
+import numpy as np
+
+from graph import InvalidVertex
+
+
+def _compressed(rows, cols, eids, nb):
+    """Sort (rows, cols, eids) by rows then cols and compute row pointers.
+    """
+    perm = np.lexsort((cols, rows))
+    indptr = np.zeros(nb + 1, dtype=int)
+    np.cumsum(np.bincount(rows, minlength=nb), out=indptr[1:])
+    return indptr, cols[perm], eids[perm]
+
+
+class CSRGraph(object):
+    """Read only graph with adjacency stored in arrays.
+
+    In this implementation:
+
+        - vids[pos] is the id of the vertex at position pos
+        - out_indices[out_indptr[pos]:out_indptr[pos + 1]] are the positions
+          of the targets of the edges leaving the vertex at position pos,
+          out_eids store the ids of these edges
+        - in_indptr, in_indices and in_eids store the same information
+          for the edges entering each vertex
+    """
+
+    def __init__(self, graph, vertex_order=None):
+        """Constructor
+
+        args:
+         - graph (Graph): graph to copy
+         - vertex_order (list of vid): position of vertices, if None
+                        (default) vertices are sorted by increasing id
+        """
+        if vertex_order is None:
+            vertex_order = sorted(graph.vertices())
+        self.vids = np.array(vertex_order, dtype=int)
+        nb = len(self.vids)
+        self._position = dict((vid, i) for i, vid in
+                              enumerate(self.vids.tolist()))
+        if len(self._position) != nb or nb != graph.nb_vertices():
+            raise ValueError("vertex order must contain each vertex once")
+
+        nb_edges = graph.nb_edges()
+        pos = self._position
+        eids = np.fromiter(graph.edges(), int, nb_edges)
+        sources = np.fromiter((pos[graph.source(eid)]
+                               for eid in eids.tolist()), int, nb_edges)
+        targets = np.fromiter((pos[graph.target(eid)]
+                               for eid in eids.tolist()), int, nb_edges)
+
+        self.out_indptr, self.out_indices, self.out_eids = _compressed(
+            sources, targets, eids, nb)
+        self.in_indptr, self.in_indices, self.in_eids = _compressed(
+            targets, sources, eids, nb)
+
+    def nb_vertices(self):
+        """Total number of vertices.
+
+        return:
+         - (int)
+        """
+        return len(self.vids)
+
+    def __len__(self):
+        """Magic alias for `nb_vertices`
+        """
+        return len(self.vids)
+
+    def nb_edges(self):
+        """Total number of edges.
+
+        return:
+         - (int)
+        """
+        return len(self.out_indices)
+
+    def position(self, vid):
+        """Position of a vertex in the layout.
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (int)
+        """
+        try:
+            return self._position[vid]
+        except (KeyError, TypeError):
+            raise InvalidVertex(vid)
+
+    def positions(self, vids):
+        """Position of a list of vertices.
+
+        args:
+         - vids (iter of vid)
+
+        return:
+         - (np.array of int)
+        """
+        return np.array([self.position(vid) for vid in vids], dtype=int)
+
+    def out_degree(self):
+        """Number of edges leaving each vertex.
+
+        return:
+         - (np.array of int): indexed by position
+        """
+        return np.diff(self.out_indptr)
+
+    def in_degree(self):
+        """Number of edges entering each vertex.
+
+        return:
+         - (np.array of int): indexed by position
+        """
+        return np.diff(self.in_indptr)
+
+    def out_neighbors(self, vid):
+        """Ids of the targets of the edges leaving vid.
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (np.array of vid): one entry per edge
+        """
+        pos = self.position(vid)
+        start, stop = self.out_indptr[pos], self.out_indptr[pos + 1]
+        return self.vids[self.out_indices[start:stop]]
+
+    def in_neighbors(self, vid):
+        """Ids of the sources of the edges entering vid.
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (np.array of vid): one entry per edge
+        """
+        pos = self.position(vid)
+        start, stop = self.in_indptr[pos], self.in_indptr[pos + 1]
+        return self.vids[self.in_indices[start:stop]]
+
+    def _adjacency(self, direction):
+        if direction == "out":
+            return self.out_indptr, self.out_indices
+        if direction == "in":
+            return self.in_indptr, self.in_indices
+        raise UserWarning("unknown direction (%s)" % direction)
+
+    def bfs(self, start, direction="out"):
+        """Positions of the vertices reachable from start in breadth first
+        order.
+
+        args:
+         - start (int): position of first vertex
+         - direction (str): 'out' (default) to follow edges, 'in' to walk
+                            them backward
+
+        return:
+         - (list of int): positions
+        """
+        indptr, indices = self._adjacency(direction)
+        indptr = indptr.tolist()
+        indices = indices.tolist()
+        visited = [False] * len(self.vids)
+        visited[start] = True
+        res = [start]
+        ind = 0
+        while ind < len(res):
+            pos = res[ind]
+            ind += 1
+            for nid in indices[indptr[pos]:indptr[pos + 1]]:
+                if not visited[nid]:
+                    visited[nid] = True
+                    res.append(nid)
+        return res
+
+    def neighbor_reduce(self, values, operation="sum", direction="out",
+                        fill=0):
+        """Reduce, for each vertex, values over its neighbors.
+
+        args:
+         - values (np.array): one value per vertex, indexed by position
+         - operation (str): one of 'sum' (default), 'min', 'max'
+         - direction (str): 'out' (default) to reduce over targets of
+                            out edges, 'in' over sources of in edges
+         - fill (any): result for vertices with no neighbor, default 0
+
+        return:
+         - (np.array): one value per vertex, indexed by position
+        """
+        indptr, indices = self._adjacency(direction)
+        try:
+            ufunc = {"sum": np.add,
+                     "min": np.minimum,
+                     "max": np.maximum}[operation]
+        except KeyError:
+            raise UserWarning("unknown reduction (%s)" % operation)
+
+        values = np.asarray(values)
+        nb = len(self.vids)
+        if len(indices) == 0:
+            return np.full(nb, fill, dtype=np.result_type(values, fill))
+
+        # extra trailing element so that each start is a valid index,
+        # its own segment is dropped from the result
+        contrib = values[np.append(indices, 0)]
+        res = ufunc.reduceat(contrib, indptr)[:-1]
+        empty = indptr[:-1] == indptr[1:]
+        if empty.any():
+            res = res.astype(np.result_type(res, fill))
+            res[empty] = fill
+        return res
@@ -0,0 +1,123 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+#       EdgeArrays : container package
+#
+#       Distributed under the Cecill-C License.
+#       See accompanying file LICENSE.txt or copy at
+#           http://www.cecill.info/licences/Licence_CeCILL-C_V1-en.html
+#
+"""This module provide the construction of graphs from arrays of edge
+sources and targets (see `Graph.from_arrays`).
+
+Arrays are validated with array operations and the adjacency of all
+vertices is computed at once, without going through `add_edge`.
+
+This module requires NumPy.
+"""
+
+import numpy as np
+
+from graph import GraphError, InvalidEdge, InvalidVertex
+from vertex_record import VertexRecord
+
+
+def _int_array(values, name):
+    arr = np.asarray(values)
+    if arr.ndim != 1:
+        raise ValueError("%s must be a 1D array" % name)
+    if len(arr) == 0:
+        return arr.astype(int)
+    if arr.dtype.kind not in "iu":
+        raise ValueError("%s must contain integers" % name)
+    return arr.astype(int)
+
+
+def _check_ids(ids, exc):
+    """Raise exc if ids contains negative or duplicated ids.
+    """
+    if len(ids) == 0:
+        return
+    if ids.min() < 0:
+        raise exc(int(ids.min()))
+    sorted_ids = np.sort(ids)
+    dup = sorted_ids[1:] == sorted_ids[:-1]
+    if dup.any():
+        raise exc(int(sorted_ids[1:][dup][0]))
+
+
+def edge_arrays(sources, targets, vids=None, eids=None):
+    """Validate arrays describing a graph.
+
+    args:
+     - sources (array of int): source of each edge
+     - targets (array of int): target of each edge
+     - vids (array of int): ids of all vertices, if None (default)
+                            vertices referenced by edges by increasing id
+     - eids (array of int): id of each edge, if None (default) edge k
+                            receives id k
+
+    return:
+     - (np.array, np.array, np.array, np.array): vids, sources, targets
+                                                 and eids
+    """
+    sources = _int_array(sources, "sources")
+    targets = _int_array(targets, "targets")
+    if len(sources) != len(targets):
+        raise ValueError("nb of sources (%d) and nb of targets (%d) differ"
+                         % (len(sources), len(targets)))
+
+    if vids is None:
+        vids = np.unique(np.concatenate([sources, targets]))
+        _check_ids(vids, InvalidVertex)
+    else:
+        vids = _int_array(vids, "vids")
+        _check_ids(vids, InvalidVertex)
+        for ends in (sources, targets):
+            unknown = ~np.in1d(ends, vids)
+            if unknown.any():
+                raise InvalidVertex(int(ends[unknown][0]))
+
+    if eids is None:
+        eids = np.arange(len(sources))
+    else:
+        eids = _int_array(eids, "eids")
+        if len(eids) != len(sources):
+            raise GraphError("nb of eids (%d) and nb of edges (%d) differ"
+                             % (len(eids), len(sources)))
+        _check_ids(eids, InvalidEdge)
+
+    return vids, sources, targets, eids
+
+
+def _groups(pos, eids, nb):
+    """Eids of the edges attached to each position.
+    """
+    order = np.argsort(pos, kind="mergesort")
+    indptr = np.zeros(nb + 1, dtype=int)
+    np.cumsum(np.bincount(pos, minlength=nb), out=indptr[1:])
+    grouped = eids[order].tolist()
+    indptr = indptr.tolist()
+    return [grouped[indptr[i]:indptr[i + 1]] for i in xrange(nb)]
+
+
+def vertex_records(vids, sources, targets, eids):
+    """Adjacency of all vertices.
+
+    args:
+     - vids, sources, targets, eids (np.array): as returned by edge_arrays
+
+    return:
+     - (list of VertexRecord): record of each vertex, in the order of vids
+    """
+    nb = len(vids)
+    order = np.argsort(vids)
+    sorted_vids = vids[order]
+    # position of each end in vids
+    src_pos = order[np.searchsorted(sorted_vids, sources)]
+    tgt_pos = order[np.searchsorted(sorted_vids, targets)]
+
+    in_eids = _groups(tgt_pos, eids, nb)
+    out_eids = _groups(src_pos, eids, nb)
+    from_edges = VertexRecord.from_edges
+    return [from_edges(in_eids[i], out_eids[i]) for i in xrange(nb)]
@@ -18,7 +18,15 @@ for a graph interface
 does not implement copy concept
 """
 
+from itertools import izip
+
+from id_array_dict import IdArrayDict
 from id_dict import IdDict
+from reorder import vertex_order
+from vertex_record import VertexRecord
+
+storages = {"dict": IdDict,
+            "array": IdArrayDict}
 
 
 class GraphError(Exception):
@@ -39,15 +47,80 @@ class InvalidVertex(GraphError, KeyError):
     """
 
 
+class GraphObserver(object):
+    """Base class of objects notified of the modifications of a graph,
+    see `Graph.add_observer`.
+
+    Methods whose name ends in 'ing' are called before the modification,
+    the others after it. Default implementations do nothing.
+    """
+
+    def vertex_added(self, vid):
+        pass
+
+    def vertex_removing(self, vid):
+        pass
+
+    def vertex_removed(self, vid):
+        pass
+
+    def edge_adding(self, sid, tid):
+        pass
+
+    def edge_added(self, eid, sid, tid):
+        pass
+
+    def edge_removing(self, eid, sid, tid):
+        pass
+
+    def edge_removed(self, eid, sid, tid):
+        pass
+
+    def resetting(self):
+        """Called before clear, clear_edges and compact.
+        """
+        pass
+
+    def reset(self):
+        """Called after clear, clear_edges and compact.
+        """
+        pass
+
+    def property_added(self, kind, name):
+        """Called after the creation of a property.
+
+        args:
+         - kind (str): 'vertex', 'edge' or 'graph'
+         - name (str): name of the property
+        """
+        pass
+
+    def property_removed(self, kind, name, prop):
+        """Called after the removal of a property.
+
+        args:
+         - kind (str): 'vertex', 'edge' or 'graph'
+         - name (str): name of the property
+         - prop (any): the removed map, or value for graph properties
+        """
+        pass
+
+
 class Graph(object):
     """Directed graph with multiple links
     in this implementation :
 
-        - vertices are tuple of edge_in,edge_out
+        - vertices are VertexRecord of edge_in,edge_out
         - edges are tuple of source,target
+        - _revision is incremented by each modification of the topology
+        - _observers are notified of each modification
     """
 
-    def __init__(self, graph=None, idgenerator="set"):
+    # replaced, never modified in place, hence observers can be added
+    # or removed while being notified
+    _observers = ()
+
+    def __init__(self, graph=None, idgenerator="set", storage="dict"):
         """constructor
 
         if graph is not none make a copy of the topological structure of graph
@@ -56,9 +129,19 @@ class Graph(object):
         args:
           - graph (Graph): the graph to copy, default=None
           - idgenerator (str): type of idgenerator to use, default 'set'
+          - storage (str): container of vertices and edges, either 'dict'
+                           (default) or 'array' to use less memory when
+                           ids are dense
         """
-        self._vertices = IdDict(idgenerator=idgenerator)
-        self._edges = IdDict(idgenerator=idgenerator)
+        try:
+            storage_type = storages[storage]
+        except KeyError:
+            msg = "the required storage (%s) is unknown" % storage
+            msg += "\navailable storages are %s" % str(storages.keys())
+            raise UserWarning(msg)
+        self._vertices = storage_type(idgenerator=idgenerator)
+        self._edges = storage_type(idgenerator=idgenerator)
+        self._revision = 0
         if graph is not None:
             self.extend(graph)
 
@@ -160,10 +243,15 @@ class Graph(object):
     def is_valid(self):
         """Test the validity of the graph
 
+        Check that vertex records and edges agree
+        (see `validation.consistency_errors`).
+
         return:
          - (bool)
         """
-        return True
+        from validation import consistency_errors
+
+        return len(consistency_errors(self)) == 0
 
     # ##########################################################
     #
@@ -208,7 +296,8 @@ class Graph(object):
         """
         if vid not in self:
             raise InvalidVertex(vid)
-        neighbors_list = [self.source(eid) for eid in self._vertices[vid][0]]
+        neighbors_list = [self.source(eid)
+                          for eid in self._vertices[vid].in_edges()]
         return iter(set(neighbors_list))
 
     def out_neighbors(self, vid):
@@ -223,7 +312,8 @@ class Graph(object):
         """
         if vid not in self:
             raise InvalidVertex(vid)
-        neighbors_list = [self.target(eid) for eid in self._vertices[vid][1]]
+        neighbors_list = [self.target(eid)
+                          for eid in self._vertices[vid].out_edges()]
         return iter(set(neighbors_list))
 
     def neighbors(self, vid):
@@ -286,10 +376,10 @@ class Graph(object):
         """
         internal function that perform 'edges' with vid not None
         """
-        link_in, link_out = self._vertices[vid]
-        for eid in link_in:
+        record = self._vertices[vid]
+        for eid in record.in_edges():
             yield eid
-        for eid in link_out:
+        for eid in record.out_edges():
             yield eid
 
     def edges(self, vid=None):
@@ -324,7 +414,8 @@ class Graph(object):
             return len(self._edges)
         if vid not in self:
             raise InvalidVertex(vid)
-        return len(self._vertices[vid][0]) + len(self._vertices[vid][1])
+        record = self._vertices[vid]
+        return record.nb_in_edges() + record.nb_out_edges()
 
     def in_edges(self, vid):
         """Iterate on all edges pointing to a given vertex.
@@ -337,7 +428,7 @@ class Graph(object):
         """
         if vid not in self:
             raise InvalidVertex(vid)
-        for eid in self._vertices[vid][0]:
+        for eid in self._vertices[vid].in_edges():
             yield eid
 
     def out_edges(self, vid):
@@ -351,7 +442,7 @@ class Graph(object):
         """
         if vid not in self:
             raise InvalidVertex(vid)
-        for eid in self._vertices[vid][1]:
+        for eid in self._vertices[vid].out_edges():
             yield eid
 
     def nb_in_edges(self, vid):
@@ -365,7 +456,7 @@ class Graph(object):
         """
         if vid not in self:
             raise InvalidVertex(vid)
-        return len(self._vertices[vid][0])
+        return self._vertices[vid].nb_in_edges()
 
     def nb_out_edges(self, vid):
         """Number of edges away from a given vertex.
@@ -378,7 +469,7 @@ class Graph(object):
         """
         if vid not in self:
             raise InvalidVertex(vid)
-        return len(self._vertices[vid][1])
+        return self._vertices[vid].nb_out_edges()
 
     # ##########################################################
     #
@@ -397,9 +488,13 @@ class Graph(object):
          - vid (int): id used for the new vertex
         """
         try:
-            return self._vertices.add((set(), set()), vid)
+            vid = self._vertices.add(VertexRecord(), vid)
         except KeyError:
             raise InvalidVertex(vid)
+        self._revision += 1
+        for observer in self._observers:
+            observer.vertex_added(vid)
+        return vid
 
     def remove_vertex(self, vid):
         """Remove a specified vertex of the graph.
@@ -411,19 +506,29 @@ class Graph(object):
         """
         if vid not in self:
             raise InvalidVertex(vid)
-        link_in, link_out = self._vertices[vid]
-        for edge in list(link_in):
+        for observer in self._observers:
+            observer.vertex_removing(vid)
+        record = self._vertices[vid]
+        for edge in list(record.in_edges()):
             self.remove_edge(edge)
-        for edge in list(link_out):
+        for edge in list(record.out_edges()):
             self.remove_edge(edge)
         del self._vertices[vid]
+        self._revision += 1
+        for observer in self._observers:
+            observer.vertex_removed(vid)
 
     def clear(self):
         """Remove all vertices and edges
         don't change references to objects
         """
+        for observer in self._observers:
+            observer.resetting()
         self._edges.clear()
         self._vertices.clear()
+        self._revision += 1
+        for observer in self._observers:
+            observer.reset()
 
     # ##########################################################
     #
@@ -447,12 +552,17 @@ class Graph(object):
             raise InvalidVertex(sid)
         if tid not in self:
             raise InvalidVertex(tid)
+        for observer in self._observers:
+            observer.edge_adding(sid, tid)
         try:
             eid = self._edges.add((sid, tid), eid)
         except KeyError:
             raise InvalidEdge(eid)
-        self._vertices[sid][1].add(eid)
-        self._vertices[tid][0].add(eid)
+        self._vertices[sid].add_out_edge(eid)
+        self._vertices[tid].add_in_edge(eid)
+        self._revision += 1
+        for observer in self._observers:
+            observer.edge_added(eid, sid, tid)
         return eid
 
     def remove_edge(self, eid):
@@ -464,18 +574,27 @@ class Graph(object):
         if not self.has_edge(eid):
             raise InvalidEdge(eid)
         sid, tid = self._edges[eid]
-        self._vertices[sid][1].remove(eid)
-        self._vertices[tid][0].remove(eid)
+        for observer in self._observers:
+            observer.edge_removing(eid, sid, tid)
+        self._vertices[sid].remove_out_edge(eid)
+        self._vertices[tid].remove_in_edge(eid)
         del self._edges[eid]
+        self._revision += 1
+        for observer in self._observers:
+            observer.edge_removed(eid, sid, tid)
 
     def clear_edges(self):
         """Remove all the edges of the graph
         don't change references to objects
         """
+        for observer in self._observers:
+            observer.resetting()
         self._edges.clear()
-        for vid, (in_set, out_set) in self._vertices.iteritems():
-            in_set.clear()
-            out_set.clear()
+        for record in self._vertices.itervalues():
+            record.clear()
+        self._revision += 1
+        for observer in self._observers:
+            observer.reset()
 
     # ##########################################################
     #
@@ -508,26 +627,316 @@ class Graph(object):
 
         return trans_vid, trans_eid
 
+    def get_storage_type(self):
+        """Retrieve name of the container used for vertices and edges
+        """
+        for name, typevalue in storages.items():
+            if type(self._vertices) == typevalue:
+                return name
+
+    def _new_graph(self):
+        """Create an empty graph of the same type as self.
+        """
+        return type(self)(idgenerator=self._vertices.get_generator_type(),
+                          storage=self.get_storage_type())
+
     def sub_graph(self, vids):
+        """Create a graph restricted to a set of vertices.
+
+        Vertices and edges keep their ids, only edges whose source and
+        target both belong to vids are kept.
+
+        args:
+         - vids (iter of vid): vertices to keep
+
+        return:
+         - (Graph): a new graph of the same type as self
         """
+        vids = set(vids)
+        for vid in vids:
+            if vid not in self:
+                raise InvalidVertex(vid)
+
+        graph = self._new_graph()
+        for vid in sorted(vids):
+            graph.add_vertex(vid)
+        for eid, (sid, tid) in sorted(self._edges.iteritems()):
+            if sid in vids and tid in vids:
+                graph.add_edge(sid, tid, eid)
+
+        return graph
+
+    # ##########################################################
+    #
+    # Compact Graph concept
+    #
+    # ##########################################################
+    def compact(self, order="insertion"):
+        """Renumber vertices and edges with consecutive ids starting at 0.
+
+        Edges are numbered by increasing new id of their source then of
+        their target. Id generators are reset, hence the next created
+        vertex (resp. edge) will receive id nb_vertices (resp. nb_edges).
+
+        args:
+         - order (str|list of vid): order of the new vertex ids, either
+                 an explicit list of all vertices or one of:
+                - 'insertion' (default): keep the relative order of ids
+                - 'bfs': breadth first traversal of each connected
+                         component, ignoring edge directions
+                - 'degree': decreasing number of edges
+                - 'rcm': reverse Cuthill-McKee, reduce the distance
+                         between ids of neighbors
+
+        return:
+         - (dict of (int, int)): mapping between old and new vertex ids
+         - (dict of (int, int)): mapping between old and new edge ids
+        """
+        if isinstance(order, basestring):
+            vids = vertex_order(self, order)
+        else:
+            vids = list(order)
+            if sorted(vids) != sorted(self._vertices):
+                raise GraphError("order must contain each vertex once")
+        trans_vid = dict((vid, i) for i, vid in enumerate(vids))
+        edges = sorted((trans_vid[sid], trans_vid[tid], eid)
+                       for eid, (sid, tid) in self._edges.iteritems())
+
+        for observer in self._observers:
+            observer.resetting()
+        self._vertices.clear()
+        self._edges.clear()
+        records = [VertexRecord() for vid in vids]
+        for record in records:
+            self._vertices.add(record)
+
+        trans_eid = {}
+        for sid, tid, eid in edges:
+            new_eid = self._edges.add((sid, tid))
+            records[sid].add_out_edge(new_eid)
+            records[tid].add_in_edge(new_eid)
+            trans_eid[eid] = new_eid
+
+        self._renumbered(trans_vid, trans_eid)
+        self._revision += 1
+        for observer in self._observers:
+            observer.reset()
+        return trans_vid, trans_eid
+
+    def _renumbered(self, trans_vid, trans_eid):
+        """Called by `compact` once ids have changed, before observers
+        are notified, to translate data keyed by vertex or edge ids.
+
+        args:
+         - trans_vid (dict of (int, int)): old to new vertex ids
+         - trans_eid (dict of (int, int)): old to new edge ids
+        """
+        pass
+
+    # ##########################################################
+    #
+    # Observer concept
+    #
+    # ##########################################################
+    def add_observer(self, observer):
+        """Register an object to notify of each modification.
+
+        args:
+         - observer (GraphObserver)
+        """
+        self._observers = self._observers + (observer,)
+
+    def remove_observer(self, observer):
+        """Stop notifying an object.
+
+        args:
+         - observer (GraphObserver): a previously registered observer
+        """
+        observers = list(self._observers)
+        observers.remove(observer)
+        self._observers = tuple(observers)
+
+    # ##########################################################
+    #
+    # Snapshot Graph concept
+    #
+    # ##########################################################
+    def snapshot(self):
+        """Create a read only view of the current state of the graph.
+
+        The view shares its content with the graph, later modifications
+        of the graph only copy the elements they modify (see `snapshot`
+        module).
+
+        return:
+         - (GraphSnapshot)
+        """
+        from snapshot import snapshot
+
+        return snapshot(self)
+
+    # ##########################################################
+    #
+    # Connected components concept
+    #
+    # ##########################################################
+    def track_components(self):
+        """Maintain the connected components of the graph from now on.
+
+        Edge directions are ignored (see `components` module).
+
+        return:
+         - (ComponentTracker): the tracker attached to the graph,
+                               created on the first call
+        """
+        tracker = self.__dict__.get("_component_tracker")
+        if tracker is None:
+            from components import ComponentTracker
+
+            tracker = ComponentTracker(self)
+        return tracker
+
+    # ##########################################################
+    #
+    # Validation Graph concept
+    #
+    # ##########################################################
+    def find_cycle(self):
+        """Find a directed cycle in the graph.
+
+        return:
+         - (list of eid): edges of a cycle, in order, or None if the
+                          graph is acyclic
+        """
+        from validation import find_cycle
+
+        return find_cycle(self)
+
+    def is_acyclic(self):
+        """Test whether the graph contains no directed cycle.
+
+        return:
+         - (bool)
+        """
+        from validation import is_acyclic
+
+        return is_acyclic(self)
+
+    def is_tree(self, root=None):
+        """Test whether the graph is a tree, edges pointing away
+        from the root.
+
+        args:
+         - root (vid): expected root, if None (default) any root is accepted
+
+        return:
+         - (bool)
+        """
+        from validation import is_tree
+
+        return is_tree(self, root)
+
+    def is_forest(self):
+        """Test whether the graph is a set of trees, edges pointing away
+        from the roots.
+
+        return:
+         - (bool)
+        """
+        from validation import is_forest
+
+        return is_forest(self)
+
+    # ##########################################################
+    #
+    # Array construction concept (requires numpy)
+    #
+    # ##########################################################
+    @classmethod
+    def from_arrays(cls, sources, targets, vids=None, eids=None, **kwds):
+        """Create a graph from arrays of edge sources and targets.
+
+        Arrays are validated at once and the adjacency of all vertices
+        is built in a single pass, much faster than calling `add_edge`
+        for each edge.
+
+        args:
+         - sources (array of int): source of each edge
+         - targets (array of int): target of each edge
+         - vids (array of int): ids of all vertices, including isolated
+                                ones. If None (default), the vertices
+                                referenced by edges.
+         - eids (array of int): id of each edge. If None (default), the
+                                k-th edge has eid k.
+         - kwds: extra arguments passed to the constructor of the graph
+
+        return:
+         - (Graph)
+        """
+        from edge_arrays import edge_arrays, vertex_records
+
+        vids, sources, targets, eids = edge_arrays(sources, targets,
+                                                   vids, eids)
+        graph = cls(**kwds)
+        records = vertex_records(vids, sources, targets, eids)
+        graph._vertices.update(izip(vids.tolist(), records))
+        graph._edges.update(izip(eids.tolist(), izip(sources.tolist(),
+                                                     targets.tolist())))
+        graph._revision += 1
+        return graph
+
+    # ##########################################################
+    #
+    # Sparse matrix concept (requires scipy)
+    #
+    # ##########################################################
+    def to_sparse(self, weight=None, vertex_order=None, fmt="csr"):
+        """Adjacency matrix of the graph.
+
+        Entry (i, j) is the sum of the weights of the edges from
+        vertex_order[i] to vertex_order[j].
+
+        args:
+         - weight (dict of (eid, float)): weight of each edge. If None
+                                          (default), each edge weights 1
+         - vertex_order (list of vid): vertex associated to each row and
+                             column. If None (default), all vertices by
+                             increasing vid. Edges between vertices not in
+                             this list are ignored.
+         - fmt (str): sparse format, 'coo', 'csr' (default) or 'csc'
+
+        return:
+         - (scipy.sparse matrix): adjacency matrix
+         - (dict of (vid, int)): row of each vertex in matrix
+        """
+        from sparse_adjacency import to_sparse
+
+        return to_sparse(self, weight, vertex_order, fmt)
+
+    @classmethod
+    def _from_sparse(cls, matrix, kwds):
+        """Create a graph from a matrix and return values of entries.
+        """
+        from sparse_adjacency import sparse_edges
+
+        nb, rows, cols, data = sparse_edges(matrix)
+        graph = cls.from_arrays(rows, cols, range(nb), **kwds)
+
+        return graph, data
+
+    @classmethod
+    def from_sparse(cls, matrix, **kwds):
+        """Create a graph from an adjacency matrix.
+
+        Vertex ids are row indices. One edge is created for each non zero
+        entry of the matrix, the k-th entry in row major order having
+        eid k.
+
+        args:
+         - matrix (scipy.sparse matrix|np.array): square matrix
+         - kwds: extra arguments passed to the constructor of the graph
+
+        return:
+         - (Graph)
         """
-        raise NotImplemented
-        # from copy import deepcopy
-        # vids = set(vids)
-        #
-        # result = deepcopy(self)
-        # result._vertices.clear()
-        # result._edges.clear()
-        #
-        # for key, edges in self._vertices.items():
-        #     if key in vids:
-        #         inedges, outedges = edges
-        #         sortedinedges = set(
-        #             [eid for eid in inedges if self.source(eid) in vids])
-        #         sortedoutedges = set(
-        #             [eid for eid in outedges if self.target(eid) in vids])
-        #         result._vertices.add((sortedinedges, sortedoutedges), key)
-        #         for eid in sortedoutedges:
-        #             result._edges.add(self._edges[eid], eid)
-        #
-        # return result
+        return cls._from_sparse(matrix, kwds)[0]
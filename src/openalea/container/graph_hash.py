@@ -0,0 +1,420 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+#       GraphHash : container package
+#
+#       Distributed under the Cecill-C License.
+#       See accompanying file LICENSE.txt or copy at
+#           http://www.cecill.info/licences/Licence_CeCILL-C_V1-en.html
+#
+"""This module provide a fast comparison of graphs.
+
+    - structural_hash: hash of the vertices, edges and properties of a
+                       graph, maintained incrementally
+    - diff: differences between two graphs
+    - graph_equal: test whether two graphs are equal
+
+The hash is the sum of the hashes of each vertex, edge and property
+entry. Each modification of the graph adds or subtracts the hash of the
+elements it modifies, hence reading the hash is O(1) once tracked.
+Properties stored as plain dicts can not be observed, their entries are
+hashed again at each read, in O(size of these properties). Two
+equal graphs have the same hash, whatever the order in which they have
+been built. Equal hashes do not guarantee equal graphs, use `diff` to
+confirm.
+
+The hash ignores:
+
+    - computed properties
+    - modifications of mutable values (e.g. lists) stored in properties,
+      values must be replaced, not modified in place
+
+Unhashable values are hashed through their repr. Hashes of strings
+depend on the interpreter, hence hashes must not be compared between
+processes.
+"""
+
+from graph import GraphObserver
+from property_map import missing, ComputedProperty
+
+_MASK = (1 << 64) - 1
+
+
+def _value_hash(val):
+    try:
+        return hash(val)
+    except TypeError:
+        return hash(repr(val))
+
+
+def _vertex_hash(vid):
+    return hash(("v", vid))
+
+
+def _edge_hash(eid, edge):
+    return hash(("e", eid) + tuple(edge))
+
+
+def _entry_hash(kind, name, key, val):
+    return hash((kind, name, key, _value_hash(val)))
+
+
+def _property_hash(kind, name, prop):
+    """Hash of a property and all its entries.
+    """
+    res = hash((kind, name, _value_hash(getattr(prop, "default", missing))))
+    for key, val in prop.iteritems():
+        res += _entry_hash(kind, name, key, val)
+    return res
+
+
+def _stored_properties(graph, kind):
+    """Properties of a graph, except computed ones.
+
+    args:
+     - graph (Graph)
+     - kind (str): either 'vertex' or 'edge'
+
+    return:
+     - (dict of (str, PropertyMap))
+    """
+    props = getattr(graph, "_%s_property" % kind, {})
+    return dict((name, prop) for name, prop in props.iteritems()
+                if not isinstance(prop, ComputedProperty))
+
+
+def _topology_hash(graph):
+    """Hash of vertices, edges and graph properties.
+    """
+    res = 0
+    for vid in graph._vertices:
+        res += _vertex_hash(vid)
+    for eid, edge in graph._edges.iteritems():
+        res += _edge_hash(eid, edge)
+    for name, val in getattr(graph, "_graph_property", {}).iteritems():
+        res += _entry_hash("graph", name, None, val)
+    return res
+
+
+class _PropertyObserver(object):
+    """Update the hash for each modification of a property.
+    """
+
+    def __init__(self, tracker, kind, name, prop):
+        self._tracker = tracker
+        self._kind = kind
+        self._name = name
+        self.prop = prop
+
+    def value_set(self, key, old, new):
+        delta = _entry_hash(self._kind, self._name, key, new)
+        if old is not missing:
+            delta -= _entry_hash(self._kind, self._name, key, old)
+        self._tracker.add(delta)
+
+    def value_removed(self, key, old):
+        self._tracker.add(-_entry_hash(self._kind, self._name, key, old))
+
+    def cleared(self, old):
+        for key, val in old.iteritems():
+            self.value_removed(key, val)
+
+
+class _HashTracker(GraphObserver):
+    """Maintain the structural hash of a graph.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self._value = 0
+        self._observers = {}
+        self._plain = {}
+        self.rebuild()
+        graph.add_observer(self)
+        graph._hash_tracker = self
+
+    def detach(self):
+        """Stop tracking modifications of the graph.
+        """
+        self.graph.remove_observer(self)
+        self._unobserve_all()
+        del self.graph._hash_tracker
+
+    @property
+    def value(self):
+        """Current hash of the graph.
+        """
+        res = self._value
+        for (kind, name), prop in self._plain.iteritems():
+            res += _property_hash(kind, name, prop)
+        return res & _MASK
+
+    def add(self, delta):
+        self._value = (self._value + delta) & _MASK
+
+    def rebuild(self):
+        """Compute the hash from scratch and observe current properties.
+        """
+        self._unobserve_all()
+        self._value = _topology_hash(self.graph)
+        for kind in ("vertex", "edge"):
+            props = _stored_properties(self.graph, kind)
+            for name, prop in props.iteritems():
+                self._observe(kind, name, prop)
+
+    # ##########################################################
+    #
+    # properties
+    #
+    # ##########################################################
+    def _observe(self, kind, name, prop):
+        if hasattr(prop, "add_observer"):
+            observer = _PropertyObserver(self, kind, name, prop)
+            prop.add_observer(observer)
+            self._observers[(kind, name)] = observer
+            self.add(_property_hash(kind, name, prop))
+        else:
+            # plain dicts are hashed by value at each read
+            self._plain[(kind, name)] = prop
+
+    def _unobserve(self, kind, name):
+        if self._plain.pop((kind, name), None) is not None:
+            return
+        observer = self._observers.pop((kind, name), None)
+        if observer is not None:
+            observer.prop.remove_observer(observer)
+            self.add(-_property_hash(kind, name, observer.prop))
+
+    def _unobserve_all(self):
+        for kind, name in list(self._observers) + list(self._plain):
+            self._unobserve(kind, name)
+
+    def _property_added(self, kind, name):
+        prop = _stored_properties(self.graph, kind).get(name)
+        if prop is not None:
+            self._observe(kind, name, prop)
+
+    def _property_removed(self, kind, name, prop):
+        if prop is not None and not isinstance(prop, ComputedProperty):
+            self._unobserve(kind, name)
+
+    # ##########################################################
+    #
+    # graph observer
+    #
+    # ##########################################################
+    def vertex_added(self, vid):
+        self.add(_vertex_hash(vid))
+
+    def vertex_removed(self, vid):
+        # attached edges have been removed through remove_edge
+        self.add(-_vertex_hash(vid))
+
+    def edge_added(self, eid, sid, tid):
+        self.add(_edge_hash(eid, (sid, tid)))
+
+    def edge_removed(self, eid, sid, tid):
+        self.add(-_edge_hash(eid, (sid, tid)))
+
+    def reset(self):
+        self.rebuild()
+
+    def property_added(self, kind, name):
+        if kind == "graph":
+            value = self.graph._graph_property[name]
+            self.add(_entry_hash("graph", name, None, value))
+        else:
+            self._property_added(kind, name)
+
+    def property_removed(self, kind, name, prop):
+        if kind == "graph":
+            self.add(-_entry_hash("graph", name, None, prop))
+        else:
+            self._property_removed(kind, name, prop)
+
+
+def structural_hash(graph):
+    """Hash of the vertices, edges and properties of a graph.
+
+    The first call computes the hash in O(V + E) and installs a tracker
+    that maintains it, later calls are O(1) unless properties are
+    stored as plain dicts.
+
+    args:
+     - graph (Graph)
+
+    return:
+     - (int): 64 bits hash
+    """
+    tracker = graph.__dict__.get("_hash_tracker")
+    if tracker is None:
+        tracker = _HashTracker(graph)
+    return tracker.value
+
+
+def untrack_hash(graph):
+    """Stop maintaining the structural hash of a graph.
+
+    Does nothing if the hash of the graph is not tracked.
+
+    args:
+     - graph (Graph)
+    """
+    tracker = graph.__dict__.get("_hash_tracker")
+    if tracker is not None:
+        tracker.detach()
+
+
+def is_hash_tracked(graph):
+    """Test whether the structural hash of a graph is maintained.
+
+    args:
+     - graph (Graph)
+
+    return:
+     - (bool)
+    """
+    return "_hash_tracker" in graph.__dict__
+
+
+class GraphDiff(object):
+    """Differences between two graphs.
+
+    Attributes:
+     - added_vertices, removed_vertices (set of vid)
+     - added_edges, removed_edges (dict of (eid, (vid, vid))): edges whose
+                    ends changed appear in both
+     - vertex_properties, edge_properties (dict of (str, set of id)):
+                    ids whose value changed for each property
+     - graph_properties (set of str): names of changed graph properties
+    """
+
+    def __init__(self):
+        self.added_vertices = set()
+        self.removed_vertices = set()
+        self.added_edges = {}
+        self.removed_edges = {}
+        self.vertex_properties = {}
+        self.edge_properties = {}
+        self.graph_properties = set()
+
+    def is_empty(self):
+        """Test whether both graphs are equal.
+
+        return:
+         - (bool)
+        """
+        return not (self.added_vertices or self.removed_vertices or
+                    self.added_edges or self.removed_edges or
+                    self.vertex_properties or self.edge_properties or
+                    self.graph_properties)
+
+    def __repr__(self):
+        return ("GraphDiff(+%d/-%d vertices, +%d/-%d edges, "
+                "%d vertex properties, %d edge properties, "
+                "%d graph properties)" % (len(self.added_vertices),
+                                          len(self.removed_vertices),
+                                          len(self.added_edges),
+                                          len(self.removed_edges),
+                                          len(self.vertex_properties),
+                                          len(self.edge_properties),
+                                          len(self.graph_properties)))
+
+
+def _keys(mapping):
+    if isinstance(mapping, dict):
+        return mapping.viewkeys()
+    return set(mapping)
+
+
+def _changed_keys(prop1, prop2):
+    """Keys whose value differ between two mappings.
+    """
+    keys1 = _keys(prop1)
+    keys2 = _keys(prop2)
+    changed = set(keys1 ^ keys2)
+    try:
+        items1 = set(prop1.iteritems())
+        items2 = set(prop2.iteritems())
+        changed.update(key for key, val in items1 ^ items2)
+    except TypeError:
+        # unhashable values
+        changed.update(key for key in keys1 & keys2
+                       if prop1[key] != prop2[key])
+    return changed
+
+
+def _diff_properties(props1, props2):
+    res = {}
+    for name in set(props1) | set(props2):
+        prop1 = props1.get(name, {})
+        prop2 = props2.get(name, {})
+        changed = _changed_keys(prop1, prop2)
+        if (len(changed) > 0 or name not in props1 or name not in props2 or
+                getattr(prop1, "default", missing) !=
+                getattr(prop2, "default", missing)):
+            # a property added, removed or whose default changed is
+            # reported even if empty
+            res[name] = changed
+    return res
+
+
+def diff(graph1, graph2):
+    """Differences between two graphs.
+
+    Elements are compared by id with set operations, each element is
+    visited once.
+
+    args:
+     - graph1 (Graph): reference graph
+     - graph2 (Graph): modified graph
+
+    return:
+     - (GraphDiff): elements of graph2 added, removed or modified
+                    with respect to graph1
+    """
+    res = GraphDiff()
+    if graph1 is graph2:
+        return res
+
+    vids1 = _keys(graph1._vertices)
+    vids2 = _keys(graph2._vertices)
+    res.added_vertices = set(vids2 - vids1)
+    res.removed_vertices = set(vids1 - vids2)
+
+    edges1 = set(graph1._edges.iteritems())
+    edges2 = set(graph2._edges.iteritems())
+    res.added_edges = dict(edges2 - edges1)
+    res.removed_edges = dict(edges1 - edges2)
+
+    for kind in ("vertex", "edge"):
+        setattr(res, "%s_properties" % kind,
+                _diff_properties(_stored_properties(graph1, kind),
+                                 _stored_properties(graph2, kind)))
+
+    gprops1 = getattr(graph1, "_graph_property", {})
+    gprops2 = getattr(graph2, "_graph_property", {})
+    res.graph_properties = set(
+        name for name in set(gprops1) | set(gprops2)
+        if gprops1.get(name, missing) != gprops2.get(name, missing))
+
+    return res
+
+
+def graph_equal(graph1, graph2):
+    """Test whether two graphs have the same vertices, edges and properties.
+
+    If the hashes of both graphs are tracked, graphs with different
+    hashes are rejected in O(1). Otherwise graphs are compared with `diff`.
+
+    args:
+     - graph1 (Graph)
+     - graph2 (Graph)
+
+    return:
+     - (bool)
+    """
+    if (is_hash_tracked(graph1) and is_hash_tracked(graph2) and
+            structural_hash(graph1) != structural_hash(graph2)):
+        return False
+    return diff(graph1, graph2).is_empty()
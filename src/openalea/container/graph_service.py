@@ -0,0 +1,562 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+#       GraphService : container package
+#
+#       Distributed under the Cecill-C License.
+#       See accompanying file LICENSE.txt or copy at
+#           http://www.cecill.info/licences/Licence_CeCILL-C_V1-en.html
+#
+"""This module provide a service to share a graph between many clients.
+
+    - GraphService: answer batched queries on a graph, coalescing the
+                    queries submitted concurrently
+    - GraphServer: expose a service to other processes
+    - GraphClient: connect to a GraphServer
+
+Each query concerns a batch of elements, e.g. the neighbors of a list of
+vertices, and returns a dict associating a result to each element.
+Queries submitted while the service is busy are gathered and each element
+is evaluated only once, whatever the number of queries requiring it.
+Heavy queries (sub graph extraction) are run by a pool of worker threads.
+
+The service only reads the graph, which must not be modified while the
+service is running.
+
+Messages between servers and clients are pickled, hence connections are
+authenticated with a key shared between the server and its clients.
+"""
+
+import os
+import socket
+from abc import ABCMeta, abstractmethod
+from multiprocessing.connection import Client, Listener, address_type
+from Queue import Empty, Queue
+from threading import Event, Thread
+
+_generated = object()
+
+
+def _neighbors(graph, name, vid):
+    return list(graph.neighbors(vid))
+
+
+def _in_neighbors(graph, name, vid):
+    return list(graph.in_neighbors(vid))
+
+
+def _out_neighbors(graph, name, vid):
+    return list(graph.out_neighbors(vid))
+
+
+def _edge_vertices(graph, name, eid):
+    return graph.edge_vertices(eid)
+
+
+def _vertex_property(graph, name, vid):
+    return graph.vertex_property(name)[vid]
+
+
+def _edge_property(graph, name, eid):
+    return graph.edge_property(name)[eid]
+
+
+batched_operations = {"neighbors": _neighbors,
+                      "in_neighbors": _in_neighbors,
+                      "out_neighbors": _out_neighbors,
+                      "edge_vertices": _edge_vertices,
+                      "vertex_property": _vertex_property,
+                      "edge_property": _edge_property}
+
+pooled_operations = {"sub_graph": lambda graph, name, vids:
+                     graph.sub_graph(vids)}
+
+
+def _check_authkey(authkey):
+    if not authkey:
+        raise ValueError("connections must be authenticated by a key")
+    return authkey
+
+
+def _no_delay(conn, address):
+    """Disable Nagle's algorithm on the socket of a connection.
+
+    Connections send the size of a message and its content separately,
+    with Nagle's algorithm each small answer would wait for the
+    acknowledgement of the previous packet. Does nothing for connections
+    that are not TCP sockets (unix sockets, windows pipes).
+
+    args:
+     - conn (Connection)
+     - address (tuple|str): address the connection is bound to
+    """
+    # sockets rebuilt by fromfd do not know their actual family
+    if address_type(address) != 'AF_INET':
+        return
+    sock = socket.fromfd(conn.fileno(), socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.close()
+
+
+class PendingQuery(object):
+    """Result of a query that may not be available yet.
+    """
+
+    def __init__(self, operation, name, keys):
+        self.operation = operation
+        self.name = name
+        self.keys = keys
+        self._event = Event()
+        self._result = None
+        self._error = None
+
+    def set_result(self, result):
+        self._result = result
+        self._event.set()
+
+    def set_error(self, error):
+        self._error = error
+        self._event.set()
+
+    def done(self):
+        """Test whether the result is available.
+
+        return:
+         - (bool)
+        """
+        return self._event.is_set()
+
+    def wait(self, timeout=None):
+        """Wait for the result of the query.
+
+        Raise the error raised by the query if any.
+
+        args:
+         - timeout (float): maximum waiting time in seconds,
+                            if None (default) wait forever
+
+        return:
+         - (any)
+        """
+        if not self._event.wait(timeout):
+            raise RuntimeError("query still pending after %s s" % timeout)
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class _QueryAPI(object):
+    """Shortcuts for queries, implemented on top of `query`.
+    """
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def query(self, operation, keys, name=None):
+        """Evaluate an operation on a batch of elements.
+
+        args:
+         - operation (str): one of `batched_operations` or
+                            `pooled_operations`
+         - keys (list of int): ids of elements
+         - name (str): name of property for property queries
+
+        return:
+         - (any)
+        """
+
+    def neighbors(self, vids):
+        """Neighbors of each vertex.
+
+        args:
+         - vids (list of vid)
+
+        return:
+         - (dict of (vid, list of vid))
+        """
+        return self.query("neighbors", vids)
+
+    def in_neighbors(self, vids):
+        """Sources of the edges entering each vertex.
+
+        args:
+         - vids (list of vid)
+
+        return:
+         - (dict of (vid, list of vid))
+        """
+        return self.query("in_neighbors", vids)
+
+    def out_neighbors(self, vids):
+        """Targets of the edges leaving each vertex.
+
+        args:
+         - vids (list of vid)
+
+        return:
+         - (dict of (vid, list of vid))
+        """
+        return self.query("out_neighbors", vids)
+
+    def edge_vertices(self, eids):
+        """Source and target of each edge.
+
+        args:
+         - eids (list of eid)
+
+        return:
+         - (dict of (eid, (vid, vid)))
+        """
+        return self.query("edge_vertices", eids)
+
+    def vertex_property(self, name, vids):
+        """Values of a vertex property.
+
+        args:
+         - name (str): name of the property
+         - vids (list of vid)
+
+        return:
+         - (dict of (vid, any))
+        """
+        return self.query("vertex_property", vids, name)
+
+    def edge_property(self, name, eids):
+        """Values of an edge property.
+
+        args:
+         - name (str): name of the property
+         - eids (list of eid)
+
+        return:
+         - (dict of (eid, any))
+        """
+        return self.query("edge_property", eids, name)
+
+    def sub_graph(self, vids):
+        """Graph restricted to a set of vertices (see `Graph.sub_graph`).
+
+        args:
+         - vids (list of vid)
+
+        return:
+         - (Graph)
+        """
+        return self.query("sub_graph", vids)
+
+
+class GraphService(_QueryAPI):
+    """Answer queries on a graph in a background thread.
+
+    Attributes nb_queries, nb_batches and nb_evaluations count the
+    batched queries answered, the batches they have been gathered in and
+    the number of elements actually evaluated.
+    """
+
+    def __init__(self, graph, nb_workers=4, max_batch=1024):
+        """Constructor
+
+        args:
+         - graph (Graph): graph to query
+         - nb_workers (int): number of threads running heavy queries
+         - max_batch (int): maximum number of queries gathered together
+        """
+        self._graph = graph
+        self._nb_workers = nb_workers
+        self._max_batch = max_batch
+        self._queue = Queue()
+        self._pool_queue = Queue()
+        self._threads = []
+
+        self.nb_queries = 0
+        self.nb_batches = 0
+        self.nb_evaluations = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def is_running(self):
+        """Test whether the service answers queries.
+
+        return:
+         - (bool)
+        """
+        return len(self._threads) > 0
+
+    def start(self):
+        """Start the threads of the service.
+        """
+        if self.is_running():
+            raise RuntimeError("service already started")
+        self._threads.append(Thread(target=self._dispatch))
+        for i in range(self._nb_workers):
+            self._threads.append(Thread(target=self._work))
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+
+    def stop(self):
+        """Stop the service once pending queries have been answered.
+
+        Does nothing if the service is not running.
+        """
+        if not self.is_running():
+            return
+        self._queue.put(None)
+        for i in range(self._nb_workers):
+            self._pool_queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        del self._threads[:]
+
+    def submit(self, operation, keys, name=None):
+        """Submit a query without waiting for its result.
+
+        args:
+         - operation (str): one of `batched_operations` or
+                            `pooled_operations`
+         - keys (list of int): ids of elements
+         - name (str): name of property for property queries
+
+        return:
+         - (PendingQuery)
+        """
+        if not self.is_running():
+            raise RuntimeError("service not started")
+        pending = PendingQuery(operation, name, list(keys))
+        if operation in batched_operations:
+            self._queue.put(pending)
+        elif operation in pooled_operations:
+            self._pool_queue.put(pending)
+        else:
+            msg = "the required operation (%s) is unknown" % operation
+            msg += "\navailable operations are %s" % str(
+                sorted(batched_operations.keys() + pooled_operations.keys()))
+            raise UserWarning(msg)
+        return pending
+
+    def query(self, operation, keys, name=None):
+        """Submit a query and wait for its result.
+
+        args:
+         - operation (str): one of `batched_operations` or
+                            `pooled_operations`
+         - keys (list of int): ids of elements
+         - name (str): name of property for property queries
+
+        return:
+         - (any)
+        """
+        return self.submit(operation, keys, name).wait()
+
+    def _dispatch(self):
+        """Gather queued queries and answer them by batch.
+        """
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            while len(batch) < self._max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except Empty:
+                    break
+            if None in batch:
+                running = False
+                batch = [pending for pending in batch if pending is not None]
+            if len(batch) > 0:
+                self._process(batch)
+
+    def _process(self, batch):
+        """Evaluate each element required by a batch of queries once.
+        """
+        self.nb_batches += 1
+        self.nb_queries += len(batch)
+
+        groups = {}
+        for pending in batch:
+            group = groups.setdefault((pending.operation, pending.name), {})
+            for key in pending.keys:
+                group[key] = None
+
+        for (operation, name), group in groups.iteritems():
+            func = batched_operations[operation]
+            for key in group:
+                try:
+                    group[key] = (True, func(self._graph, name, key))
+                except Exception as err:
+                    group[key] = (False, err)
+            self.nb_evaluations += len(group)
+
+        for pending in batch:
+            group = groups[(pending.operation, pending.name)]
+            res = {}
+            for key in pending.keys:
+                ok, val = group[key]
+                if not ok:
+                    pending.set_error(val)
+                    break
+                res[key] = val
+            else:
+                pending.set_result(res)
+
+    def _work(self):
+        """Answer heavy queries one at a time.
+        """
+        while True:
+            pending = self._pool_queue.get()
+            if pending is None:
+                return
+            func = pooled_operations[pending.operation]
+            try:
+                pending.set_result(func(self._graph, pending.name,
+                                        pending.keys))
+            except Exception as err:
+                pending.set_error(err)
+
+
+class GraphServer(object):
+    """Expose a GraphService to other processes.
+
+    Each connection is handled by its own thread, queries coming from
+    different connections are coalesced by the service.
+    """
+
+    def __init__(self, service, address=("localhost", 0),
+                 authkey=_generated, backlog=64):
+        """Constructor
+
+        args:
+         - service (GraphService): a running service
+         - address (tuple): (host, port) to listen to, default
+                            to a free port on localhost
+         - authkey (str): key shared with clients, if not provided a
+                          random key is generated, see `authkey`
+         - backlog (int): maximum number of connections waiting
+                          to be accepted
+        """
+        if authkey is _generated:
+            authkey = os.urandom(32)
+        self._authkey = _check_authkey(authkey)
+        self._service = service
+        self._listener = Listener(address, backlog=backlog, authkey=authkey)
+        self._thread = None
+        self._closed = False
+
+    @property
+    def address(self):
+        """Address actually listened to.
+        """
+        return self._listener.address
+
+    @property
+    def authkey(self):
+        """Key clients must provide to connect.
+        """
+        return self._authkey
+
+    def start(self):
+        """Accept connections in a background thread.
+        """
+        self._thread = Thread(target=self.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def serve_forever(self):
+        """Accept connections until `close` is called.
+        """
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except Exception:
+                if self._closed:
+                    return
+                continue
+            if self._closed:
+                conn.close()
+                return
+            _no_delay(conn, self.address)
+            thread = Thread(target=self._handle, args=(conn,))
+            thread.daemon = True
+            thread.start()
+
+    def _handle(self, conn):
+        """Answer the queries received on a connection.
+        """
+        try:
+            while True:
+                try:
+                    operation, keys, name = conn.recv()
+                except (EOFError, IOError):
+                    return
+                try:
+                    msg = (True, self._service.query(operation, keys, name))
+                except Exception as err:
+                    msg = (False, err)
+                conn.send(msg)
+        finally:
+            conn.close()
+
+    def close(self):
+        """Stop accepting connections.
+
+        Connections already opened are answered until clients close them.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            # wake up the thread blocked in accept
+            try:
+                Client(self.address, authkey=self._authkey).close()
+            except Exception:
+                pass
+            self._thread.join()
+        self._listener.close()
+
+
+class GraphClient(_QueryAPI):
+    """Query a graph exposed by a GraphServer.
+    """
+
+    def __init__(self, address, authkey):
+        """Constructor
+
+        args:
+         - address (tuple): (host, port) of the server
+         - authkey (str): key shared with the server, see
+                          `GraphServer.authkey`
+        """
+        self._conn = Client(address, authkey=_check_authkey(authkey))
+        _no_delay(self._conn, address)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close the connection to the server.
+        """
+        self._conn.close()
+
+    def query(self, operation, keys, name=None):
+        """Send a query and wait for its result.
+
+        args:
+         - operation (str): one of `batched_operations` or
+                            `pooled_operations`
+         - keys (list of int): ids of elements
+         - name (str): name of property for property queries
+
+        return:
+         - (any)
+        """
+        self._conn.send((operation, list(keys), name))
+        ok, res = self._conn.recv()
+        if not ok:
+            raise res
+        return res
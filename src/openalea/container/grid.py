@@ -17,17 +17,36 @@
 for a grid interface
 """
 
+from itertools import product
+
+from grid_order import (hilbert_decode, hilbert_encode, morton_decode,
+                        morton_encode, nb_bits)
+
+grid_orders = ("row", "morton", "hilbert")
+
 
 class Grid(object):
     """Interface definition of simple N dimensional grids
     with finite number of cell per dimension
     """
 
-    def __init__(self, shape):
+    def __init__(self, shape, order="row"):
         """Constructor of a finite grid.
 
+        Cells are numbered according to order:
+
+            - 'row': first axis varying fastest
+            - 'morton': Z-order curve, requires a power of 2 number of
+                        cells along each axis
+            - 'hilbert': Hilbert curve, requires the same power of 2
+                         number of cells along every axis
+
+        Space filling curves give close indices to neighboring cells,
+        hence better locality to arrays of cell data indexed by cell.
+
         args:
          - shape (iter of int): number of cell in each dimension
+         - order (str): numbering of cells, default 'row'
         """
         self._shape = [int(s) for s in shape]
         offset = [1]
@@ -35,6 +54,21 @@ class Grid(object):
             offset.append(offset[i] * incr)
         self._offset = offset
 
+        if order not in grid_orders:
+            msg = "the required order (%s) is unknown" % order
+            msg += "\navailable orders are %s" % str(list(grid_orders))
+            raise UserWarning(msg)
+        self._order = order
+        if order == "morton":
+            self._bits = [nb_bits(s) for s in self._shape]
+        elif order == "hilbert":
+            if len(set(self._shape)) > 1:
+                raise ValueError("hilbert order requires the same number "
+                                 "of cells along every axis")
+            self._bits = nb_bits(self._shape[0]) if self._shape else 0
+        else:
+            self._bits = None
+
     # ##########################################################
     #
     #               Grid concept
@@ -56,6 +90,14 @@ class Grid(object):
         """
         return iter(self._shape)
 
+    def order(self):
+        """Numbering of cells, one of `grid_orders`.
+
+        return:
+         - (str)
+        """
+        return self._order
+
     # ##########################################################
     #
     #               Cell list concept
@@ -101,6 +143,9 @@ class Grid(object):
 
             ind += coord[i] * offset
 
+        if self._order != "row":
+            return self._encode(list(coord))
+
         return ind
 
     def coordinates(self, ind):
@@ -118,6 +163,9 @@ class Grid(object):
             msg = "index out of range index: %d max : %d" % (ind, imax)
             raise IndexError(msg)
 
+        if self._order != "row":
+            return tuple(self._decode(ind))
+
         residue = ind
         coord = []
         for i in xrange(self.dim() - 1, -1, -1):
@@ -127,3 +175,247 @@ class Grid(object):
         coord.reverse()
 
         return tuple(coord)
+
+    def _encode(self, coords):
+        """Index of cells from their coordinates along each axis.
+
+        args:
+         - coords (list of int|np.array)
+
+        return:
+         - (int|np.array)
+        """
+        if self._order == "morton":
+            return morton_encode(coords, self._bits)
+        if self._order == "hilbert":
+            return hilbert_encode(coords, self._bits)
+        ind = coords[0] * 0
+        for coord, offset in zip(coords, self._offset):
+            ind = ind + coord * offset
+        return ind
+
+    def _decode(self, ind):
+        """Coordinates along each axis of cells from their index.
+
+        args:
+         - ind (int|np.array)
+
+        return:
+         - (list of int|np.array)
+        """
+        if self._order == "morton":
+            return morton_decode(ind, self._bits)
+        if self._order == "hilbert":
+            return hilbert_decode(ind, len(self._shape), self._bits)
+        return [(ind // offset) % size
+                for offset, size in zip(self._offset, self._shape)]
+
+    def indices(self, coords):
+        """Compute the index of many cells at once.
+
+        Vectorized version of `index`. Requires NumPy.
+
+        args:
+         - coords (array of int): (nb_cells, dim) position of each cell
+
+        return:
+         - (np.array of int)
+        """
+        import numpy as np
+
+        dim = len(self._shape)
+        coords = np.asarray(coords, dtype=np.int64).reshape(-1, dim)
+        if len(coords) > 0:
+            valid = (coords >= 0) & (coords < np.array(self._shape))
+            if not valid.all():
+                raise IndexError("coords out of grid")
+        if dim == 0:
+            return np.zeros(len(coords), dtype=np.int64)
+        return self._encode([coords[:, axis] for axis in xrange(dim)])
+
+    def coordinates_array(self, inds):
+        """Compute the position of many cells at once.
+
+        Vectorized version of `coordinates`. Requires NumPy.
+
+        args:
+         - inds (array of int): index of each cell
+
+        return:
+         - (np.array of int): (nb_cells, dim) position of each cell
+        """
+        import numpy as np
+
+        inds = np.asarray(inds, dtype=np.int64).reshape(-1)
+        imax = len(self)
+        if len(inds) > 0 and (inds.min() < 0 or inds.max() >= imax):
+            raise IndexError("index out of range max : %d" % imax)
+        coords = self._decode(inds)
+        return np.array(coords, dtype=np.int64).reshape(
+            len(self._shape), len(inds)).T
+
+    # ##########################################################
+    #
+    #               Region concept
+    #
+    # ##########################################################
+    def _box_ranges(self, lo, hi, step=None):
+        """Coordinates along each axis of the cells of a box.
+
+        return:
+         - (list of xrange)
+        """
+        dim = len(self._shape)
+        if step is None:
+            step = (1,) * dim
+        if len(lo) != dim or len(hi) != dim or len(step) != dim:
+            raise IndexError("box must have %d dimensions" % dim)
+
+        ranges = []
+        for axis in xrange(dim):
+            if not (0 <= lo[axis] <= hi[axis] <= self._shape[axis]):
+                msg = "box [%d, %d[ along axis %d not valid" % (
+                    lo[axis], hi[axis], axis)
+                raise IndexError(msg)
+            if step[axis] < 1:
+                raise ValueError("step along axis %d must be positive"
+                                 % axis)
+            ranges.append(xrange(lo[axis], hi[axis], step[axis]))
+
+        return ranges
+
+    def _iter_ranges(self, ranges):
+        """Iterate on index of the cells whose coordinates along each
+        axis belong to ranges, in increasing order of index.
+        """
+        if len(ranges) == 0 or any(len(rg) == 0 for rg in ranges):
+            return
+
+        if self._order != "row":
+            for ind in sorted(self._encode(list(coord))
+                              for coord in product(*ranges)):
+                yield ind
+            return
+
+        # cells along the first axis are contiguous, hence each row
+        # of the box is a range of indices
+        first = ranges[0]
+        start = first[0]
+        stop = first[-1] + 1
+        step = first[1] - first[0] if len(first) > 1 else 1
+        outer = ranges[1:]
+        offsets = self._offset[1:]
+        coord = [0] * len(outer)
+        while True:
+            base = 0
+            for rg, ind, offset in zip(outer, coord, offsets):
+                base += rg[ind] * offset
+            for ind in xrange(base + start, base + stop, step):
+                yield ind
+
+            # next row
+            axis = 0
+            while axis < len(outer):
+                coord[axis] += 1
+                if coord[axis] < len(outer[axis]):
+                    break
+                coord[axis] = 0
+                axis += 1
+            else:
+                return
+
+    def _ranges_indices(self, ranges):
+        """Index of the cells whose coordinates along each axis belong
+        to ranges, first axis varying fastest.
+        """
+        import numpy as np
+
+        if len(ranges) == 0 or any(len(rg) == 0 for rg in ranges):
+            return np.zeros(0, dtype=int)
+
+        dim = len(ranges)
+        if self._order != "row":
+            # last axis of the array is the first axis of the grid
+            mesh = np.meshgrid(*[np.array(rg, dtype=np.int64)
+                                 for rg in reversed(ranges)], indexing='ij')
+            return self._encode([coord.ravel() for coord in reversed(mesh)])
+
+        res = np.zeros((1,) * dim, dtype=int)
+        for axis, (rg, offset) in enumerate(zip(ranges, self._offset)):
+            # last axis of the array is the first axis of the grid
+            shape = [1] * dim
+            shape[dim - 1 - axis] = len(rg)
+            res = res + (np.array(rg, dtype=int) * offset).reshape(shape)
+
+        return res.ravel()
+
+    def iter_box(self, lo, hi, step=None):
+        """Iterate on index of each cell in a box.
+
+        Cells are visited in increasing order of index, i.e. first axis
+        varying fastest for grids in row order.
+
+        args:
+         - lo (tuple of int): lower corner of the box, included
+         - hi (tuple of int): upper corner of the box, excluded
+         - step (tuple of int): step along each axis, default 1
+
+        return:
+         - (iter of int)
+        """
+        return self._iter_ranges(self._box_ranges(lo, hi, step))
+
+    def box_indices(self, lo, hi, step=None):
+        """Index of each cell in a box.
+
+        Same as `iter_box`, computed with array operations.
+        Requires NumPy.
+
+        args:
+         - lo (tuple of int): lower corner of the box, included
+         - hi (tuple of int): upper corner of the box, excluded
+         - step (tuple of int): step along each axis, default 1
+
+        return:
+         - (np.array of int)
+        """
+        inds = self._ranges_indices(self._box_ranges(lo, hi, step))
+        if self._order != "row":
+            inds.sort()
+        return inds
+
+    def slice_indices(self, slices):
+        """Index of the cells selected by a slice along each axis.
+
+        Slices follow the python conventions, negative bounds count
+        from the end of the axis and negative steps reverse the
+        order of cells. Requires NumPy.
+
+        args:
+         - slices (tuple of slice|int): selection along each axis,
+                  an int selects a single coordinate, missing trailing
+                  axes are entirely selected
+
+        return:
+         - (np.array of int): first axis varying fastest, whatever
+                              the order of the grid
+        """
+        dim = len(self._shape)
+        if len(slices) > dim:
+            raise IndexError("too many axes (%d) for grid of dimension %d"
+                             % (len(slices), dim))
+
+        ranges = []
+        for axis, size in enumerate(self._shape):
+            sel = slices[axis] if axis < len(slices) else slice(None)
+            if isinstance(sel, slice):
+                ranges.append(xrange(*sel.indices(size)))
+            else:
+                coord = sel + size if sel < 0 else sel
+                if not (0 <= coord < size):
+                    msg = "coord (%d) along axis %d not valid" % (sel, axis)
+                    raise IndexError(msg)
+                ranges.append(xrange(coord, coord + 1))
+
+        return self._ranges_indices(ranges)
+
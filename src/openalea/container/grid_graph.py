@@ -0,0 +1,425 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+#       GridGraph : container package
+#
+#       Distributed under the Cecill-C License.
+#       See accompanying file LICENSE.txt or copy at
+#           http://www.cecill.info/licences/Licence_CeCILL-C_V1-en.html
+#
+"""This module provide a read only graph view of the cells of a Grid.
+
+Each cell is a vertex, identified by its index in the grid, connected to
+the neighboring cells along each axis by two edges, one in each
+direction. Nothing is stored, vertices and edges are computed from the
+shape of the grid:
+
+    - eid = (cell * dim + axis) * 2 + direction
+    - direction 0 points toward increasing coordinates, 1 toward
+      decreasing coordinates
+
+Edge ids of cells on the border of the grid pointing outside the grid
+are not used.
+"""
+
+from numbers import Integral
+
+from graph import GraphError, InvalidEdge, InvalidVertex
+
+
+def _is_int(val):
+    return type(val) is int or isinstance(val, Integral)
+
+
+def _read_only(*args, **kwds):
+    raise GraphError("grid graphs are read only")
+
+
+class GridGraph(object):
+    """Graph interface on top of a Grid.
+    """
+
+    # topology never changes
+    _revision = 0
+
+    def __init__(self, grid):
+        """Constructor
+
+        args:
+         - grid (Grid): grid whose cells are the vertices, in row order
+        """
+        if grid.order() != "row":
+            raise ValueError("grid must number its cells in row order")
+        self._grid = grid
+        self._shape = list(grid._shape)
+        self._offset = list(grid._offset)
+        self._dim = len(self._shape)
+        self._nb = len(grid)
+
+    def grid(self):
+        """Grid whose cells are the vertices of this graph.
+
+        return:
+         - (Grid)
+        """
+        return self._grid
+
+    def _coord(self, vid, axis):
+        return (vid // self._offset[axis]) % self._shape[axis]
+
+    def _decode(self, eid):
+        """Source, axis and direction of an edge.
+        """
+        if not self.has_edge(eid):
+            raise InvalidEdge(eid)
+        rest, direction = divmod(eid, 2)
+        cell, axis = divmod(rest, self._dim)
+        return cell, axis, direction
+
+    def _eid(self, cell, axis, direction):
+        return (cell * self._dim + axis) * 2 + direction
+
+    def _check(self, vid):
+        if not self.has_vertex(vid):
+            raise InvalidVertex(vid)
+
+    # ##########################################################
+    #
+    # Graph concept
+    #
+    # ##########################################################
+    def source(self, eid):
+        """Retrieve the source vertex of an edge
+
+        args:
+         - eid (int):  edge id
+
+        return:
+         - (int): vertex id
+        """
+        return self._decode(eid)[0]
+
+    def target(self, eid):
+        """Retrieve the target vertex of an edge
+
+        args:
+         - eid (int):  edge id
+
+        return:
+         - (int): vertex id
+        """
+        cell, axis, direction = self._decode(eid)
+        if direction == 0:
+            return cell + self._offset[axis]
+        return cell - self._offset[axis]
+
+    def edge_vertices(self, eid):
+        """Retrieve both source and target vertex of an edge
+
+        args:
+         - eid (int):  edge id
+
+        return:
+         - (int, int): source id, target id
+        """
+        cell, axis, direction = self._decode(eid)
+        if direction == 0:
+            return cell, cell + self._offset[axis]
+        return cell, cell - self._offset[axis]
+
+    def edge(self, source, target):
+        """Find the matching edge with same source and same target
+        return None if it don't succeed
+
+        args:
+         - source (int): source vertex
+         - target (int): target vertex
+
+        return:
+         - (int): edge id with same source and target
+         - (None): if search is unsuccessful
+        """
+        self._check(source)
+        self._check(target)
+        delta = target - source
+        for axis, offset in enumerate(self._offset):
+            coord = self._coord(source, axis)
+            if delta == offset and coord < self._shape[axis] - 1:
+                return self._eid(source, axis, 0)
+            if delta == -offset and coord > 0:
+                return self._eid(source, axis, 1)
+        return None
+
+    def __contains__(self, vid):
+        """magic alias for `has_vertex`
+        """
+        return self.has_vertex(vid)
+
+    def has_vertex(self, vid):
+        """test whether a vertex belong to the graph
+
+        args:
+         - vid (int): id of vertex
+
+        return:
+         - (bool)
+        """
+        return _is_int(vid) and 0 <= vid < self._nb
+
+    def has_edge(self, eid):
+        """test whether an edge belong to the graph
+
+        args:
+         - eid (int): id of edge
+
+        return:
+         - (bool)
+        """
+        if not (_is_int(eid) and 0 <= eid < self._nb * self._dim * 2):
+            return False
+        rest, direction = divmod(eid, 2)
+        cell, axis = divmod(rest, self._dim)
+        coord = self._coord(cell, axis)
+        if direction == 0:
+            return coord < self._shape[axis] - 1
+        return coord > 0
+
+    def is_valid(self):
+        """Test the validity of the graph
+
+        return:
+         - (bool)
+        """
+        return True
+
+    # ##########################################################
+    #
+    # Vertex List Graph Concept
+    #
+    # ##########################################################
+    def vertices(self):
+        """Iterator on all vertices
+
+        return:
+         - (iter of int)
+        """
+        return iter(xrange(self._nb))
+
+    def __iter__(self):
+        """Magic alias for `vertices`
+        """
+        return iter(xrange(self._nb))
+
+    def nb_vertices(self):
+        """Total number of vertices in the graph
+
+        return:
+         - (int)
+        """
+        return self._nb
+
+    def __len__(self):
+        """Magic alias for `nb_vertices`
+        """
+        return self._nb
+
+    def _neighbors(self, vid):
+        """Cells adjacent to vid along each axis.
+        """
+        self._check(vid)
+        res = []
+        for axis, offset in enumerate(self._offset):
+            coord = self._coord(vid, axis)
+            if coord > 0:
+                res.append(vid - offset)
+            if coord < self._shape[axis] - 1:
+                res.append(vid + offset)
+        return res
+
+    def in_neighbors(self, vid):
+        """Iterator on the neighbors of vid
+        where edges are directed from neighbor to vid
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (iter of int): iter of vertex id
+        """
+        return iter(self._neighbors(vid))
+
+    def out_neighbors(self, vid):
+        """Iterator on the neighbors of vid
+        where edges are directed from vid to neighbor
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (iter of int): iter of vertex id
+        """
+        return iter(self._neighbors(vid))
+
+    def neighbors(self, vid):
+        """Iterator on all neighbors of vid both in and out
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (iter of int): iter of vertex id
+        """
+        return iter(self._neighbors(vid))
+
+    def nb_in_neighbors(self, vid):
+        """Number of in neighbors of vid
+        where edges are directed from neighbor to vid
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (int)
+        """
+        return len(self._neighbors(vid))
+
+    def nb_out_neighbors(self, vid):
+        """Number of out neighbors of vid
+        where edges are directed from vid to neighbor
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (int)
+        """
+        return len(self._neighbors(vid))
+
+    def nb_neighbors(self, vid):
+        """Total number of both in and out neighbors of vid
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (int)
+        """
+        return len(self._neighbors(vid))
+
+    # ##########################################################
+    #
+    # Edge List Graph Concept
+    #
+    # ##########################################################
+    def _iter_all_edges(self):
+        for cell in xrange(self._nb):
+            for eid in self._out_edges(cell):
+                yield eid
+
+    def edges(self, vid=None):
+        """Iterate on all edges connected to a given vertex.
+
+        If vid is None (default), iterate on all edges in the graph
+
+        args:
+         - vid (int): vertex holdings edges, default (None)
+
+        return:
+         - (iter of int): iterator on edge ids
+        """
+        if vid is None:
+            return self._iter_all_edges()
+        return iter(self._in_edges(vid) + self._out_edges(vid))
+
+    def nb_edges(self, vid=None):
+        """Number of edges connected to a given vertex.
+
+        If vid is None (default), total number of edges in the graph
+
+        args:
+         - vid (int): vertex holdings edges, default (None)
+
+        return:
+         - (int)
+        """
+        if vid is None:
+            if self._nb == 0:
+                return 0
+            return sum(2 * (self._nb // shape) * (shape - 1)
+                       for shape in self._shape)
+        return 2 * len(self._neighbors(vid))
+
+    def _in_edges(self, vid):
+        self._check(vid)
+        res = []
+        for axis, offset in enumerate(self._offset):
+            coord = self._coord(vid, axis)
+            if coord > 0:
+                res.append(self._eid(vid - offset, axis, 0))
+            if coord < self._shape[axis] - 1:
+                res.append(self._eid(vid + offset, axis, 1))
+        return res
+
+    def _out_edges(self, vid):
+        self._check(vid)
+        res = []
+        for axis in xrange(self._dim):
+            coord = self._coord(vid, axis)
+            if coord > 0:
+                res.append(self._eid(vid, axis, 1))
+            if coord < self._shape[axis] - 1:
+                res.append(self._eid(vid, axis, 0))
+        return res
+
+    def in_edges(self, vid):
+        """Iterate on all edges pointing to a given vertex.
+
+        args:
+         - vid (int): vertex target of edges
+
+        return:
+         - (iter of int): iterator on edge ids
+        """
+        return iter(self._in_edges(vid))
+
+    def out_edges(self, vid):
+        """Iterate on all edges away from a given vertex.
+
+        args:
+         - vid (int): vertex source of edges
+
+        return:
+         - (iter of int): iterator on edge ids
+        """
+        return iter(self._out_edges(vid))
+
+    def nb_in_edges(self, vid):
+        """Number of edges pointing to a given vertex.
+
+        args:
+         - vid (int): vertex target of edges
+
+        return:
+         - (int)
+        """
+        return len(self._neighbors(vid))
+
+    def nb_out_edges(self, vid):
+        """Number of edges away from a given vertex.
+
+        args:
+         - vid (int): vertex source of edges
+
+        return:
+         - (int)
+        """
+        return len(self._neighbors(vid))
+
+    # ##########################################################
+    #
+    # Mutable concepts
+    #
+    # ##########################################################
+    add_vertex = remove_vertex = clear = _read_only
+    add_edge = remove_edge = clear_edges = _read_only
+    extend = compact = _read_only
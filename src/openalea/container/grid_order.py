@@ -0,0 +1,187 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+#       GridOrder : container package
+#
+#       Distributed under the Cecill-C License.
+#       See accompanying file LICENSE.txt or copy at
+#           http://www.cecill.info/licences/Licence_CeCILL-C_V1-en.html
+#
+"""This module provide space filling curves used to number the cells of
+a Grid (see `Grid.__init__`).
+
+    - morton: Z-order, bits of coordinates are interleaved
+    - hilbert: cells consecutive along the curve are always neighbors
+
+Cells close in space receive close indices, which improve the locality
+of arrays of cell data indexed by cell index.
+
+Functions accept coordinates and indices either as ints or as NumPy
+arrays of int, in which case all cells are processed at once.
+"""
+
+
+def _where(mask, val_true, val_false):
+    if isinstance(mask, bool):
+        return val_true if mask else val_false
+    import numpy as np
+
+    return np.where(mask, val_true, val_false)
+
+
+def nb_bits(size):
+    """Number of bits needed to number size cells along an axis.
+
+    args:
+     - size (int): number of cells, must be a power of 2
+
+    return:
+     - (int)
+    """
+    if size < 1 or size & (size - 1) != 0:
+        raise ValueError("size (%d) must be a power of 2" % size)
+    return size.bit_length() - 1
+
+
+def _interleave(coords, sequence):
+    """Gather bits of coordinates in a single index.
+
+    args:
+     - coords (list of int|np.array)
+     - sequence (list of (int, int)): axis and bit of coordinate
+                stored in each bit of index, least significant first
+    """
+    ind = coords[0] & 0
+    for pos, (axis, bit) in enumerate(sequence):
+        ind = ind | (((coords[axis] >> bit) & 1) << pos)
+    return ind
+
+
+def _deinterleave(ind, dim, sequence):
+    """Inverse of `_interleave`.
+    """
+    coords = [ind & 0 for axis in range(dim)]
+    for pos, (axis, bit) in enumerate(sequence):
+        coords[axis] = coords[axis] | (((ind >> pos) & 1) << bit)
+    return coords
+
+
+def _morton_sequence(bits):
+    """Bits of coordinates in the order of the bits of Morton index.
+
+    Axes with less bits than others are skipped once exhausted, hence
+    indices are dense even for boxes that are not cubes.
+    """
+    sequence = []
+    for level in range(max(bits) if len(bits) > 0 else 0):
+        for axis, nb in enumerate(bits):
+            if level < nb:
+                sequence.append((axis, level))
+    return sequence
+
+
+def morton_encode(coords, bits):
+    """Morton index of cells.
+
+    args:
+     - coords (list of int|np.array): coordinate along each axis
+     - bits (list of int): number of bits of each axis
+
+    return:
+     - (int|np.array)
+    """
+    return _interleave(coords, _morton_sequence(bits))
+
+
+def morton_decode(ind, bits):
+    """Coordinates of cells from their Morton index.
+
+    args:
+     - ind (int|np.array): index of cells
+     - bits (list of int): number of bits of each axis
+
+    return:
+     - (list of int|np.array): coordinate along each axis
+    """
+    return _deinterleave(ind, len(bits), _morton_sequence(bits))
+
+
+def _hilbert_sequence(dim, bits):
+    """Bits of transposed Hilbert index, first axis most significant.
+    """
+    return [(dim - 1 - k, level) for level in range(bits)
+            for k in range(dim)]
+
+
+def hilbert_encode(coords, bits):
+    """Hilbert index of cells.
+
+    Uses the transposition algorithm of J. Skilling, "Programming the
+    Hilbert curve", AIP Conf. Proc. 707, 2004.
+
+    args:
+     - coords (list of int|np.array): coordinate along each axis
+     - bits (int): number of bits of every axis
+
+    return:
+     - (int|np.array)
+    """
+    dim = len(coords)
+    x = list(coords)
+    if bits > 0:
+        # inverse undo
+        q = 1 << (bits - 1)
+        while q > 1:
+            p = q - 1
+            for i in range(dim):
+                mask = (x[i] & q) != 0
+                x[0] = x[0] ^ _where(mask, p, 0)
+                t = _where(mask, 0, (x[0] ^ x[i]) & p)
+                x[0] = x[0] ^ t
+                x[i] = x[i] ^ t
+            q >>= 1
+        # gray encode
+        for i in range(1, dim):
+            x[i] = x[i] ^ x[i - 1]
+        t = x[0] & 0
+        q = 1 << (bits - 1)
+        while q > 1:
+            t = t ^ _where((x[dim - 1] & q) != 0, q - 1, 0)
+            q >>= 1
+        for i in range(dim):
+            x[i] = x[i] ^ t
+
+    return _interleave(x, _hilbert_sequence(dim, bits))
+
+
+def hilbert_decode(ind, dim, bits):
+    """Coordinates of cells from their Hilbert index.
+
+    args:
+     - ind (int|np.array): index of cells
+     - dim (int): number of axes
+     - bits (int): number of bits of every axis
+
+    return:
+     - (list of int|np.array): coordinate along each axis
+    """
+    x = _deinterleave(ind, dim, _hilbert_sequence(dim, bits))
+    if bits > 0:
+        # gray decode
+        t = x[dim - 1] >> 1
+        for i in range(dim - 1, 0, -1):
+            x[i] = x[i] ^ x[i - 1]
+        x[0] = x[0] ^ t
+        # undo excess work
+        q = 2
+        while q != 1 << bits:
+            p = q - 1
+            for i in range(dim - 1, -1, -1):
+                mask = (x[i] & q) != 0
+                x[0] = x[0] ^ _where(mask, p, 0)
+                t = _where(mask, 0, (x[0] ^ x[i]) & p)
+                x[0] = x[0] ^ t
+                x[i] = x[i] ^ t
+            q <<= 1
+
+    return x
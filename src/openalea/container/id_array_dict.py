@@ -0,0 +1,227 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+#       IdArrayDict : container package
+#
+#       Distributed under the Cecill-C License.
+#       See accompanying file LICENSE.txt or copy at
+#           http://www.cecill.info/licences/Licence_CeCILL-C_V1-en.html
+#
+"""This module provide an array based alternative to IdDict.
+
+Values are stored in a list indexed by their id, along with a bytearray
+flagging the ids in use. For the small dense ids produced by id
+generators, this takes a fraction of the memory of a dict. Ids released
+by removals leave holes that the id generator fills again.
+"""
+
+from collections import MutableMapping
+from itertools import compress, izip
+from numbers import Integral
+
+from id_dict import IdGen
+
+
+def _check_key(key):
+    if type(key) is not int and (not isinstance(key, Integral) or
+                                 isinstance(key, bool)):
+        raise KeyError(key)
+
+
+class IdArrayDict(MutableMapping):
+    """Mapping with the same interface as IdDict, that store values
+    in a list indexed by ids.
+    """
+
+    def __init__(self, *args, **kwds):
+        gen_name = kwds.pop("idgenerator", "set")
+        try:
+            self._id_generator = IdGen[gen_name]()
+        except KeyError:
+            msg = "the required id generator (%s) is unknown" % gen_name
+            msg += "\navailable generator are %s" % str(IdGen.keys())
+            raise UserWarning(msg)
+
+        self._values = []
+        self._present = bytearray()
+        self._len = 0
+        if len(args) > 0 or len(kwds) > 0:
+            self.update(*args, **kwds)
+
+    def get_generator_type(self):
+        """Retrieve name of id generator used
+        """
+        for name, typevalue in IdGen.items():
+            if type(self._id_generator) == typevalue:
+                return name
+
+    def _grow(self, size):
+        """Extend storage to hold ids up to size - 1.
+        """
+        nb = size - len(self._values)
+        if nb > 0:
+            self._values.extend([None] * nb)
+            self._present.extend(bytearray(nb))
+
+    def _store(self, key, val):
+        """Store the value of a key already registered in the generator.
+        """
+        self._grow(key + 1)
+        self._values[key] = val
+        self._present[key] = 1
+        self._len += 1
+
+    def add(self, val, key=None):
+        """Insert a new value in the dict generating an id
+        to use as key if needed.
+
+        args:
+         - val (any): value to store
+         - key (int): key to use, if None (default) a new one will generated
+        """
+        if key is not None:
+            _check_key(key)
+        try:
+            key = self._id_generator.get_id(key)
+        except (IndexError, TypeError):
+            raise KeyError(key)
+        self._store(key, val)
+        return key
+
+    def add_many(self, vals):
+        """Insert a list of values generating a new id for each of them.
+
+        args:
+         - vals (iter of any): values to store
+
+        return:
+         - (list of int): keys used, in the same order as vals
+        """
+        vals = list(vals)
+        keys = self._id_generator.new_ids(len(vals))
+        if len(keys) > 0:
+            self._grow(max(keys) + 1)
+        values = self._values
+        present = self._present
+        for key, val in izip(keys, vals):
+            values[key] = val
+            present[key] = 1
+        self._len += len(keys)
+        return keys
+
+    @classmethod
+    def fromkeys(cls, keys, value=None, idgenerator="set"):
+        """Create a dict with the given keys, all sharing the same value.
+
+        args:
+         - keys (iter of int): keys to use
+         - value (any): value associated to each key, default None
+         - idgenerator (str): type of id generator, default 'set'
+
+        return:
+         - (IdArrayDict)
+        """
+        res = cls(idgenerator=idgenerator)
+        res.update(dict.fromkeys(keys, value))
+        return res
+
+    def copy(self):
+        res = IdArrayDict(idgenerator=self.get_generator_type())
+        res.update(self.iteritems())
+        return res
+
+    ################################################
+    #
+    #               dict interface
+    #
+    ################################################
+    def __getitem__(self, key):
+        try:
+            if self._present[key] and key >= 0:
+                return self._values[key]
+        except (IndexError, TypeError):
+            pass
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            if self._present[key] and key >= 0:
+                return self._values[key]
+        except (IndexError, TypeError):
+            pass
+        return default
+
+    def __contains__(self, key):
+        try:
+            return self._present[key] == 1 and key >= 0
+        except (IndexError, TypeError):
+            return False
+
+    has_key = __contains__
+
+    def __setitem__(self, key, val):
+        if key in self:
+            self._values[key] = val
+        else:
+            _check_key(key)
+            try:
+                self._id_generator.get_id(key)
+            except IndexError:
+                raise KeyError(key)
+            self._store(key, val)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._values[key] = None
+        self._present[key] = 0
+        self._len -= 1
+        self._id_generator.release_id(key)
+
+    def __iter__(self):
+        return compress(xrange(len(self._present)), self._present)
+
+    def __len__(self):
+        return self._len
+
+    def __repr__(self):
+        return "IdArrayDict(%r)" % dict(self.iteritems())
+
+    iterkeys = __iter__
+
+    def itervalues(self):
+        return compress(self._values, self._present)
+
+    def iteritems(self):
+        return izip(self.iterkeys(), self.itervalues())
+
+    def clear(self):
+        self._values = []
+        self._present = bytearray()
+        self._len = 0
+        self._id_generator.clear()
+
+    def update(self, *args, **kwds):
+        """Insert or replace many elements at once.
+
+        Accept the same arguments as dict.update. New keys are registered
+        in the id generator in a single step, if one of them is not a
+        valid id the dict is left unchanged and a KeyError is raised.
+        """
+        items = dict(*args, **kwds)
+        new_keys = [key for key in items if key not in self]
+        for key in new_keys:
+            _check_key(key)
+        try:
+            self._id_generator.get_ids(new_keys)
+        except IndexError as err:
+            raise KeyError(str(err))
+
+        if len(new_keys) > 0:
+            self._grow(max(new_keys) + 1)
+        values = self._values
+        present = self._present
+        for key, val in items.iteritems():
+            values[key] = val
+            present[key] = 1
+        self._len += len(new_keys)
@@ -16,6 +16,9 @@
 """This module provide a dictionary that create keys when needed.
 """
 
+from itertools import izip
+from numbers import Integral
+
 from id_generator import IdMaxGenerator, IdSetGenerator, IdListGenerator
 
 IdGen = {"max": IdMaxGenerator,
@@ -23,9 +26,20 @@ IdGen = {"max": IdMaxGenerator,
          "list": IdListGenerator}
 
 
+def _is_id(key):
+    """Test whether key can be used as an id, bools are rejected.
+    """
+    return type(key) is int or (isinstance(key, Integral) and
+                                not isinstance(key, bool))
+
+
 class IdDict(dict):
     """Store a tuple of (id,elm) like a normal dict
     Create an id to use as key when needed
+
+    Reads are plain dict reads. Single key writes go through
+    `__setitem__`, which registers new keys in the id generator, use
+    `update`, `add_many` or `fromkeys` to write many elements at once.
     """
 
     def __init__(self, *args, **kwdargs):
@@ -37,9 +51,7 @@ class IdDict(dict):
 
         self._id_generator = None
         self._init_id_generator(gen_name)
-
-        for k in self.keys():
-            self._id_generator.get_id(k)
+        self._reserve(self.keys())
 
     def _init_id_generator(self, gen_name='set'):
         try:
@@ -56,6 +68,23 @@ class IdDict(dict):
             if type(self._id_generator) == typevalue:
                 return name
 
+    def _reserve(self, keys):
+        """Mark new keys as used in the id generator.
+
+        Either all keys are marked or none of them and a KeyError is
+        raised.
+
+        args:
+         - keys (list of int): keys not in self
+        """
+        for key in keys:
+            if not _is_id(key):
+                raise KeyError(key)
+        try:
+            self._id_generator.get_ids(keys)
+        except IndexError as err:
+            raise KeyError(str(err))
+
     def add(self, val, key=None):
         """Insert a new value in the dict generating an id
         to use as key if needed.
@@ -64,6 +93,8 @@ class IdDict(dict):
          - val (any): value to store
          - key (int): key to use, if None (default) a new one will generated
         """
+        if key is not None and not _is_id(key):
+            raise KeyError(key)
         try:
             key = self._id_generator.get_id(key)
             dict.__setitem__(self, key, val)
@@ -73,6 +104,41 @@ class IdDict(dict):
         except TypeError:
             raise KeyError(key)
 
+    def add_many(self, vals):
+        """Insert a list of values generating a new id for each of them.
+
+        args:
+         - vals (iter of any): values to store
+
+        return:
+         - (list of int): keys used, in the same order as vals
+        """
+        vals = list(vals)
+        keys = self._id_generator.new_ids(len(vals))
+        dict.update(self, izip(keys, vals))
+        return keys
+
+    @classmethod
+    def fromkeys(cls, keys, value=None, idgenerator="set"):
+        """Create a dict with the given keys, all sharing the same value.
+
+        args:
+         - keys (iter of int): keys to use
+         - value (any): value associated to each key, default None
+         - idgenerator (str): type of id generator, default 'set'
+
+        return:
+         - (IdDict)
+        """
+        res = cls(idgenerator=idgenerator)
+        res.update(dict.fromkeys(keys, value))
+        return res
+
+    def __reduce__(self):
+        # keys are restored before the state that holds the generator,
+        # hence build with a temporary generator replaced afterward
+        return type(self), (), self.__dict__, None, self.iteritems()
+
     def __deepcopy__(self, memo):
         from copy import deepcopy
         newobj = IdDict(idgenerator=self.get_generator_type())
@@ -92,8 +158,8 @@ class IdDict(dict):
 
     def __setitem__(self, key, val):
         if key not in self:
-            # if not hasattr(self, '_id_generator'):  # TODO test this case
-            #     self._init_id_generator()
+            if not _is_id(key):
+                raise KeyError(key)
             try:
                 self._id_generator.get_id(key)
             except TypeError:
@@ -125,11 +191,21 @@ class IdDict(dict):
 
     def setdefault(self, key, *args):
         if key not in self:
+            if not _is_id(key):
+                raise KeyError(key)
             try:
                 self._id_generator.get_id(key)
             except TypeError:
                 raise KeyError
         return dict.setdefault(self, key, *args)
 
-    def update(self, E=None, **F):
-        raise NotImplementedError("lapin compris")
+    def update(self, *args, **kwds):
+        """Insert or replace many elements at once.
+
+        Accept the same arguments as dict.update. New keys are registered
+        in the id generator in a single step, if one of them is not a
+        valid id the dict is left unchanged and a KeyError is raised.
+        """
+        items = dict(*args, **kwds)
+        self._reserve([key for key in items if key not in self])
+        dict.update(self, items)
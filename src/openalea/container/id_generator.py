@@ -48,6 +48,34 @@ class IdMaxGenerator(object):
             self._id_max = max(self._id_max, pid + 1)
             return pid
 
+    def new_ids(self, nb):
+        """Generate nb new ids.
+
+        args:
+         - nb (int): number of ids
+
+        return:
+         - (list of int)
+        """
+        ret = range(self._id_max, self._id_max + nb)
+        self._id_max += nb
+        return ret
+
+    def get_ids(self, pids):
+        """Mark a list of ids as used.
+
+        Either all ids are marked or, if one of them is already used,
+        none of them and an IndexError is raised.
+
+        args:
+         - pids (list of int): distinct ids to use
+        """
+        if len(pids) == 0:
+            return
+        if min(pids) < self._id_max:
+            raise IndexError("id %d already used" % min(pids))
+        self._id_max = max(pids) + 1
+
     def release_id(self, pid):
         """Mark the given id as available
 
@@ -97,6 +125,45 @@ class IdSetGenerator(object):
                 except KeyError:
                     raise IndexError("id %d already used" % pid)
 
+    def new_ids(self, nb):
+        """Generate nb new ids.
+
+        args:
+         - nb (int): number of ids
+
+        return:
+         - (list of int)
+        """
+        available = self._available_ids
+        ret = [available.pop() for i in xrange(min(nb, len(available)))]
+        nb_new = nb - len(ret)
+        ret.extend(xrange(self._id_max, self._id_max + nb_new))
+        self._id_max += nb_new
+        return ret
+
+    def get_ids(self, pids):
+        """Mark a list of ids as used.
+
+        Either all ids are marked or, if one of them is already used,
+        none of them and an IndexError is raised.
+
+        args:
+         - pids (list of int): distinct ids to use
+        """
+        if len(pids) == 0:
+            return
+        pids = set(pids)
+        if min(pids) < self._id_max:
+            low = set(pid for pid in pids if pid < self._id_max)
+            if not low <= self._available_ids:
+                raise IndexError("id %d already used"
+                                 % min(low - self._available_ids))
+            self._available_ids -= low
+        pid_max = max(pids)
+        if pid_max >= self._id_max:
+            self._available_ids |= set(xrange(self._id_max, pid_max)) - pids
+            self._id_max = pid_max + 1
+
     def release_id(self, pid):
         """Mark the given id as available
 
@@ -153,6 +220,47 @@ class IdListGenerator(object):
                 except ValueError:
                     raise IndexError("id %d already used" % pid)
 
+    def new_ids(self, nb):
+        """Generate nb new ids.
+
+        args:
+         - nb (int): number of ids
+
+        return:
+         - (list of int)
+        """
+        nb_reused = min(nb, len(self._id_list))
+        ret = self._id_list[len(self._id_list) - nb_reused:]
+        ret.reverse()
+        del self._id_list[len(self._id_list) - nb_reused:]
+        ret.extend(xrange(self._id_max, self._id_max + nb - nb_reused))
+        self._id_max += nb - nb_reused
+        return ret
+
+    def get_ids(self, pids):
+        """Mark a list of ids as used.
+
+        Either all ids are marked or, if one of them is already used,
+        none of them and an IndexError is raised.
+
+        args:
+         - pids (list of int): distinct ids to use
+        """
+        if len(pids) == 0:
+            return
+        pids = set(pids)
+        if min(pids) < self._id_max:
+            low = set(pid for pid in pids if pid < self._id_max)
+            available = set(self._id_list)
+            if not low <= available:
+                raise IndexError("id %d already used" % min(low - available))
+            self._id_list = [pid for pid in self._id_list if pid not in low]
+        pid_max = max(pids)
+        if pid_max >= self._id_max:
+            self._id_list.extend(sorted(set(xrange(self._id_max, pid_max))
+                                        - pids))
+            self._id_max = pid_max + 1
+
     def release_id(self, pid):
         """Mark the given id as available
 
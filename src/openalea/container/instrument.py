@@ -0,0 +1,280 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+#       Instrument : container package
+#
+#       Distributed under the Cecill-C License.
+#       See accompanying file LICENSE.txt or copy at
+#           http://www.cecill.info/licences/Licence_CeCILL-C_V1-en.html
+#
+"""This module provide an opt-in instrumentation layer for containers.
+
+Public methods of an instrumented object are replaced, on the instance
+only, by wrappers that count calls and measure their latency. Classes are
+never modified, hence objects that are not instrumented do not pay any
+cost.
+
+Methods returning iterators (e.g. `Graph.in_edges`) are timed up to the
+creation of the iterator, not its consumption.
+"""
+
+from math import frexp
+from timeit import default_timer
+
+from graph import Graph
+from id_array_dict import IdArrayDict
+from id_dict import IdDict
+from id_generator import IdMaxGenerator, IdSetGenerator, IdListGenerator
+
+_generator_types = (IdMaxGenerator, IdSetGenerator, IdListGenerator)
+
+_generator_methods = ("get_id", "get_ids", "new_ids", "release_id",
+                      "clear")
+
+
+class InstrumentationError(Exception):
+    """Exception raised when an object is instrumented twice
+    or released without having been instrumented.
+    """
+
+
+class Stats(object):
+    """Counters and latency histograms of instrumented methods.
+
+    Latencies are stored in logarithmic buckets, bucket i counts the calls
+    whose duration d satisfies 2**(i-1) <= d < 2**i microseconds.
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.total_time = {}
+        self.histograms = {}
+        self.free_ids = {}
+
+    def clear(self):
+        """Reset all counters.
+        """
+        self.calls.clear()
+        self.total_time.clear()
+        self.histograms.clear()
+        self.free_ids.clear()
+
+    def record(self, name, duration):
+        """Register a call to a method.
+
+        args:
+         - name (str): name of the method
+         - duration (float): duration of the call in seconds
+        """
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.total_time[name] = self.total_time.get(name, 0.) + duration
+        bucket = frexp(duration * 1e6)[1]
+        try:
+            hist = self.histograms[name]
+        except KeyError:
+            hist = self.histograms[name] = {}
+        hist[bucket] = hist.get(bucket, 0) + 1
+
+    def record_free_ids(self, name, size):
+        """Register the current size of the free list of an id generator.
+
+        args:
+         - name (str): name of the generator
+         - size (int): number of ids available for reuse
+        """
+        try:
+            max_size = max(self.free_ids[name][1], size)
+        except KeyError:
+            max_size = size
+        self.free_ids[name] = (size, max_size)
+
+    def nb_calls(self, name):
+        """Number of calls registered for a method.
+
+        args:
+         - name (str): name of the method
+
+        return:
+         - (int)
+        """
+        return self.calls.get(name, 0)
+
+    def mean_time(self, name):
+        """Mean duration of a call to a method.
+
+        args:
+         - name (str): name of the method
+
+        return:
+         - (float): duration in seconds, None if method never called
+        """
+        try:
+            return self.total_time[name] / self.calls[name]
+        except KeyError:
+            return None
+
+    def summary(self):
+        """Aggregated statistics, most time consuming methods first.
+
+        return:
+         - (list of (str, int, float, float)): name, number of calls,
+                                              total time, mean time
+        """
+        res = [(name, nb, self.total_time[name], self.total_time[name] / nb)
+               for name, nb in self.calls.items()]
+        res.sort(key=lambda tup: tup[2], reverse=True)
+        return res
+
+
+def _free_list_size(generator):
+    """Number of ids a generator keeps for reuse.
+    """
+    if isinstance(generator, IdSetGenerator):
+        return len(generator._available_ids)
+    if isinstance(generator, IdListGenerator):
+        return len(generator._id_list)
+    return 0
+
+
+def _wrap(method, key, stats, callback):
+    """Create a timing wrapper around a bound method.
+    """
+    record = stats.record
+
+    if callback is None:
+        def wrapper(*args, **kwds):
+            t0 = default_timer()
+            try:
+                return method(*args, **kwds)
+            finally:
+                record(key, default_timer() - t0)
+    else:
+        def wrapper(*args, **kwds):
+            t0 = default_timer()
+            try:
+                return method(*args, **kwds)
+            finally:
+                duration = default_timer() - t0
+                record(key, duration)
+                callback(key, duration)
+
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+def _wrap_generator(method, key, gen, stats, callback):
+    """Create a timing wrapper that also monitor the free list of gen.
+    """
+    timed = _wrap(method, key, stats, callback)
+    record_free_ids = stats.record_free_ids
+    gen_key = key.rsplit(".", 1)[0]
+
+    def wrapper(*args, **kwds):
+        try:
+            return timed(*args, **kwds)
+        finally:
+            record_free_ids(gen_key, _free_list_size(gen))
+
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+def _public_methods(obj):
+    """Names of public methods defined by the class of obj.
+    """
+    cls = type(obj)
+    return [name for name in dir(cls)
+            if not name.startswith("_") and callable(getattr(cls, name))]
+
+
+def _members(obj, name):
+    """Sub objects that are instrumented along with obj.
+    """
+    if isinstance(obj, Graph):
+        return [(obj._vertices, name + "._vertices"),
+                (obj._edges, name + "._edges")]
+    if isinstance(obj, (IdDict, IdArrayDict)):
+        return [(obj._id_generator, name + ".id_generator")]
+    return []
+
+
+def instrument(obj, stats=None, callback=None, name=None):
+    """Instrument all public methods of an object.
+
+    Graphs also instrument their vertex and edge dictionaries and
+    IdDicts their id generator.
+
+    args:
+     - obj (Graph|IdDict|IdArrayDict|IdGenerator): object to instrument
+     - stats (Stats): where to store measures, if None (default)
+                      create a new one
+     - callback (callable): function called with (name, duration)
+                            after each call, default None
+     - name (str): prefix used for the keys of measures, if None (default)
+                   use the name of the class of obj
+
+    return:
+     - (Stats)
+    """
+    if "_instrumented_methods" in obj.__dict__:
+        raise InstrumentationError("object already instrumented")
+
+    if stats is None:
+        stats = Stats()
+    if name is None:
+        name = type(obj).__name__
+
+    if isinstance(obj, _generator_types):
+        names = _generator_methods
+        for meth_name in names:
+            key = "%s.%s" % (name, meth_name)
+            setattr(obj, meth_name,
+                    _wrap_generator(getattr(obj, meth_name), key, obj,
+                                    stats, callback))
+        stats.record_free_ids(name, _free_list_size(obj))
+    else:
+        names = _public_methods(obj)
+        for meth_name in names:
+            key = "%s.%s" % (name, meth_name)
+            setattr(obj, meth_name,
+                    _wrap(getattr(obj, meth_name), key, stats, callback))
+
+    obj._instrumented_methods = tuple(names)
+
+    for member, member_name in _members(obj, name):
+        instrument(member, stats, callback, member_name)
+
+    return stats
+
+
+def uninstrument(obj):
+    """Restore the original methods of an instrumented object.
+
+    args:
+     - obj (Graph|IdDict|IdArrayDict|IdGenerator): object previously
+                                                     instrumented
+    """
+    try:
+        names = obj.__dict__.pop("_instrumented_methods")
+    except KeyError:
+        raise InstrumentationError("object not instrumented")
+
+    for meth_name in names:
+        delattr(obj, meth_name)
+
+    for member, member_name in _members(obj, ""):
+        uninstrument(member)
+
+
+def is_instrumented(obj):
+    """Test whether an object is currently instrumented.
+
+    args:
+     - obj (any): object to test
+
+    return:
+     - (bool)
+    """
+    return "_instrumented_methods" in getattr(obj, "__dict__", {})
@@ -0,0 +1,182 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+#       Multigraph : container package
+#
+#       Distributed under the Cecill-C License.
+#       See accompanying file LICENSE.txt or copy at
+#           http://www.cecill.info/licences/Licence_CeCILL-C_V1-en.html
+#
+"""This module provide tools to handle parallel edges, i.e. edges
+sharing the same source and the same target.
+
+Edges are grouped by (source, target) in a single pass over the edges
+of the graph.
+"""
+
+from collections import defaultdict
+
+from property_graph import InvalidProperty
+
+
+def _mean(values):
+    return sum(values) / float(len(values))
+
+
+edge_aggregations = {"sum": sum,
+                     "mean": _mean,
+                     "min": min,
+                     "max": max,
+                     "first": lambda values: values[0],
+                     "last": lambda values: values[-1],
+                     "count": len,
+                     "list": list}
+
+
+def parallel_edges(graph, directed=True):
+    """Group edges by pair of vertices.
+
+    args:
+     - graph (Graph)
+     - directed (bool): if False, edges (s, t) and (t, s) are parallel
+
+    return:
+     - (dict of ((vid, vid), list of eid)): edges connecting each pair
+                of vertices, by increasing eid. Undirected pairs are
+                stored with the smallest vid first
+    """
+    groups = defaultdict(list)
+    for eid, (sid, tid) in graph._edges.iteritems():
+        if not directed and tid < sid:
+            sid, tid = tid, sid
+        groups[(sid, tid)].append(eid)
+    for eids in groups.itervalues():
+        if len(eids) > 1:
+            eids.sort()
+    return dict(groups)
+
+
+def edge_multiplicity(graph, directed=True):
+    """Number of edges connecting each pair of connected vertices.
+
+    args:
+     - graph (Graph)
+     - directed (bool): if False, edges (s, t) and (t, s) are parallel
+
+    return:
+     - (dict of ((vid, vid), int))
+    """
+    counts = defaultdict(int)
+    for sid, tid in graph._edges.itervalues():
+        if not directed and tid < sid:
+            sid, tid = tid, sid
+        counts[(sid, tid)] += 1
+    return dict(counts)
+
+
+def multiplicity_histogram(graph, directed=True):
+    """Number of pairs of vertices connected by each number of edges.
+
+    args:
+     - graph (Graph)
+     - directed (bool): if False, edges (s, t) and (t, s) are parallel
+
+    return:
+     - (dict of (int, int)): histogram[k] is the number of pairs
+                             connected by exactly k edges
+    """
+    histogram = defaultdict(int)
+    for count in edge_multiplicity(graph, directed).itervalues():
+        histogram[count] += 1
+    return dict(histogram)
+
+
+def is_simple(graph, directed=True):
+    """Test whether no pair of vertices is connected by several edges.
+
+    args:
+     - graph (Graph)
+     - directed (bool): if False, edges (s, t) and (t, s) are parallel
+
+    return:
+     - (bool)
+    """
+    seen = set()
+    for sid, tid in graph._edges.itervalues():
+        if not directed and tid < sid:
+            sid, tid = tid, sid
+        if (sid, tid) in seen:
+            return False
+        seen.add((sid, tid))
+    return True
+
+
+def _aggregation(operation):
+    if callable(operation):
+        return operation
+    try:
+        return edge_aggregations[operation]
+    except KeyError:
+        msg = "the required aggregation (%s) is unknown" % operation
+        msg += "\navailable aggregations are %s" % str(
+            sorted(edge_aggregations.keys()))
+        raise UserWarning(msg)
+
+
+def collapse_parallel_edges(graph, aggregations=None, directed=True):
+    """Replace parallel edges by a single edge.
+
+    In each group of parallel edges, the edge with the smallest id is
+    kept and the others are removed. Values of the aggregated edge
+    properties of the kept edge are computed from the values of all the
+    edges of the group, ignoring edges with no value. Other properties
+    keep the value of the kept edge.
+
+    args:
+     - graph (Graph|PropertyGraph)
+     - aggregations (dict of (str, str|callable)): operation used for
+                each edge property, either one of `edge_aggregations` or a
+                function called with the list of values. Requires a graph
+                with properties (e.g. PropertyGraph). The 'count'
+                operation creates the property if needed and stores the
+                number of parallel edges of every edge, 1 if none
+     - directed (bool): if False, edges (s, t) and (t, s) are parallel,
+                        the kept edge keeps its orientation
+
+    return:
+     - (dict of (eid, eid)): kept edge for each removed edge
+    """
+    if aggregations is None:
+        aggregations = {}
+    if len(aggregations) > 0 and not hasattr(graph, "_edge_property"):
+        raise InvalidProperty("aggregations require a graph with "
+                              "edge properties")
+    funcs = dict((name, _aggregation(operation))
+                 for name, operation in aggregations.iteritems())
+    for name, operation in aggregations.iteritems():
+        if operation == "count" and name not in graph._edge_property:
+            graph.add_edge_property(name)
+    props = dict((name, graph.edge_property(name)) for name in funcs)
+
+    counts = [props[name] for name, operation in aggregations.iteritems()
+              if operation == "count"]
+
+    trans = {}
+    for eids in parallel_edges(graph, directed).itervalues():
+        kept = eids[0]
+        for prop in counts:
+            prop[kept] = len(eids)
+        if len(eids) == 1:
+            continue
+        for name, func in funcs.iteritems():
+            if aggregations[name] == "count":
+                continue
+            prop = props[name]
+            values = [prop[eid] for eid in eids if eid in prop]
+            if len(values) > 0:
+                prop[kept] = func(values)
+        for eid in eids[1:]:
+            graph.remove_edge(eid)
+            trans[eid] = kept
+
+    return trans
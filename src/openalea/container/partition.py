@@ -0,0 +1,305 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+#       Partition : container package
+#
+#       Distributed under the Cecill-C License.
+#       See accompanying file LICENSE.txt or copy at
+#           http://www.cecill.info/licences/Licence_CeCILL-C_V1-en.html
+#
+"""This module provide tools to split a graph into balanced parts with few
+edges between parts, for instance to distribute processing.
+
+    - partition: assign each vertex to a part
+    - extract_parts: create one sub graph per part, with ghost vertices
+    - merge_properties: copy back the properties computed on each part
+
+Edge directions are ignored while partitioning.
+"""
+
+from random import Random
+
+from reorder import bfs_order
+
+methods = ("bfs", "label_propagation", "multilevel")
+
+
+def _adjacency(graph):
+    """Undirected weighted adjacency of a graph.
+
+    return:
+     - (dict of (vid, int)): weight of each vertex (all 1)
+     - (dict of (vid, dict of (vid, int))): nb of edges between vertices
+    """
+    vweight = dict((vid, 1) for vid in graph.vertices())
+    adj = dict((vid, {}) for vid in vweight)
+    for eid in graph.edges():
+        sid, tid = graph.edge_vertices(eid)
+        if sid != tid:
+            adj[sid][tid] = adj[sid].get(tid, 0) + 1
+            adj[tid][sid] = adj[tid].get(sid, 0) + 1
+    return vweight, adj
+
+
+def _bfs_order(adj, vweight):
+    """Breadth first order of vertices, heaviest neighbors first.
+    """
+    visited = set()
+    res = []
+    for start in sorted(adj):
+        if start in visited:
+            continue
+        visited.add(start)
+        ind = len(res)
+        res.append(start)
+        while ind < len(res):
+            vid = res[ind]
+            ind += 1
+            nids = [nid for nid in adj[vid] if nid not in visited]
+            nids.sort(key=lambda nid: (-adj[vid][nid], nid))
+            visited.update(nids)
+            res.extend(nids)
+    return res
+
+
+def _split_order(order, vweight, nb_parts):
+    """Cut a list of vertices into nb_parts chunks of similar weight.
+    """
+    total = float(sum(vweight.values()))
+    parts = {}
+    acc = 0
+    for vid in order:
+        parts[vid] = min(nb_parts - 1, int(acc * nb_parts / total))
+        acc += vweight[vid]
+    return parts
+
+
+def _refine(adj, vweight, parts, nb_parts, imbalance, nb_iter, rnd):
+    """Move vertices to the part of their neighbors if it reduces the cut
+    and keeps the parts balanced.
+    """
+    capacity = (1. + imbalance) * sum(vweight.values()) / nb_parts
+    size = [0] * nb_parts
+    for vid, part in parts.iteritems():
+        size[part] += vweight[vid]
+
+    vids = sorted(adj)
+    for i in range(nb_iter):
+        rnd.shuffle(vids)
+        nb_moves = 0
+        for vid in vids:
+            cur = parts[vid]
+            links = {}
+            for nid, weight in adj[vid].iteritems():
+                links[parts[nid]] = links.get(parts[nid], 0) + weight
+            best = cur
+            best_links = links.get(cur, 0)
+            for part, nb_links in links.iteritems():
+                if (nb_links > best_links and
+                        size[part] + vweight[vid] <= capacity):
+                    best = part
+                    best_links = nb_links
+            if best != cur:
+                parts[vid] = best
+                size[cur] -= vweight[vid]
+                size[best] += vweight[vid]
+                nb_moves += 1
+        if nb_moves == 0:
+            break
+
+    return parts
+
+
+def _coarsen(adj, vweight, rnd):
+    """Merge pairs of vertices connected by heavy edges.
+
+    return:
+     - (dict, dict, dict of (vid, vid)): coarse adjacency, coarse vertex
+                                         weights and coarse vertex of each
+                                         fine vertex
+    """
+    match = {}
+    vids = sorted(adj)
+    rnd.shuffle(vids)
+    for vid in vids:
+        if vid in match:
+            continue
+        free = [(weight, nid) for nid, weight in adj[vid].iteritems()
+                if nid not in match]
+        if len(free) > 0:
+            nid = max(free)[1]
+            match[vid] = vid
+            match[nid] = vid
+        else:
+            match[vid] = vid
+
+    coarse_weight = {}
+    for vid, cid in match.iteritems():
+        coarse_weight[cid] = coarse_weight.get(cid, 0) + vweight[vid]
+
+    coarse_adj = dict((cid, {}) for cid in coarse_weight)
+    for vid, links in adj.iteritems():
+        cid = match[vid]
+        for nid, weight in links.iteritems():
+            ncid = match[nid]
+            if ncid != cid:
+                coarse_adj[cid][ncid] = coarse_adj[cid].get(ncid, 0) + weight
+
+    return coarse_adj, coarse_weight, match
+
+
+def _multilevel(adj, vweight, nb_parts, imbalance, nb_iter, rnd):
+    """Coarsen, partition the coarse graph then refine while projecting
+    back to the original graph.
+    """
+    levels = []
+    while len(adj) > 20 * nb_parts:
+        coarse_adj, coarse_weight, match = _coarsen(adj, vweight, rnd)
+        if len(coarse_adj) > 0.9 * len(adj):
+            break
+        levels.append((adj, vweight, match))
+        adj, vweight = coarse_adj, coarse_weight
+
+    parts = _split_order(_bfs_order(adj, vweight), vweight, nb_parts)
+    parts = _refine(adj, vweight, parts, nb_parts, imbalance, nb_iter, rnd)
+    for adj, vweight, match in reversed(levels):
+        parts = dict((vid, parts[cid]) for vid, cid in match.iteritems())
+        parts = _refine(adj, vweight, parts, nb_parts, imbalance, nb_iter,
+                        rnd)
+
+    return parts
+
+
+def partition(graph, nb_parts, method="bfs", imbalance=0.05, nb_iter=10,
+              seed=None):
+    """Assign each vertex of a graph to a part.
+
+    args:
+     - graph (Graph): graph to split
+     - nb_parts (int): number of parts
+     - method (str): one of
+            - 'bfs' (default): cut a breadth first ordering of the
+                               vertices in chunks of equal size
+            - 'label_propagation': refine 'bfs' by moving vertices toward
+                                   the part of most of their neighbors
+            - 'multilevel': coarsen the graph by merging heavily connected
+                            vertices, partition the coarsest graph and
+                            refine while uncoarsening
+     - imbalance (float): tolerated excess of vertices in a part compared
+                          to a perfect balance, default 5%
+     - nb_iter (int): maximum number of refinement passes, default 10
+     - seed (int): seed of the random generator used by refinement
+
+    return:
+     - (dict of (vid, int)): part of each vertex
+    """
+    if nb_parts < 1:
+        raise ValueError("nb of parts must be positive")
+    if graph.nb_vertices() == 0:
+        return {}
+
+    rnd = Random(seed)
+    if method == "bfs":
+        order = bfs_order(graph)
+        return _split_order(order, dict((vid, 1) for vid in order),
+                            nb_parts)
+
+    vweight, adj = _adjacency(graph)
+    if method == "label_propagation":
+        parts = _split_order(_bfs_order(adj, vweight), vweight, nb_parts)
+        return _refine(adj, vweight, parts, nb_parts, imbalance, nb_iter,
+                       rnd)
+    if method == "multilevel":
+        return _multilevel(adj, vweight, nb_parts, imbalance, nb_iter, rnd)
+
+    msg = "the required partition method (%s) is unknown" % method
+    msg += "\navailable methods are %s" % str(methods)
+    raise UserWarning(msg)
+
+
+def edge_cut(graph, parts):
+    """Number of edges whose ends belong to different parts.
+
+    args:
+     - graph (Graph)
+     - parts (dict of (vid, int)): part of each vertex
+
+    return:
+     - (int)
+    """
+    return sum(1 for eid in graph.edges()
+               if parts[graph.source(eid)] != parts[graph.target(eid)])
+
+
+def extract_parts(graph, parts, halo=1):
+    """Create a sub graph for each part.
+
+    Each sub graph contains the vertices of its part and the ghost
+    vertices, from other parts, that are at most halo edges away (whatever
+    their direction). Vertex and edge ids are the ones of graph and
+    properties of PropertyGraph are copied (see `Graph.sub_graph`).
+
+    args:
+     - graph (Graph): graph to split
+     - parts (dict of (vid, int)): part of each vertex
+     - halo (int): depth of ghost layer, default 1
+
+    return:
+     - (list of (Graph, set of vid)): for each part, the sub graph and
+                                      the set of its ghost vertices
+    """
+    nb_parts = max(parts.itervalues()) + 1 if len(parts) > 0 else 0
+    owned = [set() for i in range(nb_parts)]
+    for vid, part in parts.iteritems():
+        owned[part].add(vid)
+
+    res = []
+    for vids in owned:
+        ghosts = set()
+        front = vids
+        for i in range(halo):
+            next_front = set()
+            for vid in front:
+                for nid in graph.neighbors(vid):
+                    if nid not in vids and nid not in ghosts:
+                        ghosts.add(nid)
+                        next_front.add(nid)
+            front = next_front
+        res.append((graph.sub_graph(vids | ghosts), ghosts))
+
+    return res
+
+
+def merge_properties(graph, sub_graphs, vertex_properties=(),
+                     edge_properties=()):
+    """Copy properties computed on each part back into graph.
+
+    Only values of vertices owned by a part are copied, values on ghost
+    vertices are ignored. Edge values are copied from the part owning
+    the source of the edge.
+
+    args:
+     - graph (PropertyGraph): the graph that was split
+     - sub_graphs (list of (PropertyGraph, set of vid)): as returned by
+                                                         extract_parts
+     - vertex_properties (list of str): names of vertex properties to copy
+     - edge_properties (list of str): names of edge properties to copy
+    """
+    for name in vertex_properties:
+        if name not in graph.vertex_property_names():
+            graph.add_vertex_property(name)
+    for name in edge_properties:
+        if name not in graph.edge_property_names():
+            graph.add_edge_property(name)
+
+    for sub_graph, ghosts in sub_graphs:
+        for name in vertex_properties:
+            graph.vertex_property(name).update(
+                (vid, val)
+                for vid, val in sub_graph.vertex_property(name).iteritems()
+                if vid not in ghosts)
+        for name in edge_properties:
+            graph.edge_property(name).update(
+                (eid, val)
+                for eid, val in sub_graph.edge_property(name).iteritems()
+                if sub_graph.source(eid) not in ghosts)
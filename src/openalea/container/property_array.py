@@ -0,0 +1,168 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+#       PropertyArray : container package
+#
+#       Distributed under the Cecill-C License.
+#       See accompanying file LICENSE.txt or copy at
+#           http://www.cecill.info/licences/Licence_CeCILL-C_V1-en.html
+#
+"""This module provide array based access and reductions on the
+properties of a PropertyGraph.
+
+This module requires NumPy. Reductions use array operations when values
+of the property are numeric and fall back to python otherwise.
+"""
+
+from operator import add
+
+import numpy as np
+
+_no_value = object()
+
+
+def values_array(prop, ids, default=_no_value, dtype=None):
+    """Values of a property for a list of elements.
+
+    args:
+     - prop (dict of (int, any)): property
+     - ids (iter of int): element ids
+     - default (any): value used for elements with no value. If not
+                      provided, raise KeyError for such elements
+     - dtype (np.dtype): type of array, if None (default) guessed by numpy
+
+    return:
+     - (np.array)
+    """
+    if default is _no_value:
+        getter = prop.__getitem__
+    else:
+        def getter(key):
+            return prop.get(key, default)
+
+    if dtype is not None and np.dtype(dtype).kind in "biuf":
+        ids = list(ids)
+        return np.fromiter((getter(key) for key in ids), dtype, len(ids))
+
+    return np.array([getter(key) for key in ids], dtype=dtype)
+
+
+def set_values(prop, ids, values):
+    """Store values for a list of elements.
+
+    args:
+     - prop (dict of (int, any)): property
+     - ids (iter of int): element ids
+     - values (iter of any): values in the same order as ids
+    """
+    ids = list(ids)
+    if isinstance(values, np.ndarray):
+        values = values.tolist()
+    else:
+        values = list(values)
+    if len(ids) != len(values):
+        raise ValueError("nb of ids (%d) and nb of values (%d) differ"
+                         % (len(ids), len(values)))
+    prop.update(zip(ids, values))
+
+
+def _is_numeric(arr):
+    return arr.dtype.kind in "biuf"
+
+
+def reduce_values(values, operation):
+    """Reduce a list of values.
+
+    args:
+     - values (iter of any): values to reduce
+     - operation (str): one of 'sum', 'mean', 'min', 'max'
+
+    return:
+     - (any): None for 'mean', 'min' and 'max' of no values
+    """
+    if operation not in ("sum", "mean", "min", "max"):
+        raise UserWarning("unknown reduction (%s)" % operation)
+
+    values = list(values)
+    if len(values) == 0:
+        return 0 if operation == "sum" else None
+
+    arr = np.asarray(values)
+    if arr.ndim != 1 or not _is_numeric(arr):
+        if operation == "sum":
+            return reduce(add, values)
+        if operation == "min":
+            return min(values)
+        if operation == "max":
+            return max(values)
+        raise TypeError("mean requires numeric values")
+
+    return getattr(arr, operation)().item()
+
+
+def neighbor_reduce(vids, sources, targets, values, operation, fill):
+    """Reduce the values of the targets of the edges leaving each vertex.
+
+    args:
+     - vids (np.array of int): sorted ids of all vertices
+     - sources (np.array of int): source of each edge
+     - targets (np.array of int): target of each edge
+     - values (np.array): value of each vertex, in the order of vids
+     - operation (str): one of 'sum', 'mean', 'min', 'max'
+     - fill (any): result for vertices with no edge
+
+    return:
+     - (np.array): result for each vertex, in the order of vids
+    """
+    nb = len(vids)
+    src_pos = np.searchsorted(vids, sources)
+    contrib = values[np.searchsorted(vids, targets)]
+    counts = np.bincount(src_pos, minlength=nb)
+    has_edge = counts > 0
+
+    if operation in ("sum", "mean"):
+        if values.dtype.kind == "f":
+            res = np.bincount(src_pos, weights=contrib, minlength=nb)
+            if operation == "sum":
+                res = res.astype(values.dtype)
+        elif _is_numeric(values):
+            # exact sums of integers and counts of booleans, bincount
+            # would accumulate in float64
+            acc = np.uint64 if values.dtype.kind == "u" else np.int64
+            res = np.zeros(nb, dtype=acc)
+            np.add.at(res, src_pos, contrib.astype(acc))
+        else:
+            res = np.empty(nb, dtype=object)
+            res[:] = [None] * nb
+            for pos, val in zip(src_pos.tolist(), contrib.tolist()):
+                res[pos] = val if res[pos] is None else res[pos] + val
+        if operation == "mean":
+            res = res.astype(float)
+            res[has_edge] /= counts[has_edge]
+    elif operation in ("min", "max"):
+        if _is_numeric(values):
+            res = np.empty(nb, dtype=contrib.dtype)
+            ufunc = np.minimum if operation == "min" else np.maximum
+            # initialise each vertex with the contribution of one of its edges
+            first = np.zeros(nb, dtype=int)
+            first[src_pos] = np.arange(len(src_pos))
+            res[has_edge] = contrib[first[has_edge]]
+            ufunc.at(res, src_pos, contrib)
+        else:
+            res = np.empty(nb, dtype=object)
+            res[:] = [None] * nb
+            better = min if operation == "min" else max
+            for pos, val in zip(src_pos.tolist(), contrib.tolist()):
+                res[pos] = val if res[pos] is None else better(res[pos], val)
+    else:
+        raise UserWarning("unknown reduction (%s)" % operation)
+
+    if not has_edge.all():
+        if fill is None or not _is_numeric(res):
+            res = res.astype(object)
+        else:
+            res = res.astype(np.result_type(res.dtype,
+                                            np.asarray(fill).dtype))
+        res[~has_edge] = fill
+
+    return res
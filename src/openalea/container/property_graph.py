@@ -20,6 +20,13 @@ graph elements.
 """
 
 from graph import Graph, InvalidVertex, InvalidEdge
+from property_map import PropertyMap, DefaultPropertyMap, ComputedProperty
+from property_index import HashIndex, SortedIndex
+
+IndexKind = {"hash": HashIndex,
+             "sorted": SortedIndex}
+
+_no_default = object()
 
 
 class InvalidProperty(Exception):
@@ -37,6 +44,8 @@ class PropertyGraph(Graph):
         self._vertex_property = {}
         self._edge_property = {}
         self._graph_property = {}
+        self._vertex_index = {}
+        self._edge_index = {}
         Graph.__init__(self, graph, **kwds)
 
     def vertex_property_names(self):
@@ -136,20 +145,74 @@ class PropertyGraph(Graph):
     #        mutable property concept
     #
     ###########################################################
-    def add_vertex_property(self, property_name, values=None):
+    def add_vertex_property(self, property_name, values=None,
+                            default=_no_default):
         """Add a new map between vid and a data.
 
         args:
          - property_name (str): name identifier for this property
          - values (dict of (vid, any)): pre set values for some vertices.
                         If None (default), property will be emtpy.
+                        Stored by reference, unless a default is
+                        provided. Use a PropertyMap to let snapshots,
+                        indexes and computed properties follow its
+                        modifications.
+         - default (any): if provided, value returned for vertices
+                          with no stored value. This value is not stored
+                          for each vertex.
+        """
+        if property_name in self._vertex_property:
+            raise InvalidProperty("property %s is already defined on vertices"
+                                  % property_name)
+        if default is not _no_default:
+            prop = DefaultPropertyMap(self._vertices, default)
+            if values is not None:
+                prop.update(values)
+        elif values is None:
+            prop = PropertyMap()
+        else:
+            prop = values
+        self._vertex_property[property_name] = prop
+        for observer in self._observers:
+            observer.property_added("vertex", property_name)
+
+    def add_computed_vertex_property(self, property_name, func,
+                                     vertex_inputs=(), edge_inputs=()):
+        """Add a read only property whose values are computed on demand.
+
+        Values are memoized until the topology of the graph or one of the
+        input properties changes.
+
+        args:
+         - property_name (str): name identifier for this property
+         - func (callable): function called with (graph, vid)
+                            to compute the value of a vertex
+         - vertex_inputs (list of str): names of vertex properties
+                                        used by func
+         - edge_inputs (list of str): names of edge properties used by func
         """
         if property_name in self._vertex_property:
             raise InvalidProperty("property %s is already defined on vertices"
                                   % property_name)
-        if values is None:
-            values = {}
-        self._vertex_property[property_name] = values
+        inputs = self._property_inputs(vertex_inputs, edge_inputs)
+        self._vertex_property[property_name] = ComputedProperty(
+            self, self._vertices, func, inputs)
+        for observer in self._observers:
+            observer.property_added("vertex", property_name)
+
+    def _property_inputs(self, vertex_inputs, edge_inputs):
+        """Retrieve the maps of properties used by a computed property.
+        """
+        inputs = [(name, self.vertex_property(name))
+                  for name in vertex_inputs]
+        inputs.extend((name, self.edge_property(name))
+                      for name in edge_inputs)
+        for name, prop in inputs:
+            if not isinstance(prop, (PropertyMap, ComputedProperty)):
+                raise InvalidProperty("property %s is not a PropertyMap, "
+                                      "its modifications can not be tracked"
+                                      % name)
+        return [prop for name, prop in inputs]
 
     def remove_vertex_property(self, property_name):
         """Remove a given property.
@@ -158,25 +221,70 @@ class PropertyGraph(Graph):
          - property_name (str): name identifier for this property
         """
         try:
-            del self._vertex_property[property_name]
+            prop = self._vertex_property.pop(property_name)
         except KeyError:
             raise InvalidProperty("property %s is undefined on vertices"
                                   % property_name)
-
-    def add_edge_property(self, property_name, values=None):
+        index = self._vertex_index.pop(property_name, None)
+        if index is not None:
+            index.detach()
+        for observer in self._observers:
+            observer.property_removed("vertex", property_name, prop)
+
+    def add_edge_property(self, property_name, values=None,
+                          default=_no_default):
         """Add a new map between eid and a data.
 
         args:
          - property_name (str): name identifier for this property
          - values (dict of (eid, any)): pre set values for some edge.
                         If None (default), property will be emtpy.
+                        Stored by reference, unless a default is
+                        provided. Use a PropertyMap to let snapshots,
+                        indexes and computed properties follow its
+                        modifications.
+         - default (any): if provided, value returned for edges
+                          with no stored value. This value is not stored
+                          for each edge.
+        """
+        if property_name in self._edge_property:
+            raise InvalidProperty("property %s is already defined on edges"
+                                  % property_name)
+        if default is not _no_default:
+            prop = DefaultPropertyMap(self._edges, default)
+            if values is not None:
+                prop.update(values)
+        elif values is None:
+            prop = PropertyMap()
+        else:
+            prop = values
+        self._edge_property[property_name] = prop
+        for observer in self._observers:
+            observer.property_added("edge", property_name)
+
+    def add_computed_edge_property(self, property_name, func,
+                                   vertex_inputs=(), edge_inputs=()):
+        """Add a read only property whose values are computed on demand.
+
+        Values are memoized until the topology of the graph or one of the
+        input properties changes.
+
+        args:
+         - property_name (str): name identifier for this property
+         - func (callable): function called with (graph, eid)
+                            to compute the value of an edge
+         - vertex_inputs (list of str): names of vertex properties
+                                        used by func
+         - edge_inputs (list of str): names of edge properties used by func
         """
         if property_name in self._edge_property:
             raise InvalidProperty("property %s is already defined on edges"
                                   % property_name)
-        if values is None:
-            values = {}
-        self._edge_property[property_name] = values
+        inputs = self._property_inputs(vertex_inputs, edge_inputs)
+        self._edge_property[property_name] = ComputedProperty(
+            self, self._edges, func, inputs)
+        for observer in self._observers:
+            observer.property_added("edge", property_name)
 
     def remove_edge_property(self, property_name):
         """Remove a given property.
@@ -185,10 +293,15 @@ class PropertyGraph(Graph):
          - property_name (str): name identifier for this property
         """
         try:
-            del self._edge_property[property_name]
+            prop = self._edge_property.pop(property_name)
         except KeyError:
             raise InvalidProperty("property %s is undefined on edges"
                                   % property_name)
+        index = self._edge_index.pop(property_name, None)
+        if index is not None:
+            index.detach()
+        for observer in self._observers:
+            observer.property_removed("edge", property_name, prop)
 
     def add_graph_property(self, property_name, value=None):
         """Add a new property to the graph.
@@ -202,6 +315,8 @@ class PropertyGraph(Graph):
                                   % property_name)
 
         self._graph_property[property_name] = value
+        for observer in self._observers:
+            observer.property_added("graph", property_name)
 
     def remove_graph_property(self, property_name):
         """Remove a given property.
@@ -210,10 +325,423 @@ class PropertyGraph(Graph):
          - property_name (str): name identifier for this property
         """
         try:
-            del self._graph_property[property_name]
+            value = self._graph_property.pop(property_name)
         except KeyError:
             raise InvalidProperty("property %s is undefined on graph"
                                   % property_name)
+        for observer in self._observers:
+            observer.property_removed("graph", property_name, value)
+
+    ###########################################################
+    #
+    #        property array concept (requires numpy)
+    #
+    ###########################################################
+    @staticmethod
+    def _get_values(prop, ids, default, dtype):
+        from property_array import values_array
+
+        if default is _no_default:
+            return values_array(prop, ids, dtype=dtype)
+        return values_array(prop, ids, default, dtype)
+
+    def get_vertex_values(self, property_name, vids=None,
+                          default=_no_default, dtype=None):
+        """Values of a vertex property for a list of vertices.
+
+        args:
+         - property_name (str): name identifier of the property
+         - vids (iter of vid): vertices to consider, if None (default)
+                               all vertices by increasing vid
+         - default (any): value used for vertices with no value. If not
+                          provided, raise KeyError for such vertices
+         - dtype (np.dtype): type of array, if None (default)
+                             guessed by numpy
+
+        return:
+         - (np.array)
+        """
+        if vids is None:
+            vids = sorted(self._vertices)
+        return self._get_values(self.vertex_property(property_name), vids,
+                                default, dtype)
+
+    def set_vertex_values(self, property_name, vids, values):
+        """Store values of a vertex property for a list of vertices.
+
+        args:
+         - property_name (str): name identifier of the property
+         - vids (iter of vid): vertices to modify
+         - values (iter of any): values in the same order as vids
+        """
+        from property_array import set_values
+
+        set_values(self.vertex_property(property_name), vids, values)
+
+    def get_edge_values(self, property_name, eids=None,
+                        default=_no_default, dtype=None):
+        """Values of an edge property for a list of edges.
+
+        args:
+         - property_name (str): name identifier of the property
+         - eids (iter of eid): edges to consider, if None (default)
+                               all edges by increasing eid
+         - default (any): value used for edges with no value. If not
+                          provided, raise KeyError for such edges
+         - dtype (np.dtype): type of array, if None (default)
+                             guessed by numpy
+
+        return:
+         - (np.array)
+        """
+        if eids is None:
+            eids = sorted(self._edges)
+        return self._get_values(self.edge_property(property_name), eids,
+                                default, dtype)
+
+    def set_edge_values(self, property_name, eids, values):
+        """Store values of an edge property for a list of edges.
+
+        args:
+         - property_name (str): name identifier of the property
+         - eids (iter of eid): edges to modify
+         - values (iter of any): values in the same order as eids
+        """
+        from property_array import set_values
+
+        set_values(self.edge_property(property_name), eids, values)
+
+    def reduce_vertex_property(self, property_name, operation="sum"):
+        """Reduce all stored values of a vertex property.
+
+        args:
+         - property_name (str): name identifier of the property
+         - operation (str): one of 'sum' (default), 'mean', 'min', 'max'
+
+        return:
+         - (any)
+        """
+        from property_array import reduce_values
+
+        return reduce_values(self.vertex_property(property_name).values(),
+                             operation)
+
+    def reduce_edge_property(self, property_name, operation="sum"):
+        """Reduce all stored values of an edge property.
+
+        args:
+         - property_name (str): name identifier of the property
+         - operation (str): one of 'sum' (default), 'mean', 'min', 'max'
+
+        return:
+         - (any)
+        """
+        from property_array import reduce_values
+
+        return reduce_values(self.edge_property(property_name).values(),
+                             operation)
+
+    def reduce_neighbors(self, property_name, operation="sum",
+                         direction="out", default=_no_default, fill=None):
+        """Reduce, for each vertex, a vertex property over its neighbors.
+
+        Neighbors are the other ends of the edges attached to the vertex,
+        a neighbor connected by several edges contribute several times.
+
+        args:
+         - property_name (str): name identifier of the vertex property
+         - operation (str): one of 'sum' (default), 'mean', 'min', 'max'
+         - direction (str): 'out' (default) to reduce over targets of
+                            out edges, 'in' over sources of in edges
+         - default (any): value used for vertices with no value. If not
+                          provided, raise KeyError for such vertices
+         - fill (any): result for vertices with no neighbor, default None
+
+        return:
+         - (np.array of vid, np.array): vertices by increasing vid and
+                                        reduced value for each vertex
+        """
+        import numpy as np
+        from property_array import neighbor_reduce
+
+        vids = np.array(sorted(self._vertices), dtype=int)
+        values = self.get_vertex_values(property_name, vids.tolist(),
+                                        default)
+        nb = len(self._edges)
+        sources = np.fromiter((sid for sid, tid in self._edges.itervalues()),
+                              int, nb)
+        targets = np.fromiter((tid for sid, tid in self._edges.itervalues()),
+                              int, nb)
+        if direction == "in":
+            sources, targets = targets, sources
+        elif direction != "out":
+            raise UserWarning("unknown direction (%s)" % direction)
+
+        return vids, neighbor_reduce(vids, sources, targets, values,
+                                     operation, fill)
+
+    ###########################################################
+    #
+    #        array construction concept (requires numpy)
+    #
+    ###########################################################
+    @classmethod
+    def from_arrays(cls, sources, targets, vids=None, eids=None,
+                    vertex_props=None, edge_props=None, **kwds):
+        """Create a graph from arrays of edge sources and targets.
+
+        args:
+         - sources (array of int): source of each edge
+         - targets (array of int): target of each edge
+         - vids (array of int): ids of all vertices, including isolated
+                                ones. If None (default), the vertices
+                                referenced by edges by increasing id.
+         - eids (array of int): id of each edge. If None (default), the
+                                k-th edge has eid k.
+         - vertex_props (dict of (str, array)): values of vertex
+                        properties, in the order of vids
+         - edge_props (dict of (str, array)): values of edge properties,
+                      in the order of sources and targets
+         - kwds: extra arguments passed to the constructor of the graph
+
+        return:
+         - (PropertyGraph)
+        """
+        import numpy as np
+        from property_array import set_values
+
+        graph = super(PropertyGraph, cls).from_arrays(sources, targets,
+                                                      vids, eids, **kwds)
+        if vertex_props:
+            if vids is None:
+                vids = sorted(graph.vertices())
+            else:
+                vids = np.asarray(vids).tolist()
+            for name, values in vertex_props.iteritems():
+                graph.add_vertex_property(name)
+                set_values(graph.vertex_property(name), vids, values)
+        if edge_props:
+            if eids is None:
+                eids = range(graph.nb_edges())
+            else:
+                eids = np.asarray(eids).tolist()
+            for name, values in edge_props.iteritems():
+                graph.add_edge_property(name)
+                set_values(graph.edge_property(name), eids, values)
+
+        return graph
+
+    ###########################################################
+    #
+    #        sparse matrix concept (requires scipy)
+    #
+    ###########################################################
+    def to_sparse(self, weight=None, vertex_order=None, fmt="csr"):
+        """Adjacency matrix of the graph.
+
+        Entry (i, j) is the sum of the weights of the edges from
+        vertex_order[i] to vertex_order[j].
+
+        args:
+         - weight (str|dict of (eid, float)): name of the edge property
+                  or map storing the weight of each edge. If None
+                  (default), each edge weights 1
+         - vertex_order (list of vid): vertex associated to each row and
+                             column. If None (default), all vertices by
+                             increasing vid. Edges between vertices not in
+                             this list are ignored.
+         - fmt (str): sparse format, 'coo', 'csr' (default) or 'csc'
+
+        return:
+         - (scipy.sparse matrix): adjacency matrix
+         - (dict of (vid, int)): row of each vertex in matrix
+        """
+        if isinstance(weight, basestring):
+            weight = self.edge_property(weight)
+        return Graph.to_sparse(self, weight, vertex_order, fmt)
+
+    @classmethod
+    def from_sparse(cls, matrix, weight=None, **kwds):
+        """Create a graph from an adjacency matrix.
+
+        Vertex ids are row indices. One edge is created for each non zero
+        entry of the matrix, the k-th entry in row major order having
+        eid k.
+
+        args:
+         - matrix (scipy.sparse matrix|np.array): square matrix
+         - weight (str): name of the edge property that will store the
+                         values of the entries. If None (default), values
+                         are not stored.
+         - kwds: extra arguments passed to the constructor of the graph
+
+        return:
+         - (PropertyGraph)
+        """
+        graph, data = cls._from_sparse(matrix, kwds)
+        if weight is not None:
+            graph.add_edge_property(weight,
+                                    PropertyMap(enumerate(data.tolist())))
+        return graph
+
+    ###########################################################
+    #
+    #        property index concept
+    #
+    ###########################################################
+    @staticmethod
+    def _create_index(prop, indexes, property_name, kind):
+        """Create an index of given kind on prop and store it in indexes.
+        """
+        if not isinstance(prop, PropertyMap):
+            raise InvalidProperty("property %s is not a PropertyMap and "
+                                  "can not be indexed" % property_name)
+        try:
+            index_type = IndexKind[kind]
+        except KeyError:
+            msg = "the required index kind (%s) is unknown" % kind
+            msg += "\navailable kinds are %s" % str(IndexKind.keys())
+            raise UserWarning(msg)
+
+        old_index = indexes.pop(property_name, None)
+        if old_index is not None:
+            old_index.detach()
+        indexes[property_name] = index_type(prop)
+
+    @staticmethod
+    def _find(prop, index, value):
+        """Find elements of prop equal to value using index if available.
+        """
+        if index is not None:
+            return index.find(value)
+        return set(key for key, val in prop.iteritems() if val == value)
+
+    @staticmethod
+    def _find_in_range(prop, index, low, high):
+        """Find elements of prop in range using index if available.
+        """
+        if isinstance(index, SortedIndex):
+            return index.find_range(low, high)
+        items = sorted((val, key) for key, val in prop.iteritems()
+                       if (low is None or low <= val) and
+                       (high is None or val <= high))
+        return [key for val, key in items]
+
+    def create_vertex_index(self, property_name, kind="hash"):
+        """Index the values of a vertex property.
+
+        The index is kept up to date with the modifications of the
+        property. Only stored values are indexed, default values are not.
+
+        args:
+         - property_name (str): name identifier of the property
+         - kind (str): 'hash' (default) to find equal values,
+                       'sorted' to also find values in a range
+        """
+        self._create_index(self.vertex_property(property_name),
+                           self._vertex_index, property_name, kind)
+
+    def drop_vertex_index(self, property_name):
+        """Remove the index associated to a vertex property.
+
+        args:
+         - property_name (str): name identifier of the property
+        """
+        try:
+            self._vertex_index.pop(property_name).detach()
+        except KeyError:
+            raise InvalidProperty("property %s is not indexed on vertices"
+                                  % property_name)
+
+    def find_vertices(self, property_name, value):
+        """Find all vertices whose property is equal to value.
+
+        Use an index if one has been created on this property.
+
+        args:
+         - property_name (str): name identifier of the property
+         - value (any): value to look for
+
+        return:
+         - (set of vid)
+        """
+        return self._find(self.vertex_property(property_name),
+                          self._vertex_index.get(property_name), value)
+
+    def find_vertices_in_range(self, property_name, low=None, high=None):
+        """Find all vertices whose property is between low and high.
+
+        Use a sorted index if one has been created on this property.
+
+        args:
+         - property_name (str): name identifier of the property
+         - low (any): lower bound, included. If None (default) not bounded
+         - high (any): upper bound, included. If None (default) not bounded
+
+        return:
+         - (list of vid): sorted by increasing value of property
+        """
+        return self._find_in_range(self.vertex_property(property_name),
+                                   self._vertex_index.get(property_name),
+                                   low, high)
+
+    def create_edge_index(self, property_name, kind="hash"):
+        """Index the values of an edge property.
+
+        The index is kept up to date with the modifications of the
+        property. Only stored values are indexed, default values are not.
+
+        args:
+         - property_name (str): name identifier of the property
+         - kind (str): 'hash' (default) to find equal values,
+                       'sorted' to also find values in a range
+        """
+        self._create_index(self.edge_property(property_name),
+                           self._edge_index, property_name, kind)
+
+    def drop_edge_index(self, property_name):
+        """Remove the index associated to an edge property.
+
+        args:
+         - property_name (str): name identifier of the property
+        """
+        try:
+            self._edge_index.pop(property_name).detach()
+        except KeyError:
+            raise InvalidProperty("property %s is not indexed on edges"
+                                  % property_name)
+
+    def find_edges(self, property_name, value):
+        """Find all edges whose property is equal to value.
+
+        Use an index if one has been created on this property.
+
+        args:
+         - property_name (str): name identifier of the property
+         - value (any): value to look for
+
+        return:
+         - (set of eid)
+        """
+        return self._find(self.edge_property(property_name),
+                          self._edge_index.get(property_name), value)
+
+    def find_edges_in_range(self, property_name, low=None, high=None):
+        """Find all edges whose property is between low and high.
+
+        Use a sorted index if one has been created on this property.
+
+        args:
+         - property_name (str): name identifier of the property
+         - low (any): lower bound, included. If None (default) not bounded
+         - high (any): upper bound, included. If None (default) not bounded
+
+        return:
+         - (list of eid): sorted by increasing value of property
+        """
+        return self._find_in_range(self.edge_property(property_name),
+                                   self._edge_index.get(property_name),
+                                   low, high)
 
     ###########################################################
     #
@@ -251,6 +779,58 @@ class PropertyGraph(Graph):
 
     # clear_edges.__doc__ = Graph.clear_edges.__doc__
 
+    @staticmethod
+    def _translate_property(prop, trans):
+        """Replace the keys of a property according to trans.
+        """
+        if isinstance(prop, ComputedProperty):
+            prop.clear()
+        else:
+            items = [(trans[key], val) for key, val in prop.iteritems()
+                     if key in trans]
+            prop.clear()
+            prop.update(items)
+
+    def _renumbered(self, trans_vid, trans_eid):
+        # properties are translated before observers receive reset
+        for prop in self._vertex_property.itervalues():
+            self._translate_property(prop, trans_vid)
+        for prop in self._edge_property.itervalues():
+            self._translate_property(prop, trans_eid)
+
+    def sub_graph(self, vids):
+        """Create a graph restricted to a set of vertices.
+
+        Vertices and edges keep their ids, only edges whose source and
+        target both belong to vids are kept. Properties, except computed
+        ones, are copied for the remaining elements.
+
+        args:
+         - vids (iter of vid): vertices to keep
+
+        return:
+         - (PropertyGraph): a new graph of the same type as self
+        """
+        graph = Graph.sub_graph(self, vids)
+        for name, prop in self._vertex_property.iteritems():
+            if not isinstance(prop, ComputedProperty):
+                graph.add_vertex_property(
+                    name, PropertyMap((vid, val)
+                                      for vid, val in prop.iteritems()
+                                      if graph.has_vertex(vid)),
+                    getattr(prop, "default", _no_default))
+        for name, prop in self._edge_property.iteritems():
+            if not isinstance(prop, ComputedProperty):
+                graph.add_edge_property(
+                    name, PropertyMap((eid, val)
+                                      for eid, val in prop.iteritems()
+                                      if graph.has_edge(eid)),
+                    getattr(prop, "default", _no_default))
+        for name, val in self._graph_property.iteritems():
+            graph.add_graph_property(name, val)
+
+        return graph
+
     def extend(self, graph):
         # add and translate the vertex and edge ids of the second graph
         trans_vid, trans_eid = Graph.extend(self, graph)
@@ -259,18 +839,24 @@ class PropertyGraph(Graph):
             # update graph properties
             for name, prop in graph.vertex_properties():
                 if name not in self.vertex_property_names():
-                    self.add_vertex_property(name)
+                    self.add_vertex_property(
+                        name, default=getattr(prop, "default", _no_default))
 
                 self_prop = self.vertex_property(name)
+                if isinstance(self_prop, ComputedProperty):
+                    continue
                 for vid, data in prop.items():
                     self_prop[trans_vid[vid]] = data
 
             # update edge properties
             for name, prop in graph.edge_properties():
                 if name not in self.edge_property_names():
-                    self.add_edge_property(name)
+                    self.add_edge_property(
+                        name, default=getattr(prop, "default", _no_default))
 
                 self_prop = self.edge_property(name)
+                if isinstance(self_prop, ComputedProperty):
+                    continue
                 for eid, data in prop.items():
                     self_prop[trans_eid[eid]] = data
 
@@ -0,0 +1,146 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+#       PropertyIndex : container package
+#
+#       Distributed under the Cecill-C License.
+#       See accompanying file LICENSE.txt or copy at
+#           http://www.cecill.info/licences/Licence_CeCILL-C_V1-en.html
+#
+"""This module provide secondary indexes on the values of a property.
+
+An index observes a PropertyMap and is kept up to date with each
+modification of the map. Only stored values are indexed, elements
+relying on the default value of a DefaultPropertyMap are not.
+
+    - HashIndex: find elements with a given value, values
+                 must be hashable
+    - SortedIndex: find elements with a given value or with a value
+                   in a range, values must be comparable
+"""
+
+from bisect import bisect_left, bisect_right
+
+from property_map import missing
+
+
+class HashIndex(object):
+    """Map each value of a property to the set of elements holding it.
+    """
+
+    def __init__(self, prop):
+        """Constructor, register the index as an observer of prop.
+
+        args:
+         - prop (PropertyMap): the property to index
+        """
+        self._prop = prop
+        self._keys = {}
+        for key, val in prop.iteritems():
+            self._add(key, val)
+        prop.add_observer(self)
+
+    def detach(self):
+        """Stop following the modifications of the property.
+        """
+        self._prop.remove_observer(self)
+
+    def _add(self, key, val):
+        try:
+            self._keys[val].add(key)
+        except KeyError:
+            self._keys[val] = set([key])
+
+    def _remove(self, key, val):
+        keys = self._keys[val]
+        keys.discard(key)
+        if len(keys) == 0:
+            del self._keys[val]
+
+    def value_set(self, key, old, new):
+        if old is not missing:
+            self._remove(key, old)
+        self._add(key, new)
+
+    def value_removed(self, key, old):
+        self._remove(key, old)
+
+    def cleared(self, old):
+        self._keys.clear()
+
+    def find(self, value):
+        """Elements whose value is equal to value.
+
+        args:
+         - value (any): value to look for
+
+        return:
+         - (set of int): element ids
+        """
+        return set(self._keys.get(value, ()))
+
+
+class SortedIndex(object):
+    """Keep the elements of a property sorted by value.
+    """
+
+    def __init__(self, prop):
+        """Constructor, register the index as an observer of prop.
+
+        args:
+         - prop (PropertyMap): the property to index
+        """
+        self._prop = prop
+        items = sorted((val, key) for key, val in prop.iteritems())
+        self._values = [val for val, key in items]
+        self._keys = [key for val, key in items]
+        prop.add_observer(self)
+
+    def detach(self):
+        """Stop following the modifications of the property.
+        """
+        self._prop.remove_observer(self)
+
+    def value_set(self, key, old, new):
+        if old is not missing:
+            self.value_removed(key, old)
+        ind = bisect_right(self._values, new)
+        self._values.insert(ind, new)
+        self._keys.insert(ind, key)
+
+    def value_removed(self, key, old):
+        start = bisect_left(self._values, old)
+        stop = bisect_right(self._values, old, start)
+        ind = self._keys.index(key, start, stop)
+        del self._values[ind]
+        del self._keys[ind]
+
+    def cleared(self, old):
+        del self._values[:]
+        del self._keys[:]
+
+    def find(self, value):
+        """Elements whose value is equal to value.
+
+        args:
+         - value (any): value to look for
+
+        return:
+         - (set of int): element ids
+        """
+        return set(self.find_range(value, value))
+
+    def find_range(self, low=None, high=None):
+        """Elements whose value is between low and high, bounds included.
+
+        args:
+         - low (any): lower bound, if None (default) not bounded
+         - high (any): upper bound, if None (default) not bounded
+
+        return:
+         - (list of int): element ids sorted by increasing value
+        """
+        values = self._values
+        start = 0 if low is None else bisect_left(values, low)
+        stop = len(values) if high is None else bisect_right(values, high)
+        return self._keys[start:stop]
@@ -0,0 +1,264 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+#       PropertyMap : container package
+#
+#       Distributed under the Cecill-C License.
+#       See accompanying file LICENSE.txt or copy at
+#           http://www.cecill.info/licences/Licence_CeCILL-C_V1-en.html
+#
+"""This module provide the mappings used to store properties of graph
+elements.
+
+    - PropertyMap: a dict that count its modifications
+    - DefaultPropertyMap: a PropertyMap that return a default value for
+                          elements with no stored value
+    - ComputedProperty: a read only mapping whose values are computed
+                        on demand and memoized
+"""
+
+from collections import Mapping
+
+
+class _Missing(object):
+    """Marker of the absence of a value.
+    """
+
+    def __repr__(self):
+        return "missing"
+
+
+missing = _Missing()
+
+
+def _empty_map(cls):
+    """Create an empty map of the given type without calling its
+    constructor, used when unpickling.
+    """
+    prop = dict.__new__(cls)
+    PropertyMap.__init__(prop)
+    return prop
+
+
+class PropertyMap(dict):
+    """Dictionary that keep track of its modifications.
+
+    _revision is incremented each time the content of the dict changes.
+    Observers registered with `add_observer` are notified of each
+    modification through their methods:
+
+        - value_set(key, old, new), old is `missing` for new keys
+        - value_removed(key, old)
+        - cleared(old), old is a dict of the removed values
+    """
+
+    def __init__(self, *args, **kwds):
+        dict.__init__(self, *args, **kwds)
+        self._revision = 0
+        self._observers = []
+
+    def __reduce__(self):
+        return _empty_map, (type(self),), self.__dict__, None, self.iteritems()
+
+    def add_observer(self, observer):
+        """Register an object to notify of each modification.
+
+        args:
+         - observer (any): object implementing value_set,
+                           value_removed and cleared
+        """
+        self._observers.append(observer)
+
+    def remove_observer(self, observer):
+        """Stop notifying an object.
+
+        args:
+         - observer (any): a previously registered observer
+        """
+        self._observers.remove(observer)
+
+    def __setitem__(self, key, val):
+        if self._observers:
+            old = dict.get(self, key, missing)
+            dict.__setitem__(self, key, val)
+            for observer in self._observers:
+                observer.value_set(key, old, val)
+        else:
+            dict.__setitem__(self, key, val)
+        self._revision += 1
+
+    def __delitem__(self, key):
+        if self._observers:
+            self.pop(key)
+        else:
+            dict.__delitem__(self, key)
+            self._revision += 1
+
+    def clear(self):
+        if self._observers:
+            old = dict(self)
+            dict.clear(self)
+            self._revision += 1
+            for observer in self._observers:
+                observer.cleared(old)
+        else:
+            dict.clear(self)
+            self._revision += 1
+
+    def pop(self, key, *args):
+        if key not in self:
+            return dict.pop(self, key, *args)
+        val = dict.pop(self, key)
+        self._revision += 1
+        for observer in self._observers:
+            observer.value_removed(key, val)
+        return val
+
+    def popitem(self):
+        key, val = dict.popitem(self)
+        self._revision += 1
+        for observer in self._observers:
+            observer.value_removed(key, val)
+        return key, val
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def update(self, *args, **kwds):
+        if self._observers:
+            for key, val in dict(*args, **kwds).iteritems():
+                self[key] = val
+        else:
+            dict.update(self, *args, **kwds)
+            self._revision += 1
+
+
+class DefaultPropertyMap(PropertyMap):
+    """PropertyMap with a default value for valid elements.
+
+    The default value is not stored for each element, it is returned
+    when accessing an element of the graph with no stored value. The
+    default value is shared between elements and should not be mutated.
+    """
+
+    def __init__(self, elements, default, *args, **kwds):
+        """Constructor
+
+        args:
+         - elements (container of int): ids of valid elements
+         - default (any): value returned for valid elements
+                          with no stored value
+        """
+        PropertyMap.__init__(self, *args, **kwds)
+        self._elements = elements
+        self.default = default
+
+    def __missing__(self, key):
+        if key in self._elements:
+            return self.default
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+class ComputedProperty(Mapping):
+    """Read only mapping whose values are computed by a function.
+
+    Values are computed the first time they are accessed and memoized.
+    The memo is dropped each time the topology of the graph or one of
+    the input properties changes.
+    """
+
+    def __init__(self, graph, elements, func, inputs=()):
+        """Constructor
+
+        args:
+         - graph (Graph): graph holding the elements
+         - elements (container of int): ids of elements
+         - func (callable): function called with (graph, elm_id)
+                            to compute the value of an element
+         - inputs (list of PropertyMap): properties used by func
+        """
+        self._graph = graph
+        self._elements = elements
+        self._func = func
+        self._inputs = tuple(inputs)
+        self._memo = {}
+        self._stamp = None
+        self._nb_invalidations = 0
+
+    def _input_stamp(self):
+        """State of the graph and input properties.
+        """
+        return (self._graph._revision,
+                tuple(prop._revision for prop in self._inputs))
+
+    def _validate(self):
+        """Drop memo if graph or inputs changed since last computation.
+        """
+        stamp = self._input_stamp()
+        if stamp != self._stamp:
+            self._memo.clear()
+            self._stamp = stamp
+            self._nb_invalidations += 1
+
+    @property
+    def _revision(self):
+        """Allow computed properties to be used as input of other
+        computed properties.
+        """
+        self._validate()
+        return self._nb_invalidations
+
+    def __getitem__(self, key):
+        self._validate()
+        try:
+            return self._memo[key]
+        except KeyError:
+            if key not in self._elements:
+                raise
+            val = self._memo[key] = self._func(self._graph, key)
+            return val
+
+    def __contains__(self, key):
+        return key in self._elements
+
+    def __iter__(self):
+        return iter(self._elements)
+
+    def __len__(self):
+        return len(self._elements)
+
+    def __setitem__(self, key, val):
+        raise TypeError("computed property does not support assignment")
+
+    def __delitem__(self, key):
+        raise TypeError("computed property does not support deletion")
+
+    def pop(self, key, *args):
+        """Forget memoized value of an element.
+        """
+        return self._memo.pop(key, *args)
+
+    def clear(self):
+        """Forget all memoized values.
+        """
+        self._memo.clear()
+
+    def is_computed(self, key):
+        """Test whether the value of an element is currently memoized.
+
+        args:
+         - key (int): element id
+
+        return:
+         - (bool)
+        """
+        self._validate()
+        return key in self._memo
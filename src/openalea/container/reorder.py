@@ -0,0 +1,181 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+#       Reorder : container package
+#
+#       Distributed under the Cecill-C License.
+#       See accompanying file LICENSE.txt or copy at
+#           http://www.cecill.info/licences/Licence_CeCILL-C_V1-en.html
+#
+"""This module provide orderings of the vertices of a graph that improve
+memory locality of traversals once the graph is laid out in this order
+(see `Graph.compact` and `CSRGraph`).
+
+All orderings ignore the direction of edges and return a list
+containing each vertex once.
+"""
+
+
+def _neighbors(graph, vid):
+    """Set of vertices connected to vid, vid excluded.
+    """
+    nids = set(graph.neighbors(vid))
+    nids.discard(vid)
+    return nids
+
+
+def _degrees(graph):
+    """Number of distinct neighbors of each vertex.
+    """
+    return dict((vid, len(_neighbors(graph, vid)))
+                for vid in graph.vertices())
+
+
+def insertion_order(graph):
+    """Vertices by increasing id.
+
+    args:
+     - graph (Graph)
+
+    return:
+     - (list of vid)
+    """
+    return sorted(graph.vertices())
+
+
+def degree_order(graph):
+    """Vertices by decreasing number of edges, ties broken by id.
+
+    args:
+     - graph (Graph)
+
+    return:
+     - (list of vid)
+    """
+    degree = dict((vid, graph.nb_edges(vid)) for vid in graph.vertices())
+    return sorted(degree, key=lambda vid: (-degree[vid], vid))
+
+
+def bfs_order(graph, starts=None):
+    """Breadth first traversal of each connected component.
+
+    Neighbors are visited by increasing id.
+
+    args:
+     - graph (Graph)
+     - starts (iter of vid): vertices from which to start traversals,
+                   if None (default) all vertices by increasing id.
+                   Components not reachable from starts are traversed
+                   afterwards.
+
+    return:
+     - (list of vid)
+    """
+    if starts is None:
+        starts = []
+    visited = set()
+    res = []
+    for start in list(starts) + sorted(graph.vertices()):
+        if start in visited:
+            continue
+        visited.add(start)
+        front = [start]
+        while len(front) > 0:
+            res.extend(front)
+            next_front = []
+            for vid in front:
+                for nid in sorted(_neighbors(graph, vid)):
+                    if nid not in visited:
+                        visited.add(nid)
+                        next_front.append(nid)
+            front = next_front
+    return res
+
+
+def _peripheral_vertex(graph, start, degree):
+    """Find a vertex far from start, in the same component.
+
+    Iterate BFS from the vertex of minimal degree in the last level
+    until the depth of the traversal stops increasing.
+    """
+    best_depth = -1
+    current = start
+    while True:
+        visited = set([current])
+        front = [current]
+        depth = 0
+        while True:
+            next_front = []
+            for vid in front:
+                for nid in _neighbors(graph, vid):
+                    if nid not in visited:
+                        visited.add(nid)
+                        next_front.append(nid)
+            if len(next_front) == 0:
+                break
+            front = next_front
+            depth += 1
+        if depth <= best_depth:
+            return current
+        best_depth = depth
+        current = min(front, key=lambda vid: (degree[vid], vid))
+
+
+def rcm_order(graph):
+    """Reverse Cuthill-McKee ordering.
+
+    Reduce the bandwidth of the adjacency matrix, i.e. neighbors get close
+    positions in the ordering.
+
+    args:
+     - graph (Graph)
+
+    return:
+     - (list of vid)
+    """
+    degree = _degrees(graph)
+    visited = set()
+    res = []
+    for vid in sorted(degree, key=lambda vid: (degree[vid], vid)):
+        if vid in visited:
+            continue
+        start = _peripheral_vertex(graph, vid, degree)
+        visited.add(start)
+        ind = len(res)
+        res.append(start)
+        while ind < len(res):
+            cur = res[ind]
+            ind += 1
+            nids = [nid for nid in _neighbors(graph, cur)
+                    if nid not in visited]
+            nids.sort(key=lambda nid: (degree[nid], nid))
+            visited.update(nids)
+            res.extend(nids)
+
+    res.reverse()
+    return res
+
+
+orders = {"insertion": insertion_order,
+          "bfs": bfs_order,
+          "degree": degree_order,
+          "rcm": rcm_order}
+
+
+def vertex_order(graph, order):
+    """Compute an ordering of all vertices.
+
+    args:
+     - graph (Graph)
+     - order (str): one of 'insertion', 'bfs', 'degree' or 'rcm'
+
+    return:
+     - (list of vid)
+    """
+    try:
+        func = orders[order]
+    except KeyError:
+        msg = "the required vertex order (%s) is unknown" % order
+        msg += "\navailable orders are %s" % str(sorted(orders.keys()))
+        raise UserWarning(msg)
+    return func(graph)
@@ -0,0 +1,435 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+#       Snapshot : container package
+#
+#       Distributed under the Cecill-C License.
+#       See accompanying file LICENSE.txt or copy at
+#           http://www.cecill.info/licences/Licence_CeCILL-C_V1-en.html
+#
+"""This module provide cheap read only snapshots of graphs.
+
+A snapshot shares its content with the live graph. While snapshots of a
+graph exist, each mutation of the graph first saves, in a journal, the
+previous state of the vertex records, edges and property values it
+modifies. A snapshot reads the values saved since its creation and the
+live graph for everything else. Memory grows with the number of elements
+modified since the oldest living snapshot, not with the number of
+snapshots. Once all snapshots are garbage collected, the journal is
+dropped and the graph does not pay any cost anymore.
+
+Snapshots ignore:
+
+    - computed properties
+    - modifications of properties stored as plain dicts, their values
+      are copied when the snapshot is created
+    - modifications of mutable values (e.g. lists) stored in properties,
+      values are shared with the live graph and must be replaced, not
+      modified in place
+"""
+
+from weakref import ref
+
+from graph import Graph, GraphError, GraphObserver
+from property_graph import PropertyGraph
+from property_map import missing, ComputedProperty, PropertyMap
+
+_VERTICES = "vertices"
+_EDGES = "edges"
+
+
+class SnapshotError(GraphError):
+    """Exception raised when trying to modify a snapshot.
+    """
+
+
+class _Epoch(object):
+    """Values saved between the creation of a snapshot and the next one.
+
+    tables associate a channel (vertices, edges or a property) to a dict
+    of the values elements had at the beginning of the epoch, `missing`
+    for elements that did not exist.
+    """
+
+    def __init__(self, prev):
+        self.tables = {}
+        self.prev = prev
+        self.next = None
+        if prev is not None:
+            prev.next = self
+
+
+class _Pin(object):
+    """Token shared by a snapshot and the views it returns, its
+    destruction signals that the epoch of the snapshot is not needed
+    anymore.
+    """
+    __slots__ = ("__weakref__",)
+
+
+class _PropertyObserver(object):
+    """Save previous values of a property in the journal.
+    """
+
+    def __init__(self, journal, prop):
+        self._journal = journal
+        self.prop = prop
+
+    def value_set(self, key, old, new):
+        self._journal.save(self, key, old)
+
+    def value_removed(self, key, old):
+        self._journal.save(self, key, old)
+
+    def cleared(self, old):
+        for key, val in old.iteritems():
+            self._journal.save(self, key, val)
+
+
+class _Journal(GraphObserver):
+    """Record previous values of the elements of a graph modified since
+    the creation of its oldest living snapshot.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.current = None
+        self._pins = {}
+        self._observers = {}
+        graph.add_observer(self)
+        graph._journal = self
+
+    def detach(self):
+        """Stop recording modifications of the graph.
+        """
+        graph = self.graph
+        graph.remove_observer(self)
+        for observer in self._observers.itervalues():
+            observer.prop.remove_observer(observer)
+        del graph._journal
+
+    # ##########################################################
+    #
+    # epochs
+    #
+    # ##########################################################
+    def new_epoch(self):
+        """Start a new epoch for a new snapshot.
+
+        return:
+         - (_Epoch, _Pin): the epoch and the pin whose lifetime
+                           controls the lifetime of the epoch
+        """
+        self.current = _Epoch(self.current)
+        pin = _Pin()
+        self._pins[ref(pin, self._release)] = self.current
+        return self.current, pin
+
+    def _release(self, pin_ref):
+        """Forget the epoch of a garbage collected snapshot.
+
+        Values saved during this epoch are still needed by the snapshots
+        of previous epochs and are merged in the previous epoch.
+        """
+        epoch = self._pins.pop(pin_ref)
+        prev, next_epoch = epoch.prev, epoch.next
+        if prev is not None:
+            for channel, table in epoch.tables.iteritems():
+                prev_table = prev.tables.setdefault(channel, {})
+                for key, val in table.iteritems():
+                    prev_table.setdefault(key, val)
+            prev.next = next_epoch
+        if next_epoch is not None:
+            next_epoch.prev = prev
+        if epoch is self.current:
+            self.current = prev
+        epoch.tables = {}
+
+        if len(self._pins) == 0:
+            self.detach()
+
+    def observe(self, prop):
+        """Save previous values of a property from now on.
+
+        args:
+         - prop (PropertyMap)
+        """
+        if id(prop) not in self._observers:
+            observer = _PropertyObserver(self, prop)
+            prop.add_observer(observer)
+            self._observers[id(prop)] = observer
+        return self._observers[id(prop)]
+
+    # ##########################################################
+    #
+    # saving values
+    #
+    # ##########################################################
+    def save(self, channel, key, old):
+        table = self.current.tables.get(channel)
+        if table is None:
+            self.current.tables[channel] = {key: old}
+        elif key not in table:
+            table[key] = old
+
+    def save_vertex(self, vid):
+        record = self.graph._vertices.get(vid)
+        self.save(_VERTICES, vid,
+                  missing if record is None else record.copy())
+
+    def save_edge(self, eid):
+        self.save(_EDGES, eid, self.graph._edges.get(eid, missing))
+
+    def save_all(self, value=None):
+        """Save all vertices and edges not saved yet.
+
+        args:
+         - value (any): value to save for each element, if None (default)
+                        the current value of the element
+        """
+        table = self.current.tables.setdefault(_VERTICES, {})
+        for vid, record in self.graph._vertices.iteritems():
+            if vid not in table:
+                table[vid] = record.copy() if value is None else value
+        table = self.current.tables.setdefault(_EDGES, {})
+        for eid, edge in self.graph._edges.iteritems():
+            if eid not in table:
+                table[eid] = edge if value is None else value
+
+    # ##########################################################
+    #
+    # graph observer
+    #
+    # ##########################################################
+    def vertex_added(self, vid):
+        self.save(_VERTICES, vid, missing)
+
+    def vertex_removing(self, vid):
+        # attached edges are saved by edge_removing
+        self.save_vertex(vid)
+
+    def edge_adding(self, sid, tid):
+        self.save_vertex(sid)
+        self.save_vertex(tid)
+
+    def edge_added(self, eid, sid, tid):
+        self.save(_EDGES, eid, missing)
+
+    def edge_removing(self, eid, sid, tid):
+        self.save_edge(eid)
+        self.save_vertex(sid)
+        self.save_vertex(tid)
+
+    def resetting(self):
+        self.save_all()
+
+    def reset(self):
+        # elements created with ids that did not exist before
+        self.save_all(missing)
+
+
+class _SnapshotTable(object):
+    """Read only mapping giving the content of a live mapping at the
+    beginning of an epoch.
+    """
+
+    def __init__(self, live, channel, epoch, pin):
+        self._live = live
+        self._channel = channel
+        self._epoch = epoch
+        self._pin = pin
+        self._len = None
+
+    def _resolve(self, key):
+        epoch = self._epoch
+        channel = self._channel
+        while epoch is not None:
+            table = epoch.tables.get(channel)
+            if table is not None and key in table:
+                return table[key]
+            epoch = epoch.next
+        return self._live.get(key, missing)
+
+    def _touched(self):
+        """Keys modified since the beginning of the epoch.
+        """
+        keys = set()
+        epoch = self._epoch
+        while epoch is not None:
+            keys.update(epoch.tables.get(self._channel, ()))
+            epoch = epoch.next
+        return keys
+
+    def __getitem__(self, key):
+        val = self._resolve(key)
+        if val is missing:
+            raise KeyError(key)
+        return val
+
+    def get(self, key, default=None):
+        val = self._resolve(key)
+        return default if val is missing else val
+
+    def __contains__(self, key):
+        try:
+            return self._resolve(key) is not missing
+        except TypeError:
+            return False
+
+    def keys(self):
+        touched = self._touched()
+        keys = [key for key in self._live if key not in touched]
+        keys.extend(key for key in touched
+                    if self._resolve(key) is not missing)
+        return keys
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    iterkeys = __iter__
+
+    def iteritems(self):
+        for key in self.keys():
+            yield key, self[key]
+
+    def items(self):
+        return list(self.iteritems())
+
+    def itervalues(self):
+        for key in self.keys():
+            yield self[key]
+
+    def values(self):
+        return list(self.itervalues())
+
+    def __len__(self):
+        if self._len is None:
+            self._len = len(self.keys())
+        return self._len
+
+
+class _SnapshotProperty(_SnapshotTable):
+    """Snapshot of a DefaultPropertyMap.
+    """
+
+    def __init__(self, live, channel, epoch, pin, elements):
+        _SnapshotTable.__init__(self, live, channel, epoch, pin)
+        self._elements = elements
+        self.default = live.default
+
+    def __getitem__(self, key):
+        val = self._resolve(key)
+        if val is missing:
+            if key in self._elements:
+                return self.default
+            raise KeyError(key)
+        return val
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+def _read_only(*args, **kwds):
+    raise SnapshotError("snapshots are read only")
+
+
+class GraphSnapshot(Graph):
+    """Read only view of a graph as it was at the creation of the view.
+    """
+
+    def __init__(self, graph, journal):
+        epoch, pin = journal.new_epoch()
+        self._vertices = _SnapshotTable(graph._vertices, _VERTICES, epoch, pin)
+        self._edges = _SnapshotTable(graph._edges, _EDGES, epoch, pin)
+        self._revision = graph._revision
+        self._graph_type = type(graph)
+        self._idgenerator = graph._vertices.get_generator_type()
+        self._storage = graph.get_storage_type()
+
+    add_vertex = remove_vertex = clear = _read_only
+    add_edge = remove_edge = clear_edges = _read_only
+    extend = compact = _read_only
+
+    def _new_graph(self):
+        return self._graph_type(idgenerator=self._idgenerator,
+                                storage=self._storage)
+
+    def get_storage_type(self):
+        return self._storage
+
+    def snapshot(self):
+        return self
+
+    def copy(self):
+        """Create a mutable graph with the content of the snapshot.
+
+        Vertices and edges keep their ids, properties are copied.
+
+        return:
+         - (Graph): a graph of the same type as the original graph
+        """
+        return self.sub_graph(self.vertices())
+
+
+class PropertyGraphSnapshot(GraphSnapshot, PropertyGraph):
+    """Read only view of a property graph as it was at the creation of
+    the view.
+
+    Property values are read through read only mappings.
+    """
+
+    def __init__(self, graph, journal):
+        GraphSnapshot.__init__(self, graph, journal)
+        self._vertex_property = self._properties(
+            graph._vertex_property, journal, self._vertices)
+        self._edge_property = self._properties(
+            graph._edge_property, journal, self._edges)
+        self._graph_property = dict(graph._graph_property)
+        self._vertex_index = {}
+        self._edge_index = {}
+
+    def _properties(self, props, journal, elements):
+        res = {}
+        epoch, pin = elements._epoch, elements._pin
+        for name, prop in props.iteritems():
+            if isinstance(prop, ComputedProperty):
+                continue
+            if not isinstance(prop, PropertyMap):
+                res[name] = dict(prop)
+                continue
+            observer = journal.observe(prop)
+            if hasattr(prop, "default"):
+                res[name] = _SnapshotProperty(prop, observer, epoch, pin,
+                                              elements)
+            else:
+                res[name] = _SnapshotTable(prop, observer, epoch, pin)
+        return res
+
+    add_vertex_property = add_computed_vertex_property = _read_only
+    remove_vertex_property = set_vertex_values = _read_only
+    add_edge_property = add_computed_edge_property = _read_only
+    remove_edge_property = set_edge_values = _read_only
+    add_graph_property = remove_graph_property = _read_only
+    create_vertex_index = drop_vertex_index = _read_only
+    create_edge_index = drop_edge_index = _read_only
+
+
+def snapshot(graph):
+    """Create a read only snapshot of a graph.
+
+    args:
+     - graph (Graph|PropertyGraph): the live graph
+
+    return:
+     - (GraphSnapshot|PropertyGraphSnapshot)
+    """
+    journal = graph.__dict__.get("_journal")
+    if journal is None:
+        journal = _Journal(graph)
+
+    if isinstance(graph, PropertyGraph):
+        return PropertyGraphSnapshot(graph, journal)
+    return GraphSnapshot(graph, journal)
@@ -0,0 +1,95 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+#       SparseAdjacency : container package
+#
+#       Distributed under the Cecill-C License.
+#       See accompanying file LICENSE.txt or copy at
+#           http://www.cecill.info/licences/Licence_CeCILL-C_V1-en.html
+#
+"""This module provide conversions between graphs and sparse
+adjacency matrices.
+
+This module requires NumPy and SciPy.
+"""
+
+import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix
+
+formats = ("coo", "csr", "csc")
+
+
+def to_sparse(graph, weights=None, vertex_order=None, fmt="csr"):
+    """Adjacency matrix of a graph.
+
+    Entry (i, j) of the matrix is the sum of the weights of the edges
+    between the ith and jth vertex in vertex_order.
+
+    args:
+     - graph (Graph): graph to convert
+     - weights (dict of (eid, float)): weight of each edge. If None
+                                       (default), each edge weights 1
+     - vertex_order (list of vid): vertices associated to each row and
+                         column. If None (default), all vertices by
+                         increasing vid. Edges between vertices not in
+                         this list are ignored.
+     - fmt (str): one of 'coo', 'csr' (default) or 'csc'
+
+    return:
+     - (scipy.sparse matrix, dict of (vid, int)): matrix and
+                                    row index of each vertex
+    """
+    if fmt not in formats:
+        raise UserWarning("unknown sparse format (%s)" % fmt)
+
+    if vertex_order is None:
+        vertex_order = sorted(graph._vertices)
+    index = dict((vid, i) for i, vid in enumerate(vertex_order))
+    if len(index) != len(vertex_order):
+        raise ValueError("vertex order contains duplicated vertices")
+
+    nb = len(graph._edges)
+    eids = np.fromiter(graph._edges.iterkeys(), int, nb)
+    rows = np.fromiter((index.get(sid, -1)
+                        for sid, tid in graph._edges.itervalues()), int, nb)
+    cols = np.fromiter((index.get(tid, -1)
+                        for sid, tid in graph._edges.itervalues()), int, nb)
+    kept = (rows >= 0) & (cols >= 0)
+    if not kept.all():
+        eids = eids[kept]
+        rows = rows[kept]
+        cols = cols[kept]
+
+    # only edges between ordered vertices need a weight
+    if weights is None:
+        data = np.ones(len(eids))
+    else:
+        data = np.fromiter((weights[eid] for eid in eids.tolist()),
+                           float, len(eids))
+
+    shape = (len(vertex_order), len(vertex_order))
+    mat = coo_matrix((data, (rows, cols)), shape=shape)
+    if fmt != "coo":
+        mat = mat.asformat(fmt)
+        mat.sum_duplicates()
+    return mat, index
+
+
+def sparse_edges(matrix):
+    """Non zero entries of a square matrix.
+
+    args:
+     - matrix (scipy.sparse matrix|np.array): square matrix
+
+    return:
+     - (int, np.array, np.array, np.array): nb of rows, row, column
+                                            and value of each entry
+    """
+    mat = csr_matrix(matrix)
+    if mat.shape[0] != mat.shape[1]:
+        raise ValueError("adjacency matrix must be square")
+    mat.sum_duplicates()
+    mat = mat.tocoo()
+    nonzero = mat.data != 0
+    return (mat.shape[0], mat.row[nonzero], mat.col[nonzero],
+            mat.data[nonzero])
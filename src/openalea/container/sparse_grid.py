@@ -0,0 +1,410 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+#       SparseGrid : container package
+#
+#       Distributed under the Cecill-C License.
+#       See accompanying file LICENSE.txt or copy at
+#           http://www.cecill.info/licences/Licence_CeCILL-C_V1-en.html
+#
+"""This module provide a container of data associated to the occupied
+cells of a huge, mostly empty, Grid.
+
+Cells are grouped in blocks, boxes of block_shape cells. Only blocks
+containing at least one occupied cell are stored:
+
+    - sparse blocks store a dict between local index in block and value
+    - dense blocks, once more than a given fraction of their cells are
+      occupied, store a list of values along with a bytearray flagging
+      occupied cells, as IdArrayDict does
+
+Memory is proportional to the number of occupied cells, whatever the
+size of the grid.
+
+This module requires NumPy.
+"""
+
+from itertools import compress, izip
+from numbers import Integral
+
+import numpy as np
+
+_no_value = object()
+
+
+def _is_int(val):
+    return type(val) is int or isinstance(val, Integral)
+
+
+class _DenseBlock(object):
+    """Values of the cells of a block stored in a list indexed by
+    local index.
+    """
+
+    __slots__ = ("values", "present", "nb")
+
+    def __init__(self, size, items=()):
+        self.values = [None] * size
+        self.present = bytearray(size)
+        self.nb = 0
+        for local, val in items:
+            self.set(local, val)
+
+    def get(self, local, default=None):
+        if self.present[local]:
+            return self.values[local]
+        return default
+
+    def set(self, local, val):
+        if not self.present[local]:
+            self.present[local] = 1
+            self.nb += 1
+        self.values[local] = val
+
+    def remove(self, local):
+        self.values[local] = None
+        self.present[local] = 0
+        self.nb -= 1
+
+    def locals(self):
+        return np.flatnonzero(np.frombuffer(self.present, dtype=np.uint8))
+
+    def iteritems(self):
+        return izip(compress(xrange(len(self.present)), self.present),
+                    compress(self.values, self.present))
+
+
+class SparseGrid(object):
+    """Mapping between index of occupied cells of a grid and data.
+    """
+
+    def __init__(self, grid, block_shape=None, density=0.25):
+        """Constructor
+
+        args:
+         - grid (Grid): grid whose cells are indexed, in row order
+         - block_shape (tuple of int): number of cells of a block along
+                       each axis, default 16 along each axis
+         - density (float): fraction of occupied cells above which a
+                            block is stored densely
+        """
+        if grid.order() != "row":
+            raise ValueError("grid must number its cells in row order")
+        self._grid = grid
+        self._shape = list(grid._shape)
+        self._offset = list(grid._offset)
+        self._nb_cells = len(grid)
+        dim = len(self._shape)
+        if block_shape is None:
+            block_shape = (16,) * dim
+        if len(block_shape) != dim:
+            raise ValueError("block shape must have %d dimensions" % dim)
+        self._block_shape = [int(s) for s in block_shape]
+
+        # blocks are laid out in a grid of blocks, cells in a block
+        # are numbered first axis varying fastest, as in Grid
+        self._nb_blocks = [-(-s // b) for s, b in zip(self._shape,
+                                                     self._block_shape)]
+        self._block_offset = self._offsets(self._nb_blocks)
+        self._local_offset = self._offsets(self._block_shape)
+        self._block_size = 1
+        for s in self._block_shape:
+            self._block_size *= s
+
+        self._dense_limit = max(1, int(density * self._block_size))
+        self._blocks = {}
+        self._len = 0
+        self._revision = 0
+        self._sorted = None
+
+    @staticmethod
+    def _offsets(shape):
+        offset = [1]
+        for incr in shape[:-1]:
+            offset.append(offset[-1] * incr)
+        return offset
+
+    def grid(self):
+        """Grid whose cells are indexed.
+
+        return:
+         - (Grid)
+        """
+        return self._grid
+
+    def nb_blocks(self):
+        """Number of blocks stored.
+
+        return:
+         - (int)
+        """
+        return len(self._blocks)
+
+    def nb_dense_blocks(self):
+        """Number of blocks stored densely.
+
+        return:
+         - (int)
+        """
+        return sum(1 for block in self._blocks.itervalues()
+                   if isinstance(block, _DenseBlock))
+
+    # ##########################################################
+    #
+    # index arithmetic
+    #
+    # ##########################################################
+    def _split(self, ind):
+        """Block and local index of a cell.
+        """
+        if not _is_int(ind):
+            raise TypeError("cell index must be an int, not %s"
+                            % type(ind).__name__)
+        if not (0 <= ind < self._nb_cells):
+            msg = "index out of range index: %d max : %d" % (ind,
+                                                            self._nb_cells)
+            raise IndexError(msg)
+        block = 0
+        local = 0
+        for offset, size, bsize, boffset, loffset in izip(
+                self._offset, self._shape, self._block_shape,
+                self._block_offset, self._local_offset):
+            bcoord, lcoord = divmod((ind // offset) % size, bsize)
+            block += bcoord * boffset
+            local += lcoord * loffset
+        return block, local
+
+    def _split_many(self, inds):
+        """Block and local index of an array of cells.
+        """
+        inds = np.asarray(inds, dtype=np.int64)
+        if len(inds) > 0 and (inds.min() < 0 or
+                              inds.max() >= self._nb_cells):
+            raise IndexError("index out of range")
+        blocks = np.zeros(len(inds), dtype=np.int64)
+        locs = np.zeros(len(inds), dtype=np.int64)
+        for offset, size, bsize, boffset, loffset in izip(
+                self._offset, self._shape, self._block_shape,
+                self._block_offset, self._local_offset):
+            bcoord, lcoord = np.divmod((inds // offset) % size, bsize)
+            blocks += bcoord * boffset
+            locs += lcoord * loffset
+        return blocks, locs
+
+    def _join_many(self, blocks, locs):
+        """Index in the grid of cells given by block and local index.
+        """
+        inds = np.zeros(len(locs), dtype=np.int64)
+        for offset, bsize, nb, boffset, loffset in izip(
+                self._offset, self._block_shape, self._nb_blocks,
+                self._block_offset, self._local_offset):
+            bcoord = (blocks // boffset) % nb
+            lcoord = (locs // loffset) % bsize
+            inds += (bcoord * bsize + lcoord) * offset
+        return inds
+
+    # ##########################################################
+    #
+    # block storage
+    #
+    # ##########################################################
+    def _modified(self):
+        self._revision += 1
+        self._sorted = None
+
+    def _store(self, block, items):
+        """Set the values of many cells of a block.
+
+        args:
+         - block (int): block index
+         - items (list of (int, any)): local index and value of cells
+        """
+        store = self._blocks.get(block)
+        if store is None:
+            store = {}
+            self._blocks[block] = store
+        if isinstance(store, _DenseBlock):
+            nb = store.nb
+            for local, val in items:
+                store.set(local, val)
+            self._len += store.nb - nb
+        else:
+            nb = len(store)
+            store.update(items)
+            self._len += len(store) - nb
+            if len(store) > self._dense_limit:
+                self._blocks[block] = _DenseBlock(self._block_size,
+                                                  store.iteritems())
+
+    # ##########################################################
+    #
+    # mapping interface
+    #
+    # ##########################################################
+    def __len__(self):
+        """Number of occupied cells.
+        """
+        return self._len
+
+    def __contains__(self, ind):
+        try:
+            block, local = self._split(ind)
+        except (IndexError, TypeError):
+            return False
+        return self._lookup(block, local, _no_value) is not _no_value
+
+    def _lookup(self, block, local, default):
+        store = self._blocks.get(block)
+        if store is None:
+            return default
+        return store.get(local, default)
+
+    def __getitem__(self, ind):
+        block, local = self._split(ind)
+        val = self._lookup(block, local, _no_value)
+        if val is _no_value:
+            raise KeyError(ind)
+        return val
+
+    def get(self, ind, default=None):
+        try:
+            return self[ind]
+        except (KeyError, IndexError):
+            return default
+
+    def __setitem__(self, ind, val):
+        block, local = self._split(ind)
+        self._store(block, [(local, val)])
+        self._modified()
+
+    def __delitem__(self, ind):
+        block, local = self._split(ind)
+        store = self._blocks.get(block)
+        if store is None:
+            raise KeyError(ind)
+        if isinstance(store, _DenseBlock):
+            if not store.present[local]:
+                raise KeyError(ind)
+            store.remove(local)
+            nb = store.nb
+            if nb < self._dense_limit // 4:
+                # hysteresis avoids converting back and forth
+                self._blocks[block] = dict(store.iteritems())
+        else:
+            del store[local]
+            nb = len(store)
+        if nb == 0:
+            del self._blocks[block]
+        self._len -= 1
+        self._modified()
+
+    def clear(self):
+        self._blocks.clear()
+        self._len = 0
+        self._modified()
+
+    def update(self, inds, values):
+        """Set the values of many cells at once.
+
+        Cells are grouped by block with array operations and each block
+        is updated in a single step.
+
+        args:
+         - inds (iter of int): index of cells
+         - values (iter of any): value of each cell, in the same order
+        """
+        blocks, locs = self._split_many(list(inds))
+        values = list(values)
+        if len(values) != len(locs):
+            raise ValueError("nb of values (%d) and nb of cells (%d) differ"
+                             % (len(values), len(locs)))
+        if len(locs) == 0:
+            return
+
+        order = np.argsort(blocks, kind="mergesort")
+        blocks = blocks[order]
+        starts = np.flatnonzero(np.r_[True, blocks[1:] != blocks[:-1]])
+        bounds = np.r_[starts, len(blocks)].tolist()
+        locs = locs[order].tolist()
+        values = [values[i] for i in order.tolist()]
+        for i, block in enumerate(blocks[starts].tolist()):
+            start, stop = bounds[i], bounds[i + 1]
+            self._store(block, zip(locs[start:stop], values[start:stop]))
+        self._modified()
+
+    def keys(self):
+        """Index of occupied cells, in increasing order.
+
+        return:
+         - (np.array of int)
+        """
+        if self._sorted is None:
+            blocks = []
+            locs = []
+            for block, store in self._blocks.iteritems():
+                if isinstance(store, _DenseBlock):
+                    block_locs = store.locals().tolist()
+                else:
+                    block_locs = list(store)
+                blocks.extend([block] * len(block_locs))
+                locs.extend(block_locs)
+            inds = self._join_many(np.array(blocks, dtype=np.int64),
+                                   np.array(locs, dtype=np.int64))
+            self._sorted = np.sort(inds)
+        return self._sorted.copy()
+
+    def __iter__(self):
+        return iter(self.keys().tolist())
+
+    iterkeys = __iter__
+
+    def itervalues(self):
+        for ind in self:
+            yield self[ind]
+
+    def iteritems(self):
+        for ind in self:
+            yield ind, self[ind]
+
+    # ##########################################################
+    #
+    # neighborhood
+    #
+    # ##########################################################
+    def neighbors(self, ind):
+        """Occupied cells adjacent to a cell along each axis.
+
+        args:
+         - ind (int): index of cell
+
+        return:
+         - (list of (int, any)): index and value of occupied neighbors
+        """
+        block, local = self._split(ind)
+        res = []
+        for offset, size, bsize, boffset, loffset in izip(
+                self._offset, self._shape, self._block_shape,
+                self._block_offset, self._local_offset):
+            coord = (ind // offset) % size
+            lcoord = coord % bsize
+            # previous and next cells along axis, possibly in the
+            # previous or next block
+            if coord > 0:
+                if lcoord > 0:
+                    val = self._lookup(block, local - loffset, _no_value)
+                else:
+                    val = self._lookup(block - boffset,
+                                       local + (bsize - 1) * loffset,
+                                       _no_value)
+                if val is not _no_value:
+                    res.append((ind - offset, val))
+            if coord < size - 1:
+                if lcoord < bsize - 1:
+                    val = self._lookup(block, local + loffset, _no_value)
+                else:
+                    val = self._lookup(block + boffset,
+                                       local - (bsize - 1) * loffset,
+                                       _no_value)
+                if val is not _no_value:
+                    res.append((ind + offset, val))
+        return res
@@ -0,0 +1,640 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+#       Tree : container package
+#
+#       Distributed under the Cecill-C License.
+#       See accompanying file LICENSE.txt or copy at
+#           http://www.cecill.info/licences/Licence_CeCILL-C_V1-en.html
+#
+"""This module provide a rooted tree that expose the read interface of Graph.
+
+Each vertex store a pointer to its parent and the list of its children.
+The edge between a vertex and its parent has the same id as the vertex.
+"""
+
+from graph import GraphError, InvalidEdge, InvalidVertex
+from id_dict import IdDict
+
+
+class Tree(object):
+    """Rooted tree with parent pointers and child arrays.
+
+    In this implementation:
+
+        - vertices are stored with their parent id (None for the root)
+        - the edge (parent(vid), vid) has id vid
+        - a preorder of the vertices is computed when needed to
+          answer ancestor and subtree queries in constant time. It is
+          recomputed in O(n) after a modification, unless the tree
+          grows by adding children along the last branch of the
+          preorder, e.g. when building it depth first
+    """
+
+    def __init__(self, idgenerator="set"):
+        """Constructor of an empty tree.
+
+        args:
+          - idgenerator (str): type of idgenerator to use, default 'set'
+        """
+        self._parent = IdDict(idgenerator=idgenerator)
+        self._children = {}
+        self._depth = {}
+        self._root = None
+
+        self._preorder = None
+        self._tin = None
+        self._tout = None
+
+    @classmethod
+    def from_graph(cls, graph, root):
+        """Create a tree with the same vertices and edges as graph.
+
+        Vertex ids are preserved, edge ids are not.
+
+        args:
+         - graph (Graph): graph whose edges are oriented away from root
+         - root (int): id of root vertex
+
+        return:
+         - (Tree)
+        """
+        if root not in graph:
+            raise InvalidVertex(root)
+
+        tree = cls()
+        tree.add_vertex(root)
+        front = [root]
+        while len(front) > 0:
+            pid = front.pop()
+            for eid in graph.out_edges(pid):
+                vid = graph.target(eid)
+                if vid in tree:
+                    raise GraphError("vertex %s has several parents" % vid)
+                tree.add_child(pid, vid)
+                front.append(vid)
+
+        if tree.nb_vertices() != graph.nb_vertices():
+            raise GraphError("some vertices are not connected to root")
+
+        return tree
+
+    # ##########################################################
+    #
+    # Tree concept
+    #
+    # ##########################################################
+    def root(self):
+        """Id of the root vertex.
+
+        return:
+         - (int): None if the tree is empty
+        """
+        return self._root
+
+    def parent(self, vid):
+        """Parent of a vertex.
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (int): None if vid is the root
+        """
+        try:
+            return self._parent[vid]
+        except (KeyError, TypeError):
+            raise InvalidVertex(vid)
+
+    def children(self, vid):
+        """Iterator on the children of a vertex.
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (iter of int)
+        """
+        try:
+            return iter(self._children[vid])
+        except (KeyError, TypeError):
+            raise InvalidVertex(vid)
+
+    def nb_children(self, vid):
+        """Number of children of a vertex.
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (int)
+        """
+        try:
+            return len(self._children[vid])
+        except (KeyError, TypeError):
+            raise InvalidVertex(vid)
+
+    def is_leaf(self, vid):
+        """Test whether a vertex has no children.
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (bool)
+        """
+        return self.nb_children(vid) == 0
+
+    def depth(self, vid):
+        """Number of edges between a vertex and the root.
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (int)
+        """
+        try:
+            return self._depth[vid]
+        except (KeyError, TypeError):
+            raise InvalidVertex(vid)
+
+    def _update_preorder(self):
+        """Compute preorder of vertices and entry/exit position of each one.
+        """
+        preorder = []
+        if self._root is not None:
+            children = self._children
+            stack = [self._root]
+            while len(stack) > 0:
+                vid = stack.pop()
+                preorder.append(vid)
+                stack.extend(reversed(children[vid]))
+
+        tin = dict((vid, i) for i, vid in enumerate(preorder))
+        size = {}
+        for vid in reversed(preorder):
+            size[vid] = 1 + sum(size[cid] for cid in self._children[vid])
+
+        self._preorder = preorder
+        self._tin = tin
+        self._tout = dict((vid, tin[vid] + size[vid]) for vid in preorder)
+
+    def preorder(self):
+        """List of all vertices, each vertex appearing before its children.
+
+        O(n) if the tree has been modified since the last preorder query
+        (see `add_child`), O(n) anyway to copy the list.
+
+        return:
+         - (list of int)
+        """
+        if self._preorder is None:
+            self._update_preorder()
+        return list(self._preorder)
+
+    def subtree_range(self, vid):
+        """Position of the subtree of a vertex in `preorder`.
+
+        O(1), or O(n) if the tree has been modified since the last
+        preorder query (see `add_child`).
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (int, int): start and stop position in preorder
+        """
+        if vid not in self:
+            raise InvalidVertex(vid)
+        if self._preorder is None:
+            self._update_preorder()
+        return self._tin[vid], self._tout[vid]
+
+    def subtree(self, vid):
+        """List of vertices in the subtree of vid, vid included.
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (list of int): vertices in preorder
+        """
+        start, stop = self.subtree_range(vid)
+        return self._preorder[start:stop]
+
+    def nb_descendants(self, vid):
+        """Number of vertices in the subtree of vid, vid excluded.
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (int)
+        """
+        start, stop = self.subtree_range(vid)
+        return stop - start - 1
+
+    def is_ancestor(self, aid, vid):
+        """Test whether aid is on the path between the root and vid.
+
+        A vertex is its own ancestor.
+
+        args:
+         - aid (int): id of potential ancestor
+         - vid (int): vertex id
+
+        return:
+         - (bool)
+        """
+        if vid not in self:
+            raise InvalidVertex(vid)
+        start, stop = self.subtree_range(aid)
+        return start <= self._tin[vid] < stop
+
+    # ##########################################################
+    #
+    # Graph concept
+    #
+    # ##########################################################
+    def source(self, eid):
+        """Retrieve the source vertex of an edge
+
+        args:
+         - eid (int):  edge id
+
+        return:
+         - (int): vertex id
+        """
+        if not self.has_edge(eid):
+            raise InvalidEdge(eid)
+        return self._parent[eid]
+
+    def target(self, eid):
+        """Retrieve the target vertex of an edge
+
+        args:
+         - eid (int):  edge id
+
+        return:
+         - (int): vertex id
+        """
+        if not self.has_edge(eid):
+            raise InvalidEdge(eid)
+        return eid
+
+    def edge_vertices(self, eid):
+        """Retrieve both source and target vertex of an edge
+
+        args:
+         - eid (int):  edge id
+
+        return:
+         - (int, int): source id, target id
+        """
+        if not self.has_edge(eid):
+            raise InvalidEdge(eid)
+        return self._parent[eid], eid
+
+    def edge(self, source, target):
+        """Find the matching edge with same source and same target
+        return None if it don't succeed
+
+        args:
+         - source (int): source vertex
+         - target (int): target vertex
+
+        return:
+         - (int): edge id with same source and target
+         - (None): if search is unsuccessful
+        """
+        if source not in self:
+            raise InvalidVertex(source)
+        if self.parent(target) == source:
+            return target
+        return None
+
+    def __contains__(self, vid):
+        """magic alias for `has_vertex`
+        """
+        return self.has_vertex(vid)
+
+    def has_vertex(self, vid):
+        """test whether a vertex belong to the graph
+
+        args:
+         - vid (int): id of vertex
+
+        return:
+         - (bool)
+        """
+        try:
+            return vid in self._parent
+        except TypeError:
+            return False
+
+    def has_edge(self, eid):
+        """test whether an edge belong to the graph
+
+        args:
+         - eid (int): id of edge
+
+        return:
+         - (bool)
+        """
+        try:
+            return self._parent.get(eid) is not None
+        except TypeError:
+            return False
+
+    def is_valid(self):
+        """Test the validity of the graph
+
+        return:
+         - (bool)
+        """
+        return True
+
+    # ##########################################################
+    #
+    # Vertex List Graph Concept
+    #
+    # ##########################################################
+    def vertices(self):
+        """Iterator on all vertices
+
+        return:
+         - (iter of int)
+        """
+        return iter(self._parent)
+
+    def __iter__(self):
+        """Magic alias for `vertices`
+        """
+        return iter(self._parent)
+
+    def nb_vertices(self):
+        """Total number of vertices in the graph
+
+        return:
+         - (int)
+        """
+        return len(self._parent)
+
+    def __len__(self):
+        """Magic alias for `nb_vertices`
+        """
+        return self.nb_vertices()
+
+    def in_neighbors(self, vid):
+        """Iterator on the neighbors of vid
+        where edges are directed from neighbor to vid
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (iter of int): iter of vertex id
+        """
+        pid = self.parent(vid)
+        return iter(() if pid is None else (pid,))
+
+    def out_neighbors(self, vid):
+        """Iterator on the neighbors of vid
+        where edges are directed from vid to neighbor
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (iter of int): iter of vertex id
+        """
+        return self.children(vid)
+
+    def neighbors(self, vid):
+        """Iterator on all neighbors of vid both in and out
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (iter of int): iter of vertex id
+        """
+        neighbors_list = list(self.in_neighbors(vid))
+        neighbors_list.extend(self._children[vid])
+        return iter(neighbors_list)
+
+    def nb_in_neighbors(self, vid):
+        """Number of in neighbors of vid
+        where edges are directed from neighbor to vid
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (int)
+        """
+        return 0 if self.parent(vid) is None else 1
+
+    def nb_out_neighbors(self, vid):
+        """Number of out neighbors of vid
+        where edges are directed from vid to neighbor
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (int)
+        """
+        return self.nb_children(vid)
+
+    def nb_neighbors(self, vid):
+        """Total number of both in and out neighbors of vid
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (int)
+        """
+        return self.nb_in_neighbors(vid) + self.nb_children(vid)
+
+    # ##########################################################
+    #
+    # Edge List Graph Concept
+    #
+    # ##########################################################
+    def edges(self, vid=None):
+        """Iterate on all edges connected to a given vertex.
+
+        If vid is None (default), iterate on all edges in the graph
+
+        args:
+         - vid (int): vertex holdings edges, default (None)
+
+        return:
+         - (iter of int): iterator on edge ids
+        """
+        if vid is None:
+            return (eid for eid, pid in self._parent.iteritems()
+                    if pid is not None)
+        eids = list(self.in_edges(vid))
+        eids.extend(self._children[vid])
+        return iter(eids)
+
+    def nb_edges(self, vid=None):
+        """Number of edges connected to a given vertex.
+
+        If vid is None (default), total number of edges in the graph
+
+        args:
+         - vid (int): vertex holdings edges, default (None)
+
+        return:
+         - (int)
+        """
+        if vid is None:
+            return max(0, len(self._parent) - 1)
+        return self.nb_neighbors(vid)
+
+    def in_edges(self, vid):
+        """Iterate on all edges pointing to a given vertex.
+
+        args:
+         - vid (int): vertex target of edges
+
+        return:
+         - (iter of int): iterator on edge ids
+        """
+        return iter(() if self.parent(vid) is None else (vid,))
+
+    def out_edges(self, vid):
+        """Iterate on all edges away from a given vertex.
+
+        args:
+         - vid (int): vertex source of edges
+
+        return:
+         - (iter of int): iterator on edge ids
+        """
+        return self.children(vid)
+
+    def nb_in_edges(self, vid):
+        """Number of edges pointing to a given vertex.
+
+        args:
+         - vid (int): vertex target of edges
+
+        return:
+         - (int)
+        """
+        return self.nb_in_neighbors(vid)
+
+    def nb_out_edges(self, vid):
+        """Number of edges away from a given vertex.
+
+        args:
+         - vid (int): vertex source of edges
+
+        return:
+         - (int)
+        """
+        return self.nb_children(vid)
+
+    # ##########################################################
+    #
+    # Mutable Tree concept
+    #
+    # ##########################################################
+    def add_vertex(self, vid=None):
+        """Add the root vertex of the tree.
+
+        Use `add_child` to add any other vertex.
+
+        args:
+         - vid (int): id to use. If None (default) will generate a new one
+
+        return:
+         - vid (int): id used for the new vertex
+        """
+        if self._root is not None:
+            raise GraphError("tree already has a root, use add_child")
+        try:
+            vid = self._parent.add(None, vid)
+        except KeyError:
+            raise InvalidVertex(vid)
+        self._children[vid] = []
+        self._depth[vid] = 0
+        self._root = vid
+        self._preorder = None
+        return vid
+
+    def add_child(self, pid, vid=None):
+        """Add a new vertex as the last child of pid.
+
+        If pid is on the last branch of the preorder (the new vertex is
+        the last one in preorder), the preorder is extended in
+        O(depth). Otherwise it will be recomputed in O(n) by the next
+        preorder query.
+
+        args:
+         - pid (int): id of parent vertex
+         - vid (int): id to use. If None (default) will generate a new one
+
+        return:
+         - vid (int): id used for the new vertex
+        """
+        if pid not in self:
+            raise InvalidVertex(pid)
+        try:
+            vid = self._parent.add(pid, vid)
+        except KeyError:
+            raise InvalidVertex(vid)
+        self._children[vid] = []
+        self._children[pid].append(vid)
+        self._depth[vid] = self._depth[pid] + 1
+        if self._preorder is not None:
+            stop = len(self._preorder)
+            if self._tout[pid] == stop:
+                # subtrees of pid and its ancestors end with vid
+                self._preorder.append(vid)
+                self._tin[vid] = stop
+                aid = vid
+                while aid is not None:
+                    self._tout[aid] = stop + 1
+                    aid = self._parent[aid]
+            else:
+                self._preorder = None
+        return vid
+
+    def remove_vertex(self, vid):
+        """Remove a vertex and all its descendants.
+
+        The preorder will be recomputed in O(n) by the next preorder
+        query.
+
+        args:
+         - vid (int): id of vertex to remove
+        """
+        pid = self.parent(vid)
+        if pid is None:
+            self.clear()
+            return
+
+        self._children[pid].remove(vid)
+        front = [vid]
+        while len(front) > 0:
+            cid = front.pop()
+            front.extend(self._children.pop(cid))
+            del self._depth[cid]
+            del self._parent[cid]
+        self._preorder = None
+
+    def clear(self):
+        """Remove all vertices and edges
+        """
+        self._parent.clear()
+        self._children.clear()
+        self._depth.clear()
+        self._root = None
+        self._preorder = None
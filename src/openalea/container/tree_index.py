@@ -0,0 +1,249 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+#       TreeIndex : container package
+#
+#       Distributed under the Cecill-C License.
+#       See accompanying file LICENSE.txt or copy at
+#           http://www.cecill.info/licences/Licence_CeCILL-C_V1-en.html
+#
+"""This module provide an index to answer ancestry queries on tree
+shaped graphs.
+
+The index stores an Euler tour of the tree together with a sparse table
+of minimal depth along the tour. Lowest common ancestor, ancestor, depth
+and subtree queries are then answered in constant time.
+
+The index is rebuilt lazily on the first query following any modification
+of the topology of the graph.
+"""
+
+from graph import GraphError, InvalidVertex
+
+
+class TreeIndex(object):
+    """Ancestry index of the tree reachable from a root vertex.
+
+    Vertices not reachable from root are not indexed.
+    """
+
+    def __init__(self, graph, root):
+        """Constructor
+
+        args:
+         - graph (Graph): graph whose edges are oriented away from root
+         - root (int): id of root vertex
+        """
+        self._graph = graph
+        self._root = root
+        self._revision = None
+
+        self._depth = None
+        self._parent = None
+        self._preorder = None
+        self._tin = None
+        self._tout = None
+        self._first = None
+        self._table = None
+
+        self.rebuild()
+
+    def root(self):
+        """Id of root vertex.
+
+        return:
+         - (int)
+        """
+        return self._root
+
+    def rebuild(self):
+        """Compute the index from the current state of the graph.
+        """
+        graph = self._graph
+        root = self._root
+        if root not in graph:
+            raise InvalidVertex(root)
+
+        def children(vid):
+            return [graph.target(eid) for eid in graph.out_edges(vid)]
+
+        depth = {root: 0}
+        parent = {root: None}
+        preorder = [root]
+        tout = {}
+        euler = [root]
+        first = {root: 0}
+
+        stack = [(root, iter(children(root)))]
+        while len(stack) > 0:
+            vid, child_iter = stack[-1]
+            for cid in child_iter:
+                if cid in depth:
+                    raise GraphError("vertex %s has several parents" % cid)
+                depth[cid] = depth[vid] + 1
+                parent[cid] = vid
+                first[cid] = len(euler)
+                euler.append(cid)
+                preorder.append(cid)
+                stack.append((cid, iter(children(cid))))
+                break
+            else:
+                stack.pop()
+                tout[vid] = len(preorder)
+                if len(stack) > 0:
+                    euler.append(stack[-1][0])
+
+        # sparse table, level k stores the vertex of minimal depth
+        # in euler[i:i + 2 ** k]
+        table = [euler]
+        span = 1
+        while 2 * span <= len(euler):
+            prev = table[-1]
+            level = []
+            for i in xrange(len(euler) - 2 * span + 1):
+                vid1 = prev[i]
+                vid2 = prev[i + span]
+                level.append(vid1 if depth[vid1] <= depth[vid2] else vid2)
+            table.append(level)
+            span *= 2
+
+        self._depth = depth
+        self._parent = parent
+        self._preorder = preorder
+        self._tin = dict((vid, i) for i, vid in enumerate(preorder))
+        self._tout = tout
+        self._first = first
+        self._table = table
+        self._revision = graph._revision
+
+    def is_up_to_date(self):
+        """Test whether the graph has been modified since last build.
+
+        return:
+         - (bool)
+        """
+        return self._revision == self._graph._revision
+
+    def _check(self, vid):
+        """Rebuild index if needed and check that vid is indexed.
+        """
+        if self._revision != self._graph._revision:
+            self.rebuild()
+        try:
+            if vid not in self._depth:
+                raise InvalidVertex(vid)
+        except TypeError:
+            raise InvalidVertex(vid)
+
+    def depth(self, vid):
+        """Number of edges between a vertex and the root.
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (int)
+        """
+        self._check(vid)
+        return self._depth[vid]
+
+    def parent(self, vid):
+        """Parent of a vertex.
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (int): None for the root
+        """
+        self._check(vid)
+        return self._parent[vid]
+
+    def preorder(self):
+        """List of all indexed vertices, each vertex appearing
+        before its children.
+
+        return:
+         - (list of int)
+        """
+        self._check(self._root)
+        return list(self._preorder)
+
+    def subtree_range(self, vid):
+        """Position of the subtree of a vertex in `preorder`.
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (int, int): start and stop position in preorder
+        """
+        self._check(vid)
+        return self._tin[vid], self._tout[vid]
+
+    def subtree(self, vid):
+        """List of vertices in the subtree of vid, vid included.
+
+        args:
+         - vid (int): vertex id
+
+        return:
+         - (list of int): vertices in preorder
+        """
+        start, stop = self.subtree_range(vid)
+        return self._preorder[start:stop]
+
+    def is_ancestor(self, aid, vid):
+        """Test whether aid is on the path between the root and vid.
+
+        A vertex is its own ancestor.
+
+        args:
+         - aid (int): id of potential ancestor
+         - vid (int): vertex id
+
+        return:
+         - (bool)
+        """
+        self._check(vid)
+        start, stop = self.subtree_range(aid)
+        return start <= self._tin[vid] < stop
+
+    def lca(self, vid1, vid2):
+        """Lowest common ancestor of two vertices.
+
+        args:
+         - vid1 (int): vertex id
+         - vid2 (int): vertex id
+
+        return:
+         - (int): id of deepest vertex ancestor of both vid1 and vid2
+        """
+        self._check(vid1)
+        self._check(vid2)
+        ind1 = self._first[vid1]
+        ind2 = self._first[vid2]
+        if ind1 > ind2:
+            ind1, ind2 = ind2, ind1
+
+        level = (ind2 - ind1 + 1).bit_length() - 1
+        row = self._table[level]
+        cand1 = row[ind1]
+        cand2 = row[ind2 - (1 << level) + 1]
+        if self._depth[cand1] <= self._depth[cand2]:
+            return cand1
+        return cand2
+
+    def distance(self, vid1, vid2):
+        """Number of edges on the path between two vertices.
+
+        args:
+         - vid1 (int): vertex id
+         - vid2 (int): vertex id
+
+        return:
+         - (int)
+        """
+        aid = self.lca(vid1, vid2)
+        depth = self._depth
+        return depth[vid1] + depth[vid2] - 2 * depth[aid]
@@ -0,0 +1,249 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+#       Validation : container package
+#
+#       Distributed under the Cecill-C License.
+#       See accompanying file LICENSE.txt or copy at
+#           http://www.cecill.info/licences/Licence_CeCILL-C_V1-en.html
+#
+"""This module provide checks of the structure of a graph.
+
+    - consistency_errors: adjacency of vertices and ends of edges agree
+    - find_cycle, is_acyclic: directed cycles
+    - is_tree, is_forest: rooted trees, edges pointing away from roots
+
+All checks are iterative and run in O(V + E).
+
+Cycle and tree checks accept memoize=True to reuse their result until
+the next modification of the topology through the graph methods (see
+`Graph._revision`). Direct modifications of the vertex or edge storage
+are not seen, hence `consistency_errors`, whose purpose is to detect
+them, is never memoized.
+"""
+
+_GREY = 1
+_BLACK = 2
+
+
+def _memoized(func):
+    """Memoize the result of a check until the graph is modified,
+    if called with memoize=True.
+    """
+    key = func.__name__
+
+    def wrapper(graph, *args, **kwds):
+        if not kwds.pop("memoize", False):
+            return func(graph, *args, **kwds)
+        revision = getattr(graph, "_revision", None)
+        memo = graph.__dict__.get("_validation_memo")
+        if memo is None or memo[0] != revision:
+            memo = (revision, {})
+            graph._validation_memo = memo
+        try:
+            res = memo[1][(key, args)]
+        except KeyError:
+            res = func(graph, *args)
+            memo[1][(key, args)] = res
+        return list(res) if isinstance(res, list) else res
+
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+def consistency_errors(graph):
+    """Check that vertex records and edges agree.
+
+    Each edge must connect existing vertices and be registered in the
+    out edges of its source and the in edges of its target, and no
+    vertex must reference other edges.
+
+    args:
+     - graph (Graph)
+
+    return:
+     - (list of str): description of each problem, empty if none
+    """
+    errors = []
+    vertices = graph._vertices
+    edges = graph._edges
+    nb_in = 0
+    nb_out = 0
+    for vid, record in vertices.iteritems():
+        for eid in record.in_edges():
+            nb_in += 1
+            edge = edges.get(eid)
+            if edge is None:
+                errors.append("vertex %s references unknown in edge %s"
+                              % (vid, eid))
+            elif edge[1] != vid:
+                errors.append("in edge %s of vertex %s targets %s"
+                              % (eid, vid, edge[1]))
+        for eid in record.out_edges():
+            nb_out += 1
+            edge = edges.get(eid)
+            if edge is None:
+                errors.append("vertex %s references unknown out edge %s"
+                              % (vid, eid))
+            elif edge[0] != vid:
+                errors.append("out edge %s of vertex %s starts at %s"
+                              % (eid, vid, edge[0]))
+
+    nb_edges = 0
+    for eid, (sid, tid) in edges.iteritems():
+        nb_edges += 1
+        for vid in (sid, tid):
+            if vid not in vertices:
+                errors.append("edge %s references unknown vertex %s"
+                              % (eid, vid))
+
+    # with the checks above, equal counts ensure each edge
+    # is referenced exactly once by each of its ends
+    if nb_in != nb_edges:
+        errors.append("%d in edges registered for %d edges"
+                      % (nb_in, nb_edges))
+    if nb_out != nb_edges:
+        errors.append("%d out edges registered for %d edges"
+                      % (nb_out, nb_edges))
+
+    return errors
+
+
+@_memoized
+def find_cycle(graph):
+    """Find a directed cycle in the graph.
+
+    Iterative depth first search, vertices are marked grey while on the
+    stack and black once all their descendants have been visited.
+
+    args:
+     - graph (Graph)
+     - memoize (bool): reuse the result until the graph is modified,
+                       default False
+
+    return:
+     - (list of eid): edges of a cycle, in order, or None if the graph
+                      is acyclic
+    """
+    vertices = graph._vertices
+    edges = graph._edges
+    colour = {}
+    for start in vertices:
+        if start in colour:
+            continue
+        colour[start] = _GREY
+        depth = {start: 0}
+        stack = [(start, iter(vertices[start].out_edges()))]
+        path = []  # path[i] leads from stack[i] to stack[i + 1]
+        while stack:
+            vid, eids = stack[-1]
+            for eid in eids:
+                tid = edges[eid][1]
+                state = colour.get(tid)
+                if state is None:
+                    colour[tid] = _GREY
+                    depth[tid] = len(stack)
+                    stack.append((tid, iter(vertices[tid].out_edges())))
+                    path.append(eid)
+                    break
+                elif state == _GREY:
+                    return path[depth[tid]:] + [eid]
+            else:
+                colour[vid] = _BLACK
+                stack.pop()
+                if path:
+                    path.pop()
+
+    return None
+
+
+def is_acyclic(graph, memoize=False):
+    """Test whether the graph contains no directed cycle.
+
+    args:
+     - graph (Graph)
+     - memoize (bool): reuse the result until the graph is modified,
+                       default False
+
+    return:
+     - (bool)
+    """
+    return find_cycle(graph, memoize=memoize) is None
+
+
+def _nb_reachable(graph, roots):
+    """Number of vertices reachable from roots, following edges.
+    """
+    vertices = graph._vertices
+    edges = graph._edges
+    seen = set(roots)
+    front = list(roots)
+    while front:
+        vid = front.pop()
+        for eid in vertices[vid].out_edges():
+            tid = edges[eid][1]
+            if tid not in seen:
+                seen.add(tid)
+                front.append(tid)
+    return len(seen)
+
+
+def _roots(graph):
+    """Vertices without in edges, or None if a vertex has more than one
+    in edge.
+    """
+    roots = []
+    for vid, record in graph._vertices.iteritems():
+        nb = record.nb_in_edges()
+        if nb == 0:
+            roots.append(vid)
+        elif nb > 1:
+            return None
+    return roots
+
+
+@_memoized
+def is_forest(graph):
+    """Test whether the graph is a set of trees.
+
+    Each vertex has at most one in edge and each vertex can be reached
+    from a vertex without in edges.
+
+    args:
+     - graph (Graph)
+     - memoize (bool): reuse the result until the graph is modified,
+                       default False
+
+    return:
+     - (bool)
+    """
+    roots = _roots(graph)
+    if roots is None:
+        return False
+    # without cycles, every vertex with a parent descends from a root
+    return _nb_reachable(graph, roots) == len(graph._vertices)
+
+
+@_memoized
+def is_tree(graph, root=None):
+    """Test whether the graph is a tree.
+
+    The root is the only vertex without in edges, each other vertex has
+    exactly one in edge and can be reached from the root.
+
+    args:
+     - graph (Graph)
+     - root (vid): expected root, if None (default) any root is accepted
+     - memoize (bool): reuse the result until the graph is modified,
+                       default False
+
+    return:
+     - (bool)
+    """
+    roots = _roots(graph)
+    if roots is None or len(roots) != 1:
+        return False
+    if root is not None and roots[0] != root:
+        return False
+    return _nb_reachable(graph, roots) == len(graph._vertices)
@@ -0,0 +1,199 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+#       VertexRecord : container package
+#
+#       Distributed under the Cecill-C License.
+#       See accompanying file LICENSE.txt or copy at
+#           http://www.cecill.info/licences/Licence_CeCILL-C_V1-en.html
+#
+"""This module provide a compact storage for the edges attached to a vertex.
+
+Each side (in and out) of a record is stored as:
+
+    - None if no edge is attached
+    - a tuple of eids while the number of edges is small
+    - a set of eids once it grows past INLINE_MAX
+"""
+
+INLINE_MAX = 8
+
+
+def _add(store, eid):
+    """Return a store containing eid in addition to the content of store.
+    """
+    if store is None:
+        return (eid,)
+    if type(store) is tuple:
+        if eid in store:
+            return store
+        if len(store) < INLINE_MAX:
+            return store + (eid,)
+        store = set(store)
+    store.add(eid)
+    return store
+
+
+def _remove(store, eid):
+    """Return a store with the content of store except eid.
+
+    Raise KeyError if eid is not in store.
+    """
+    if store is None:
+        raise KeyError(eid)
+    if type(store) is tuple:
+        if eid not in store:
+            raise KeyError(eid)
+        if len(store) == 1:
+            return None
+        return tuple(elm for elm in store if elm != eid)
+    store.remove(eid)
+    if len(store) <= INLINE_MAX // 2:
+        return tuple(store) if len(store) > 0 else None
+    return store
+
+
+def _from_list(eids):
+    """Return a store containing distinct eids.
+    """
+    if len(eids) == 0:
+        return None
+    if len(eids) <= INLINE_MAX:
+        return tuple(eids)
+    return set(eids)
+
+
+def _copy(store):
+    """Return a store that will not be affected by modifications of store.
+    """
+    if type(store) is set:
+        return set(store)
+    return store
+
+
+class VertexRecord(object):
+    """Ids of the edges entering and leaving a vertex.
+    """
+    __slots__ = ("_in", "_out")
+
+    def __init__(self):
+        self._in = None
+        self._out = None
+
+    def __getstate__(self):
+        return self._in, self._out
+
+    def __setstate__(self, state):
+        self._in, self._out = state
+
+    def in_edges(self):
+        """Edges pointing to this vertex.
+
+        Returned container must not be modified.
+
+        return:
+         - (iter of int): tuple or set of eids
+        """
+        store = self._in
+        return () if store is None else store
+
+    def out_edges(self):
+        """Edges away from this vertex.
+
+        Returned container must not be modified.
+
+        return:
+         - (iter of int): tuple or set of eids
+        """
+        store = self._out
+        return () if store is None else store
+
+    def nb_in_edges(self):
+        """Number of edges pointing to this vertex.
+
+        return:
+         - (int)
+        """
+        store = self._in
+        return 0 if store is None else len(store)
+
+    def nb_out_edges(self):
+        """Number of edges away from this vertex.
+
+        return:
+         - (int)
+        """
+        store = self._out
+        return 0 if store is None else len(store)
+
+    def add_in_edge(self, eid):
+        """Register an edge pointing to this vertex.
+
+        args:
+         - eid (int): id of edge
+        """
+        self._in = _add(self._in, eid)
+
+    def add_out_edge(self, eid):
+        """Register an edge away from this vertex.
+
+        args:
+         - eid (int): id of edge
+        """
+        self._out = _add(self._out, eid)
+
+    def remove_in_edge(self, eid):
+        """Forget an edge pointing to this vertex.
+
+        Raise KeyError if edge is not registered.
+
+        args:
+         - eid (int): id of edge
+        """
+        self._in = _remove(self._in, eid)
+
+    def remove_out_edge(self, eid):
+        """Forget an edge away from this vertex.
+
+        Raise KeyError if edge is not registered.
+
+        args:
+         - eid (int): id of edge
+        """
+        self._out = _remove(self._out, eid)
+
+    def clear(self):
+        """Forget all edges.
+        """
+        self._in = None
+        self._out = None
+
+    @staticmethod
+    def from_edges(in_eids, out_eids):
+        """Create a record with the given edges.
+
+        args:
+         - in_eids (list of int): distinct ids of edges pointing to vertex
+         - out_eids (list of int): distinct ids of edges away from vertex
+
+        return:
+         - (VertexRecord)
+        """
+        record = VertexRecord()
+        record._in = _from_list(in_eids)
+        record._out = _from_list(out_eids)
+        return record
+
+    def copy(self):
+        """Independent copy of this record.
+
+        Small sides are immutable tuples shared with the copy, only sets
+        are duplicated.
+
+        return:
+         - (VertexRecord)
+        """
+        record = VertexRecord()
+        record._in = _copy(self._in)
+        record._out = _copy(self._out)
+        return record
@@ -1,3 +1,6 @@
+from openalea.container.graph import Graph
+
+
 
 def setup_package():
     """Some code executed once when test are loaded.
@@ -9,3 +12,14 @@ def teardown_package():
     """Some code executed once after tests have been played.
     """
     print("teardown")
+
+
+def chain_graph(graph_type=Graph):
+    """Graph of 5 vertices 0 to 4 with an edge i from i to i + 1.
+    """
+    g = graph_type()
+    for i in range(5):
+        g.add_vertex(i)
+    for i in range(4):
+        g.add_edge(i, i + 1, i)
+    return g
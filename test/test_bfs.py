@@ -0,0 +1,68 @@
+import numpy as np
+from nose.tools import assert_raises
+
+from openalea.container.bfs import (bfs_distance_matrix, bfs_distances,
+                                    eccentricity)
+from openalea.container.csr_graph import CSRGraph
+from openalea.container.graph import Graph
+
+
+def build_tree():
+    # 0 -> 1 -> 3, 0 -> 2 -> 4 -> 5, 6 alone
+    g = Graph()
+    for vid in range(7):
+        g.add_vertex(vid * 10)
+    for sid, tid in [(0, 1), (0, 2), (1, 3), (2, 4), (4, 5)]:
+        g.add_edge(sid * 10, tid * 10)
+    return g
+
+
+def naive_distances(graph, source):
+    dist = {source: 0}
+    front = [source]
+    while front:
+        new_front = []
+        for vid in front:
+            for nid in graph.out_neighbors(vid):
+                if nid not in dist:
+                    dist[nid] = dist[vid] + 1
+                    new_front.append(nid)
+        front = new_front
+    return dist
+
+
+def test_bfs_distances():
+    csr = CSRGraph(build_tree())
+    assert bfs_distances(csr, [0]).tolist() == [0, 1, 1, 2, 2, 3, -1]
+    assert bfs_distances(csr, [0], max_depth=1).tolist() == [0, 1, 1, -1,
+                                                             -1, -1, -1]
+
+    # distance to the nearest leaf
+    leaves = np.flatnonzero(csr.out_degree() == 0)
+    assert bfs_distances(csr, leaves, "in").tolist() == [2, 1, 2, 0, 1, 0, 0]
+    assert bfs_distances(csr, [3], "both").tolist() == [2, 1, 3, 0,
+                                                        4, 5, -1]
+    assert_raises(UserWarning, lambda: bfs_distances(csr, [0], "up"))
+    assert_raises(IndexError, lambda: bfs_distances(csr, [7]))
+
+
+def test_bfs_distance_matrix():
+    g = build_tree()
+    csr = CSRGraph(g)
+    dist = bfs_distance_matrix(csr)
+    assert dist.shape == (7, 7)
+    for pos, vid in enumerate(csr.vids.tolist()):
+        expected = naive_distances(g, vid)
+        for npos, nid in enumerate(csr.vids.tolist()):
+            assert dist[pos, npos] == expected.get(nid, -1)
+
+    dist = bfs_distance_matrix(csr, [2, 0], max_depth=1)
+    assert dist.tolist() == [[-1, -1, 0, -1, 1, -1, -1],
+                             [0, 1, 1, -1, -1, -1, -1]]
+
+
+def test_eccentricity():
+    csr = CSRGraph(build_tree())
+    assert eccentricity(csr).tolist() == [3, 4, 3, 5, 4, 5, 0]
+    assert eccentricity(csr, [0, 5], chunk=1).tolist() == [3, 5]
+    assert eccentricity(csr, [0], "out").tolist() == [3]
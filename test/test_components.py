@@ -0,0 +1,83 @@
+from nose.tools import assert_raises
+
+from openalea.container.components import ComponentTracker
+from openalea.container.graph import Graph, InvalidVertex
+
+
+def build_graph():
+    g = Graph()
+    for i in range(8):
+        g.add_vertex(i)
+    # two chains 0-1-2-3 and 4-5-6, 7 alone
+    for sid, tid in [(0, 1), (2, 1), (2, 3), (4, 5), (5, 6)]:
+        g.add_edge(sid, tid)
+    return g
+
+
+def sorted_components(tracker):
+    return sorted(sorted(vids) for vids in tracker.components())
+
+
+def test_initial_components():
+    g = build_graph()
+    tracker = ComponentTracker(g)
+    assert tracker.nb_components() == 3
+    assert sorted_components(tracker) == [[0, 1, 2, 3], [4, 5, 6], [7]]
+    assert tracker.same_component(0, 3)
+    assert not tracker.same_component(0, 4)
+    assert sorted(tracker.component_vertices(5)) == [4, 5, 6]
+    assert_raises(InvalidVertex, lambda: tracker.component(10))
+
+
+def test_insertions():
+    g = build_graph()
+    tracker = g.track_components()
+    assert g.track_components() is tracker
+
+    g.add_edge(7, 3)
+    assert tracker.nb_components() == 2
+    assert tracker.same_component(0, 7)
+    vid = g.add_vertex()
+    assert tracker.nb_components() == 3
+    g.add_edge(6, vid)
+    g.add_edge(vid, 0)
+    assert tracker.nb_components() == 1
+    assert tracker.same_component(4, 3)
+
+
+def test_removals():
+    g = build_graph()
+    tracker = g.track_components()
+
+    eid = g.edge(2, 3)
+    g.remove_edge(eid)
+    assert tracker.nb_components() == 4
+    assert not tracker.same_component(0, 3)
+
+    g.remove_vertex(5)
+    assert tracker.same_component(0, 2)
+    assert not tracker.same_component(4, 6)
+    assert sorted_components(tracker) == [[0, 1, 2], [3], [4], [6], [7]]
+
+    # reuse id of a removed vertex before queries
+    g.remove_vertex(1)
+    g.add_vertex(1)
+    assert tracker.same_component(1, 1)
+    assert not tracker.same_component(0, 1)
+    assert tracker.nb_components() == 7
+
+    g.clear_edges()
+    assert tracker.nb_components() == g.nb_vertices()
+
+    g.clear()
+    assert tracker.nb_components() == 0
+
+
+def test_detach():
+    g = build_graph()
+    tracker = g.track_components()
+    tracker.detach()
+    assert tracker not in g._observers
+    g.add_edge(3, 4)
+    assert g.track_components() is not tracker
+    assert g.track_components().nb_components() == 2
@@ -0,0 +1,60 @@
+import numpy as np
+from nose.tools import assert_raises
+
+from openalea.container.graph import Graph, InvalidVertex
+from openalea.container.csr_graph import CSRGraph
+
+
+def build_graph():
+    g = Graph()
+    for vid in (0, 3, 5, 8):
+        g.add_vertex(vid)
+    g.add_edge(0, 3, 10)
+    g.add_edge(0, 5, 11)
+    g.add_edge(5, 8, 12)
+    g.add_edge(0, 3, 13)
+    return g
+
+
+def test_csr_graph_layout():
+    csr = CSRGraph(build_graph())
+    assert csr.nb_vertices() == 4
+    assert len(csr) == 4
+    assert csr.nb_edges() == 4
+    assert csr.vids.tolist() == [0, 3, 5, 8]
+    assert csr.out_indptr.tolist() == [0, 3, 3, 4, 4]
+    assert csr.out_indices.tolist() == [1, 1, 2, 3]
+    assert sorted(csr.out_eids[:2].tolist()) == [10, 13]
+    assert csr.in_indptr.tolist() == [0, 0, 2, 3, 4]
+    assert csr.out_degree().tolist() == [3, 0, 1, 0]
+    assert csr.in_degree().tolist() == [0, 2, 1, 1]
+    assert sorted(csr.out_neighbors(0).tolist()) == [3, 3, 5]
+    assert csr.in_neighbors(8).tolist() == [5]
+    assert_raises(InvalidVertex, lambda: csr.position(1))
+
+
+def test_csr_graph_vertex_order():
+    g = build_graph()
+    csr = CSRGraph(g, [8, 5, 3, 0])
+    assert csr.position(8) == 0
+    assert csr.positions([0, 5]).tolist() == [3, 1]
+    assert csr.out_neighbors(5).tolist() == [8]
+    assert_raises(ValueError, lambda: CSRGraph(g, [0, 3]))
+
+
+def test_csr_graph_bfs():
+    csr = CSRGraph(build_graph())
+    assert csr.bfs(0) == [0, 1, 2, 3]
+    assert csr.bfs(3, "in") == [3, 2, 0]
+
+
+def test_csr_graph_neighbor_reduce():
+    csr = CSRGraph(build_graph())
+    values = np.array([1, 2, 3, 4])
+    assert csr.neighbor_reduce(values).tolist() == [7, 0, 4, 0]
+    assert csr.neighbor_reduce(values, "max", fill=-1).tolist() == [3, -1,
+                                                                    4, -1]
+    assert csr.neighbor_reduce(values, "min", "in").tolist() == [0, 1, 1, 3]
+    assert_raises(UserWarning, lambda: csr.neighbor_reduce(values, "toto"))
+    empty = CSRGraph(Graph())
+    assert len(empty.neighbor_reduce(np.array([]))) == 0
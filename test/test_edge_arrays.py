@@ -0,0 +1,85 @@
+import numpy as np
+from nose.tools import assert_raises
+
+from openalea.container.graph import Graph, InvalidEdge, InvalidVertex
+from openalea.container.property_graph import PropertyGraph
+from openalea.container.vertex_record import INLINE_MAX
+
+
+def test_from_arrays_default_ids():
+    g = Graph.from_arrays(np.array([0, 0, 2, 7]), np.array([2, 2, 5, 0]))
+    assert sorted(g.vertices()) == [0, 2, 5, 7]
+    assert sorted(g.edges()) == [0, 1, 2, 3]
+    assert g.edge_vertices(3) == (7, 0)
+    assert sorted(g.out_edges(0)) == [0, 1]
+    assert sorted(g.in_edges(0)) == [3]
+    assert g.nb_edges(2) == 3
+    assert type(g.source(0)) is int
+
+    assert g.add_vertex() == 1
+    assert g.add_edge(1, 5) == 4
+
+
+def test_from_arrays_explicit_ids():
+    g = Graph.from_arrays([4, 8], [8, 6], vids=[6, 4, 8, 10],
+                          eids=[3, 10], storage="array")
+    assert sorted(g.vertices()) == [4, 6, 8, 10]
+    assert g.edge_vertices(10) == (8, 6)
+    assert list(g.out_edges(4)) == [3]
+    assert g.nb_edges(10) == 0
+    assert g.get_storage_type() == "array"
+
+
+def test_from_arrays_match_add_edge():
+    nb = 50
+    rnd = np.random.RandomState(0)
+    sources = rnd.randint(0, nb, 10 * nb)
+    targets = rnd.randint(0, nb, 10 * nb)
+    g = Graph.from_arrays(sources, targets, vids=np.arange(nb))
+    ref = Graph()
+    for vid in range(nb):
+        ref.add_vertex(vid)
+    for sid, tid in zip(sources.tolist(), targets.tolist()):
+        ref.add_edge(sid, tid)
+
+    for vid in range(nb):
+        assert sorted(g.in_edges(vid)) == sorted(ref.in_edges(vid))
+        assert sorted(g.out_edges(vid)) == sorted(ref.out_edges(vid))
+    hub = max(range(nb), key=g.nb_out_edges)
+    assert g.nb_out_edges(hub) > INLINE_MAX
+    g.remove_vertex(hub)
+    assert not any(g.source(eid) == hub for eid in g.edges())
+
+
+def test_from_arrays_validation():
+    assert_raises(ValueError, lambda: Graph.from_arrays([0, 1], [1]))
+    assert_raises(ValueError, lambda: Graph.from_arrays([0.5], [1]))
+    assert_raises(InvalidVertex, lambda: Graph.from_arrays([0, 2], [1, 1],
+                                                           vids=[0, 1]))
+    assert_raises(InvalidVertex, lambda: Graph.from_arrays([0], [1],
+                                                           vids=[0, 1, 1]))
+    assert_raises(InvalidVertex, lambda: Graph.from_arrays([-1], [1]))
+    assert_raises(InvalidEdge, lambda: Graph.from_arrays([0, 1], [1, 0],
+                                                         eids=[3, 3]))
+
+    g = Graph.from_arrays([], [])
+    assert g.nb_vertices() == 0
+
+
+def test_pg_from_arrays():
+    g = PropertyGraph.from_arrays([4, 8], [8, 6], vids=[6, 4, 8],
+                                  eids=[3, 10],
+                                  vertex_props={"name": ['a', 'b', 'c']},
+                                  edge_props={"weight": np.array([1., 2.])})
+    assert dict(g.vertex_property("name")) == {6: 'a', 4: 'b', 8: 'c'}
+    assert dict(g.edge_property("weight")) == {3: 1., 10: 2.}
+    assert type(g.edge_property("weight")[3]) is float
+
+    g = PropertyGraph.from_arrays([2, 0], [0, 1],
+                                  vertex_props={"size": [5, 6, 7]},
+                                  edge_props={"label": ['x', 'y']})
+    assert dict(g.vertex_property("size")) == {0: 5, 1: 6, 2: 7}
+    assert dict(g.edge_property("label")) == {0: 'x', 1: 'y'}
+    assert_raises(ValueError,
+                  lambda: PropertyGraph.from_arrays([0], [1],
+                                                    vertex_props={"a": [1]}))
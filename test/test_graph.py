@@ -1,5 +1,6 @@
 from nose.tools import assert_raises, with_setup
-from openalea.container.graph import Graph, InvalidVertex, InvalidEdge
+from openalea.container.graph import (Graph, GraphObserver, InvalidVertex,
+                                      InvalidEdge)
 
 
 g = Graph()
@@ -245,6 +246,16 @@ def test_extend():
     assert len(trans_eid) == 9
 
 
+@with_setup(setup_func, teardown_func)
+def test_sub_graph():
+    sg = g.sub_graph([2, 3, 4, 7])
+    assert sorted(sg.vertices()) == [2, 3, 4, 7]
+    assert sorted(sg.edges()) == [2, 3]
+    assert sg.edge_vertices(3) == (3, 4)
+    assert g.nb_vertices() == 10
+    assert_raises(InvalidVertex, lambda: g.sub_graph([2, 30]))
+
+
 @with_setup(setup_func, teardown_func)
 def test_graph_can_be_initialized_with_another_graph():
     ng = Graph(g)
@@ -284,3 +295,100 @@ def test_graph_do_not_accept_invalid_vertices():
     for vid in ('a', -1, 100):
         assert_raises(InvalidVertex, lambda: tuple(g.edges(vid)))
         assert_raises(InvalidVertex, lambda: g.nb_edges(vid))
+
+
+# ##########################################################
+#
+# Compact Graph concept
+#
+# ##########################################################
+def build_sparse_graph():
+    sg = Graph()
+    for vid in (3, 10, 7, 20):
+        sg.add_vertex(vid)
+    sg.add_edge(3, 10, 5)
+    sg.add_edge(10, 20, 1)
+    sg.add_edge(3, 7, 12)
+    return sg
+
+
+def test_compact_insertion_order():
+    sg = build_sparse_graph()
+    trans_vid, trans_eid = sg.compact()
+    assert trans_vid == {3: 0, 7: 1, 10: 2, 20: 3}
+    assert sorted(sg.vertices()) == range(4)
+    assert sorted(sg.edges()) == range(3)
+    assert sg.edge_vertices(trans_eid[5]) == (0, 2)
+    assert sg.edge_vertices(trans_eid[1]) == (2, 3)
+    assert sg.edge_vertices(trans_eid[12]) == (0, 1)
+    assert trans_eid[12] < trans_eid[5] < trans_eid[1]
+    assert sg.add_vertex() == 4
+    assert sg.add_edge(0, 4) == 3
+
+
+def test_compact_bfs_order():
+    sg = build_sparse_graph()
+    trans_vid, trans_eid = sg.compact("bfs")
+    assert trans_vid == {3: 0, 7: 1, 10: 2, 20: 3}
+    sg = Graph()
+    for vid in range(5):
+        sg.add_vertex(vid)
+    sg.add_edge(0, 4)
+    sg.add_edge(3, 0)
+    sg.add_edge(4, 1)
+    trans_vid, trans_eid = sg.compact("bfs")
+    assert trans_vid == {0: 0, 3: 1, 4: 2, 1: 3, 2: 4}
+    assert sorted(sg.edge_vertices(eid) for eid in sg.edges()) == [(0, 2),
+                                                                   (1, 0),
+                                                                   (2, 3)]
+
+
+def test_compact_degree_order():
+    sg = build_sparse_graph()
+    trans_vid, trans_eid = sg.compact("degree")
+    assert trans_vid[3] == 0
+    assert trans_vid[10] == 1
+    assert sg.nb_edges() == 3
+    assert_raises(UserWarning, lambda: sg.compact("toto"))
+
+
+def test_graph_array_storage():
+    ag = Graph(storage="array")
+    for i in range(5):
+        ag.add_vertex()
+    for i in range(4):
+        ag.add_edge(i, i + 1)
+    ag.remove_vertex(2)
+    assert ag.get_storage_type() == "array"
+    assert sorted(ag.vertices()) == [0, 1, 3, 4]
+    assert sorted(ag.edges()) == [0, 3]
+    assert ag.add_vertex() == 2
+    assert ag.sub_graph([0, 1]).get_storage_type() == "array"
+    assert_raises(UserWarning, lambda: Graph(storage="toto"))
+
+
+def test_graph_observers():
+    class Recorder(GraphObserver):
+        def __init__(self):
+            self.events = []
+
+        def vertex_added(self, vid):
+            self.events.append(("v+", vid))
+
+        def edge_removing(self, eid, sid, tid):
+            self.events.append(("e-", eid, g.has_edge(eid)))
+
+        def reset(self):
+            self.events.append(("reset",))
+
+    g = Graph()
+    rec = Recorder()
+    g.add_observer(rec)
+    g.add_vertex(0)
+    g.add_vertex(1)
+    g.add_edge(0, 1, 5)
+    g.remove_vertex(1)
+    g.clear()
+    g.remove_observer(rec)
+    g.add_vertex(0)
+    assert rec.events == [("v+", 0), ("v+", 1), ("e-", 5, True), ("reset",)]
@@ -0,0 +1,146 @@
+from openalea.container.graph import Graph
+from openalea.container.graph_hash import (diff, graph_equal,
+                                           is_hash_tracked, structural_hash,
+                                           untrack_hash)
+from openalea.container.property_graph import PropertyGraph
+from openalea.container.property_map import PropertyMap
+
+from . import chain_graph
+
+
+def build_property_graph():
+    g = chain_graph(PropertyGraph)
+    g.add_vertex_property("size", PropertyMap((i, i * 2) for i in range(5)))
+    g.add_edge_property("weight", PropertyMap((i, 1.) for i in range(4)))
+    g.add_graph_property("name", "chain")
+    return g
+
+
+def test_hash_does_not_depend_on_insertion_order():
+    g1 = chain_graph()
+    g2 = Graph()
+    for i in reversed(range(5)):
+        g2.add_vertex(i)
+    for i in reversed(range(4)):
+        g2.add_edge(i, i + 1, i)
+
+    assert structural_hash(g1) == structural_hash(g2)
+    assert structural_hash(g1) != structural_hash(Graph())
+
+
+def test_hash_is_maintained_incrementally():
+    g = build_property_graph()
+    h0 = structural_hash(g)
+    assert is_hash_tracked(g)
+
+    g.add_edge(4, 0, 10)
+    g.vertex_property("size")[2] = 5
+    g.remove_vertex(3)
+    g.add_vertex_property("color", {0: [1, 2]})
+    g.add_graph_property("age", 3)
+    h1 = structural_hash(g)
+    assert h1 != h0
+
+    untrack_hash(g)
+    assert not is_hash_tracked(g)
+    assert structural_hash(g) == h1
+
+    g.remove_graph_property("age")
+    g.remove_vertex_property("color")
+    g.add_vertex(3)
+    g.add_edge(2, 3, 2)
+    g.add_edge(3, 4, 3)
+    g.remove_edge(10)
+    g.vertex_property("size").update({2: 4, 3: 6})
+    g.edge_property("weight").update({2: 1., 3: 1.})
+    assert structural_hash(g) == h0
+
+
+def test_hash_after_global_modifications():
+    g = build_property_graph()
+    structural_hash(g)
+    g.remove_vertex(0)
+    g.compact()
+    h = structural_hash(g)
+    untrack_hash(g)
+    assert structural_hash(g) == h
+
+    g.clear()
+    empty = PropertyGraph()
+    empty.add_vertex_property("size")
+    empty.add_edge_property("weight")
+    assert structural_hash(g) == structural_hash(empty)
+
+
+def test_hash_see_writes_to_plain_dict_properties():
+    g1 = chain_graph(PropertyGraph)
+    g1.add_vertex_property("size", {0: 1})
+    g2 = chain_graph(PropertyGraph)
+    g2.add_vertex_property("size", {0: 1})
+    assert structural_hash(g1) == structural_hash(g2)
+
+    g1.vertex_property("size")[0] = 2
+    assert structural_hash(g1) != structural_hash(g2)
+    assert not graph_equal(g1, g2)
+
+    h = structural_hash(g1)
+    untrack_hash(g1)
+    assert structural_hash(g1) == h
+    g1.remove_vertex_property("size")
+    g2.remove_vertex_property("size")
+    assert structural_hash(g1) == structural_hash(g2)
+
+
+def test_diff():
+    g1 = build_property_graph()
+    g2 = build_property_graph()
+    assert diff(g1, g2).is_empty()
+    assert graph_equal(g1, g2)
+
+    g2.remove_vertex(0)
+    g2.add_vertex(7)
+    g2.add_edge(7, 4, 0)
+    g2.vertex_property("size")[4] = 0
+    g2.add_edge_property("length", default=1.)
+    g2.add_graph_property("age", 3)
+
+    d = diff(g1, g2)
+    assert not d.is_empty()
+    assert d.added_vertices == set([7])
+    assert d.removed_vertices == set([0])
+    assert d.added_edges == {0: (7, 4)}
+    assert d.removed_edges == {0: (0, 1)}
+    assert d.vertex_properties == {"size": set([0, 4])}
+    assert d.edge_properties == {"weight": set([0]), "length": set()}
+    assert d.graph_properties == set(["age"])
+    assert not graph_equal(g1, g2)
+
+    structural_hash(g1)
+    structural_hash(g2)
+    assert not graph_equal(g1, g2)
+
+
+def test_diff_with_snapshot():
+    g = build_property_graph()
+    snap = g.snapshot()
+    g.remove_edge(3)
+    g.vertex_property("size")[1] = [1]
+
+    d = diff(snap, g)
+    assert d.removed_edges == {3: (3, 4)}
+    assert d.vertex_properties == {"size": set([1])}
+    assert d.edge_properties == {"weight": set([3])}
+
+
+def test_hash_tracking_independent_of_other_trackers():
+    g = chain_graph(PropertyGraph)
+    structural_hash(g)
+    tracker = g.track_components()
+    untrack_hash(g)
+    g.add_edge(0, 4)
+    assert tracker.same_component(0, 4)
+    structural_hash(g)
+    tracker.detach()
+    g.add_vertex(10)
+    g.add_graph_property("name", "g")
+    assert structural_hash(g) == structural_hash(g.sub_graph(g.vertices()))
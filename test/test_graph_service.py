@@ -0,0 +1,129 @@
+import os
+from multiprocessing import AuthenticationError
+from tempfile import mkdtemp
+from threading import Thread
+
+from nose.tools import assert_raises
+
+from openalea.container.graph import InvalidVertex
+from openalea.container.property_graph import PropertyGraph
+from openalea.container.graph_service import (GraphService,
+                                              GraphServer,
+                                              GraphClient)
+
+
+def build_graph():
+    g = PropertyGraph()
+    for i in range(10):
+        g.add_vertex(i)
+    for i in range(9):
+        g.add_edge(i, i + 1, i)
+    g.add_vertex_property("name", dict((i, 'v%d' % i) for i in range(10)))
+    g.add_edge_property("weight", dict((i, i * 0.5) for i in range(9)))
+    return g
+
+
+def test_service_batched_queries():
+    with GraphService(build_graph()) as service:
+        assert service.out_neighbors([0, 3]) == {0: [1], 3: [4]}
+        assert service.in_neighbors([0]) == {0: []}
+        assert sorted(service.neighbors([5])[5]) == [4, 6]
+        assert service.edge_vertices([2]) == {2: (2, 3)}
+        assert service.vertex_property("name", [1, 2]) == {1: 'v1', 2: 'v2'}
+        assert service.edge_property("weight", [4]) == {4: 2.}
+
+        sg = service.sub_graph([2, 3, 7])
+        assert sorted(sg.edges()) == [2]
+        assert dict(sg.vertex_property("name")) == {2: 'v2', 3: 'v3',
+                                                    7: 'v7'}
+
+        assert_raises(InvalidVertex, lambda: service.neighbors([0, 20]))
+        assert_raises(UserWarning, lambda: service.query("toto", [0]))
+
+    assert not service.is_running()
+    assert_raises(RuntimeError, lambda: service.neighbors([0]))
+
+
+def test_service_stop_when_not_running():
+    service = GraphService(build_graph())
+    service.stop()
+    service.stop()
+    with service:
+        assert service.out_neighbors([0]) == {0: [1]}
+    service.stop()
+
+
+def test_service_coalesce_concurrent_queries():
+    service = GraphService(build_graph())
+    service.start()
+    pendings = [service.submit("out_neighbors", [0, 1, 2])
+                for i in range(20)]
+    service.stop()
+    for pending in pendings:
+        assert pending.done()
+        assert pending.wait() == {0: [1], 1: [2], 2: [3]}
+    assert service.nb_queries == 20
+    assert service.nb_evaluations < 20 * 3
+
+
+def test_client_server():
+    service = GraphService(build_graph(), nb_workers=2)
+    service.start()
+    server = GraphServer(service, authkey="secret")
+    server.start()
+
+    results = []
+
+    def run_client():
+        with GraphClient(server.address, authkey="secret") as client:
+            results.append(client.out_neighbors(range(9)))
+            results.append(client.vertex_property("name", [4]))
+            assert_raises(KeyError, lambda: client.edge_property("weight",
+                                                                 [20]))
+            results.append(sorted(client.sub_graph([0, 1]).edges()))
+
+    threads = [Thread(target=run_client) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    server.close()
+    service.stop()
+
+    assert len(results) == 12
+    assert results[0] == dict((i, [i + 1]) for i in range(9))
+    assert results.count({4: 'v4'}) == 4
+    assert results.count([0]) == 4
+
+
+def test_server_requires_authentication():
+    service = GraphService(build_graph())
+    service.start()
+    assert_raises(ValueError, lambda: GraphServer(service, authkey=None))
+    server = GraphServer(service)
+    server.start()
+    assert len(server.authkey) == 32
+
+    assert_raises(ValueError, lambda: GraphClient(server.address, None))
+    assert_raises(AuthenticationError,
+                  lambda: GraphClient(server.address, "wrong"))
+    with GraphClient(server.address, server.authkey) as client:
+        assert client.neighbors([0]) == {0: [1]}
+
+    server.close()
+    service.stop()
+
+
+def test_client_server_unix_socket():
+    tmp_dir = mkdtemp()
+    service = GraphService(build_graph())
+    service.start()
+    server = GraphServer(service, os.path.join(tmp_dir, "graph.sock"))
+    server.start()
+    with GraphClient(server.address, server.authkey) as client:
+        assert client.neighbors([0]) == {0: [1]}
+
+    server.close()
+    service.stop()
+    os.rmdir(tmp_dir)
@@ -1,3 +1,5 @@
+from itertools import product
+
 from nose.tools import assert_raises
 
 from openalea.container.grid import Grid
@@ -69,3 +71,102 @@ def test_grid_raise_error_if_coord_out_of_bound():
     assert_raises(IndexError, lambda: g.index((0, 7)))
     assert_raises(IndexError, lambda: g.index((9, 0)))
     assert_raises(IndexError, lambda: g.index((0, 8)))
+
+
+def test_grid_iter_box():
+    g = Grid((4, 3, 5))
+    lo, hi = (1, 0, 2), (3, 2, 5)
+    expected = [g.index((i, j, k)) for k in range(2, 5) for j in range(0, 2)
+                for i in range(1, 3)]
+    assert list(g.iter_box(lo, hi)) == expected
+    assert g.box_indices(lo, hi).tolist() == expected
+
+    assert list(g.iter_box((0, 0, 0), (4, 3, 5))) == list(g)
+    assert list(g.iter_box((1, 1, 1), (1, 3, 5))) == []
+    assert g.box_indices((1, 1, 1), (1, 3, 5)).tolist() == []
+
+
+def test_grid_iter_box_with_step():
+    g = Grid((6, 5))
+    expected = [g.index((i, j)) for j in range(1, 5, 2)
+                for i in range(0, 6, 3)]
+    assert list(g.iter_box((0, 1), (6, 5), (3, 2))) == expected
+    assert g.box_indices((0, 1), (6, 5), (3, 2)).tolist() == expected
+    assert_raises(ValueError, lambda: g.box_indices((0, 0), (1, 1), (0, 1)))
+
+
+def test_grid_box_raise_error_if_out_of_bound():
+    g = Grid((4, 3))
+    assert_raises(IndexError, lambda: list(g.iter_box((0, 0), (5, 3))))
+    assert_raises(IndexError, lambda: g.box_indices((-1, 0), (2, 3)))
+    assert_raises(IndexError, lambda: g.box_indices((2, 0), (1, 3)))
+    assert_raises(IndexError, lambda: g.box_indices((0,), (1,)))
+
+
+def test_grid_slice_indices():
+    g = Grid((4, 3, 2))
+    expected = [g.index((i, 1, k)) for k in range(2) for i in (3, 1)]
+    assert g.slice_indices((slice(None, None, -2), 1)).tolist() == expected
+    assert g.slice_indices((slice(1, -1), -1, 0)).tolist() == [
+        g.index((1, 2, 0)), g.index((2, 2, 0))]
+    assert g.slice_indices(()).tolist() == list(g)
+    assert_raises(IndexError, lambda: g.slice_indices((0, 3)))
+    assert_raises(IndexError, lambda: g.slice_indices((0, 0, 0, 0)))
+
+
+def test_grid_unknown_order():
+    assert_raises(UserWarning, lambda: Grid((4, 4), "spiral"))
+    assert_raises(ValueError, lambda: Grid((4, 3), "morton"))
+    assert_raises(ValueError, lambda: Grid((4, 8), "hilbert"))
+
+
+def test_grid_orders_number_all_cells():
+    for order, shape in [("row", (3, 5, 2)), ("morton", (4, 2, 8)),
+                         ("hilbert", (4, 4, 4)), ("hilbert", (1, 1))]:
+        g = Grid(shape, order)
+        assert g.order() == order
+        inds = set()
+        for coord in product(*[range(s) for s in shape]):
+            ind = g.index(coord)
+            assert g.coordinates(ind) == coord
+            inds.add(ind)
+        assert inds == set(g)
+
+
+def test_grid_morton_order():
+    g = Grid((4, 4), "morton")
+    assert [g.coordinates(i) for i in range(4)] == [(0, 0), (1, 0),
+                                                    (0, 1), (1, 1)]
+    assert g.index((2, 0)) == 4
+    assert g.index((3, 3)) == 15
+
+
+def test_grid_hilbert_order_visits_neighbors():
+    g = Grid((8, 8, 8), "hilbert")
+    prev = g.coordinates(0)
+    for ind in range(1, len(g)):
+        coord = g.coordinates(ind)
+        assert sum(abs(a - b) for a, b in zip(coord, prev)) == 1
+        prev = coord
+
+
+def test_grid_vectorized_index():
+    for order in ("row", "morton", "hilbert"):
+        g = Grid((8, 8), order)
+        coords = g.coordinates_array(range(len(g)))
+        assert coords.shape == (64, 2)
+        assert [tuple(c) for c in coords.tolist()] == [g.coordinates(i)
+                                                       for i in g]
+        assert g.indices(coords).tolist() == list(g)
+        assert_raises(IndexError, lambda: g.indices([(0, 8)]))
+        assert_raises(IndexError, lambda: g.coordinates_array([64]))
+
+
+def test_grid_region_in_curve_order():
+    g = Grid((8, 4), "morton")
+    cells = [(i, j) for j in range(1, 3) for i in range(2, 7, 2)]
+    expected = sorted(g.index(c) for c in cells)
+    assert list(g.iter_box((2, 1), (7, 3), (2, 1))) == expected
+    assert g.box_indices((2, 1), (7, 3), (2, 1)).tolist() == expected
+    assert g.slice_indices((slice(6, 1, -2), slice(1, 3))).tolist() == [
+        g.index((i, j)) for j in range(1, 3) for i in (6, 4, 2)]
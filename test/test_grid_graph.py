@@ -0,0 +1,80 @@
+from nose.tools import assert_raises
+
+from openalea.container.bfs import bfs_distances
+from openalea.container.csr_graph import CSRGraph
+from openalea.container.graph import (Graph, GraphError, InvalidEdge,
+                                      InvalidVertex)
+from openalea.container.grid import Grid
+from openalea.container.grid_graph import GridGraph
+
+
+def explicit_graph(grid):
+    g = Graph()
+    for cell in grid:
+        g.add_vertex(cell)
+    dim = grid.dim()
+    for cell in grid:
+        coord = grid.coordinates(cell)
+        for axis in range(dim):
+            for direction, step in ((0, 1), (1, -1)):
+                ncoord = list(coord)
+                ncoord[axis] += step
+                try:
+                    nid = grid.index(ncoord)
+                except IndexError:
+                    continue
+                g.add_edge(cell, nid, (cell * dim + axis) * 2 + direction)
+    return g
+
+
+def test_grid_graph_matches_explicit_graph():
+    for shape in [(5,), (3, 4), (3, 1, 2), (2, 3, 4)]:
+        grid = Grid(shape)
+        gg = GridGraph(grid)
+        ref = explicit_graph(grid)
+
+        assert gg.grid() is grid
+        assert gg.nb_vertices() == ref.nb_vertices() == len(gg)
+        assert list(gg.vertices()) == sorted(ref.vertices())
+        assert gg.nb_edges() == ref.nb_edges()
+        assert sorted(gg.edges()) == sorted(ref.edges())
+        for eid in range(2 * len(grid) * len(shape) + 2):
+            assert gg.has_edge(eid) == ref.has_edge(eid)
+            if ref.has_edge(eid):
+                assert gg.edge_vertices(eid) == ref.edge_vertices(eid)
+                assert gg.source(eid) == ref.source(eid)
+                assert gg.target(eid) == ref.target(eid)
+        for vid in ref.vertices():
+            assert sorted(gg.in_edges(vid)) == sorted(ref.in_edges(vid))
+            assert sorted(gg.out_edges(vid)) == sorted(ref.out_edges(vid))
+            assert sorted(gg.edges(vid)) == sorted(ref.edges(vid))
+            assert gg.nb_edges(vid) == ref.nb_edges(vid)
+            assert sorted(gg.neighbors(vid)) == sorted(ref.neighbors(vid))
+            assert gg.nb_out_neighbors(vid) == ref.nb_out_neighbors(vid)
+            for nid in ref.vertices():
+                assert gg.edge(vid, nid) == ref.edge(vid, nid)
+
+
+def test_grid_graph_errors():
+    gg = GridGraph(Grid((3, 4)))
+    assert 11 in gg
+    assert 12 not in gg
+    assert 1.5 not in gg
+    assert not gg.has_edge(1)  # cell 0 toward decreasing x
+    assert_raises(InvalidEdge, lambda: gg.source(1))
+    assert_raises(InvalidVertex, lambda: gg.out_edges(12))
+    assert_raises(InvalidVertex, lambda: gg.edge(0, 12))
+    assert_raises(GraphError, lambda: gg.add_vertex())
+    assert GridGraph(Grid(())).nb_edges() == 0
+
+
+def test_grid_graph_with_graph_algorithms():
+    grid = Grid((4, 5))
+    csr = CSRGraph(GridGraph(grid))
+    dist = bfs_distances(csr, [0])
+    for cell in grid:
+        assert dist[cell] == sum(grid.coordinates(cell))
+
+
+def test_grid_graph_requires_row_order():
+    assert_raises(ValueError, lambda: GridGraph(Grid((4, 4), "morton")))
@@ -0,0 +1,50 @@
+import numpy as np
+from nose.tools import assert_raises
+
+from openalea.container.grid_order import (hilbert_decode, hilbert_encode,
+                                           morton_decode, morton_encode,
+                                           nb_bits)
+
+
+def test_nb_bits():
+    assert nb_bits(1) == 0
+    assert nb_bits(16) == 4
+    assert_raises(ValueError, lambda: nb_bits(0))
+    assert_raises(ValueError, lambda: nb_bits(12))
+
+
+def test_morton_interleave_bits():
+    assert morton_encode([1, 0], [2, 2]) == 1
+    assert morton_encode([0, 1], [2, 2]) == 2
+    assert morton_encode([3, 3], [2, 2]) == 15
+    # exhausted axes are skipped
+    assert morton_encode([0, 4], [1, 3]) == 8
+    assert morton_decode(8, [1, 3]) == [0, 4]
+
+
+def test_morton_vectorized():
+    bits = [3, 1, 2]
+    xs, ys, zs = [a.ravel() for a in np.meshgrid(range(8), range(2),
+                                                  range(4), indexing='ij')]
+    inds = morton_encode([xs, ys, zs], bits)
+    assert sorted(inds.tolist()) == range(64)
+    assert inds.tolist() == [morton_encode([x, y, z], bits)
+                             for x, y, z in zip(xs, ys, zs)]
+    for coord, ref in zip(morton_decode(inds, bits), (xs, ys, zs)):
+        assert coord.tolist() == ref.tolist()
+
+
+def test_hilbert_2d():
+    assert [hilbert_decode(i, 2, 1) for i in range(4)] == [[0, 0], [0, 1],
+                                                           [1, 1], [1, 0]]
+    assert hilbert_encode([0, 0], 0) == 0
+
+
+def test_hilbert_vectorized():
+    inds = np.arange(4 ** 3)
+    coords = hilbert_decode(inds, 3, 2)
+    for ind in range(4 ** 3):
+        assert hilbert_decode(ind, 3, 2) == [c[ind] for c in coords]
+    assert hilbert_encode(coords, 2).tolist() == inds.tolist()
+    steps = np.abs(np.diff(np.array(coords), axis=1)).sum(axis=0)
+    assert (steps == 1).all()
@@ -0,0 +1,83 @@
+import pickle
+from copy import deepcopy
+from nose.tools import assert_raises
+
+from openalea.container.id_array_dict import IdArrayDict
+
+
+def test_id_array_dict_raise_error_if_key_is_not_int():
+    d = IdArrayDict()
+    assert_raises(KeyError, lambda: d.__setitem__('a', None))
+    assert_raises(KeyError, lambda: d.__setitem__(-1, None))
+    assert_raises(KeyError, lambda: d.setdefault('a', None))
+    assert_raises(KeyError, lambda: d.add('a', 'key'))
+    assert_raises(KeyError, lambda: d.__setitem__(True, None))
+    assert_raises(KeyError, lambda: d.update({False: 'a'}))
+    assert_raises(KeyError, lambda: d[-1])
+    assert 'a' not in d
+
+
+def test_id_array_dict_behave_like_normal_dict():
+    d = IdArrayDict()
+    d[10] = None
+    assert d[10] is None
+    assert d.pop(10) is None
+    assert_raises(KeyError, lambda: d.pop(10))
+    assert d.pop(10, None) is None
+    assert len(d) == 0
+    d[1] = 'a'
+    d[1] = 'b'
+    assert d.popitem() == (1, 'b')
+    d[2] = 1
+    assert 10 not in d
+    assert 2 in d
+    assert d.get(10, 'a') == 'a'
+    assert d.get(2, None) == 1
+    assert len(d) == 1
+    assert tuple(d.keys()) == (2,)
+    assert tuple(d.values()) == (1,)
+    assert tuple(d.items()) == ((2, 1),)
+    assert d == {2: 1}
+
+    d = IdArrayDict({1: 2, 3: 'c'})
+    d.update({1: 3, 5: 'd'})
+    assert dict(d) == {1: 3, 3: 'c', 5: 'd'}
+    del d[3]
+    assert sorted(d) == [1, 5]
+
+    d.setdefault(10, []).append(10)
+    assert 10 in d[10]
+    dd = deepcopy(d)
+    d[10].append(11)
+    assert dd[10] == [10]
+    assert dd.copy() == dd
+
+    d.clear()
+    assert len(d) == 0
+    assert list(d.iteritems()) == []
+
+
+def test_id_array_dict_fill_holes():
+    d = IdArrayDict()
+    for val in 'abcd':
+        d.add(val)
+    del d[1]
+    del d[2]
+    assert sorted(d.add_many(['x', 'y', 'z'])) == [1, 2, 4]
+    assert len(d) == 5
+    assert_raises(KeyError, lambda: d.add('w', 0))
+    assert_raises(KeyError, lambda: d.update({7: 'a', -2: 'b'}))
+    assert 7 not in d
+
+    d = IdArrayDict.fromkeys([3, 1], 0, idgenerator="max")
+    assert d.add('a') == 4
+    assert d.get_generator_type() == "max"
+
+
+def test_id_array_dict_pickle():
+    d = IdArrayDict()
+    d.add_many('abc')
+    del d[1]
+    nd = pickle.loads(pickle.dumps(d, pickle.HIGHEST_PROTOCOL))
+    assert nd == d
+    assert nd.add('d') == 1
@@ -1,3 +1,4 @@
+import pickle
 from copy import deepcopy
 from nose.tools import assert_raises
 
@@ -9,6 +10,10 @@ def test_id_dict_raise_error_if_key_is_not_int():
     assert_raises(KeyError, lambda: d.__setitem__('a', None))
     assert_raises(KeyError, lambda: d.setdefault('a', None))
     assert_raises(KeyError, lambda: d.add('a', 'key'))
+    assert_raises(KeyError, lambda: d.__setitem__(True, None))
+    assert_raises(KeyError, lambda: d.add('a', False))
+    assert_raises(KeyError, lambda: d.update({True: 'a'}))
+    assert len(d) == 0
 
 
 def test_id_dict_behave_like_normal_dict():
@@ -36,12 +41,12 @@ def test_id_dict_behave_like_normal_dict():
     d = IdDict(tmp)
     assert len(d) == 2
 
-    # TODO update not implemented
-    # d[1] = 3
-    # tmp[5] = 'd'
-    # d.update(tmp)
-    # assert len(d) == 3
-    # assert d[1] == 2
+    d[1] = 3
+    tmp[5] = 'd'
+    d.update(tmp)
+    assert len(d) == 3
+    assert d[1] == 2
+    del tmp[5]
 
     d.clear()
     assert len(d) == 0
@@ -99,3 +104,30 @@ def test_id_dict_refuse_to_reuse_ids():
     d.add('b')
     assert len(d) == 2
     assert_raises(KeyError, lambda: d.add('c', 0))
+
+
+def test_id_dict_pickle():
+    d = IdDict(idgenerator="max")
+    d.add('a')
+    d.add('b')
+    del d[0]
+    nd = pickle.loads(pickle.dumps(d, pickle.HIGHEST_PROTOCOL))
+    assert nd == d
+    assert nd.get_generator_type() == "max"
+    assert nd.add('c') == 2
+
+
+def test_id_dict_bulk_insertions():
+    d = IdDict({0: 'a', 4: 'b'})
+    d.update({2: 'c'})
+    assert_raises(KeyError, lambda: d.update({6: 'd', 'e': 'e'}))
+    assert 6 not in d
+    keys = d.add_many(['x', 'y', 'z'])
+    assert sorted(keys) == [1, 3, 5]
+    assert d[keys[1]] == 'y'
+    assert_raises(KeyError, lambda: d.add('w', 5))
+
+    d = IdDict.fromkeys([3, 1], 0, idgenerator="max")
+    assert d == {1: 0, 3: 0}
+    assert d.get_generator_type() == "max"
+    assert d.add('a') == 4
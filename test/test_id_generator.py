@@ -133,3 +133,26 @@ def test_list_gen_clear_restart_from_zero():
     gen.clear()
     assert gen.get_id() == 0
     assert gen.get_id(pid0) == pid0
+
+
+def test_gen_bulk_ids_match_single_ids():
+    for gen_type in (IdMaxGenerator, IdSetGenerator, IdListGenerator):
+        gen = gen_type()
+        gen.get_ids([2, 5])
+        assert_raises(IndexError, lambda: gen.get_ids([6, 5]))
+        ids = gen.new_ids(3)
+        assert len(set(ids)) == 3
+        assert 2 not in ids and 5 not in ids
+        assert gen.get_id() not in ids + [2, 5]
+
+
+def test_set_and_list_gen_bulk_ids_reuse_available_ids():
+    for gen_type in (IdSetGenerator, IdListGenerator):
+        gen = gen_type()
+        gen.get_ids([1, 4])
+        gen.get_ids([0, 3])
+        assert_raises(IndexError, lambda: gen.get_ids([2, 3]))
+        assert gen.get_id(2) == 2
+        assert gen.new_ids(2) == [5, 6]
+        gen.release_id(3)
+        assert gen.new_ids(1) == [3]
@@ -0,0 +1,111 @@
+from nose.tools import assert_raises
+
+from openalea.container.graph import Graph
+from openalea.container.id_dict import IdDict
+from openalea.container.id_generator import IdSetGenerator
+from openalea.container.instrument import (instrument,
+                                           uninstrument,
+                                           is_instrumented,
+                                           InstrumentationError,
+                                           Stats)
+
+
+def test_instrument_count_calls():
+    g = Graph()
+    stats = instrument(g)
+    for i in range(5):
+        g.add_vertex(i)
+    g.add_edge(0, 1)
+    assert stats.nb_calls("Graph.add_vertex") == 5
+    assert stats.nb_calls("Graph.add_edge") == 1
+    assert stats.nb_calls("Graph._vertices.add") == 5
+    assert stats.nb_calls("Graph._edges.add") == 1
+    assert stats.mean_time("Graph.add_vertex") >= 0
+    assert stats.mean_time("Graph.remove_vertex") is None
+
+
+def test_instrument_count_internal_calls():
+    g = Graph()
+    for i in range(3):
+        g.add_vertex(i)
+    g.add_edge(0, 1)
+    g.add_edge(2, 1)
+    stats = instrument(g)
+    assert 1 in g
+    assert stats.nb_calls("Graph.has_vertex") == 1
+    g.remove_vertex(1)
+    assert stats.nb_calls("Graph.remove_edge") == 2
+
+
+def test_instrument_histogram():
+    g = Graph()
+    stats = instrument(g)
+    for i in range(10):
+        g.add_vertex()
+    assert sum(stats.histograms["Graph.add_vertex"].values()) == 10
+    names = [name for name, nb, tot, mean in stats.summary()]
+    assert "Graph.add_vertex" in names
+
+
+def test_instrument_track_free_ids():
+    d = IdDict()
+    stats = instrument(d)
+    for i in range(5):
+        d.add(i)
+    assert stats.free_ids["IdDict.id_generator"] == (0, 0)
+    d.pop(0)
+    d.pop(1)
+    assert stats.free_ids["IdDict.id_generator"] == (2, 2)
+    d.add('a')
+    assert stats.free_ids["IdDict.id_generator"] == (1, 2)
+
+
+def test_instrument_generator():
+    gen = IdSetGenerator()
+    stats = instrument(gen, name="gen")
+    gen.get_id(10)
+    assert stats.nb_calls("gen.get_id") == 1
+    assert stats.free_ids["gen"] == (10, 10)
+
+
+def test_instrument_callback():
+    calls = []
+    g = Graph()
+    instrument(g, callback=lambda name, duration: calls.append(name))
+    g.add_vertex()
+    assert "Graph.add_vertex" in calls
+
+
+def test_uninstrument_restore_methods():
+    g = Graph()
+    stats = instrument(g)
+    assert is_instrumented(g)
+    assert is_instrumented(g._vertices)
+    uninstrument(g)
+    assert not is_instrumented(g)
+    assert not is_instrumented(g._vertices)
+    assert not is_instrumented(g._vertices._id_generator)
+    g.add_vertex()
+    assert stats.nb_calls("Graph.add_vertex") == 0
+    assert "add_vertex" not in g.__dict__
+
+
+def test_instrument_share_stats():
+    stats = Stats()
+    g1 = Graph()
+    g2 = Graph()
+    instrument(g1, stats)
+    instrument(g2, stats)
+    g1.add_vertex()
+    g2.add_vertex()
+    assert stats.nb_calls("Graph.add_vertex") == 2
+    stats.clear()
+    assert stats.nb_calls("Graph.add_vertex") == 0
+
+
+def test_instrument_refuse_twice():
+    g = Graph()
+    instrument(g)
+    assert_raises(InstrumentationError, lambda: instrument(g))
+    uninstrument(g)
+    assert_raises(InstrumentationError, lambda: uninstrument(g))
@@ -0,0 +1,72 @@
+from nose.tools import assert_raises
+
+from openalea.container.graph import Graph
+from openalea.container.multigraph import (collapse_parallel_edges,
+                                           edge_multiplicity, is_simple,
+                                           multiplicity_histogram,
+                                           parallel_edges)
+from openalea.container.property_graph import InvalidProperty, PropertyGraph
+
+
+def build_graph(graph_type=PropertyGraph):
+    g = graph_type()
+    for vid in range(4):
+        g.add_vertex(vid)
+    for eid, (sid, tid) in enumerate([(0, 1), (0, 1), (1, 0), (1, 2),
+                                      (0, 1), (2, 3), (3, 2)]):
+        g.add_edge(sid, tid, eid)
+    return g
+
+
+def test_multiplicity():
+    g = build_graph(Graph)
+    assert parallel_edges(g) == {(0, 1): [0, 1, 4], (1, 0): [2],
+                                 (1, 2): [3], (2, 3): [5], (3, 2): [6]}
+    assert edge_multiplicity(g) == {(0, 1): 3, (1, 0): 1, (1, 2): 1,
+                                    (2, 3): 1, (3, 2): 1}
+    assert edge_multiplicity(g, directed=False) == {(0, 1): 4, (1, 2): 1,
+                                                    (2, 3): 2}
+    assert multiplicity_histogram(g) == {1: 4, 3: 1}
+    assert not is_simple(g)
+
+    g.remove_edge(1)
+    g.remove_edge(4)
+    assert is_simple(g)
+    assert not is_simple(g, directed=False)
+
+
+def test_collapse_parallel_edges():
+    g = build_graph()
+    g.add_edge_property("weight", dict((eid, float(eid)) for eid in range(7)))
+    g.add_edge_property("label", {1: "b", 4: "c"})
+    del g.edge_property("weight")[4]
+
+    trans = collapse_parallel_edges(g, {"weight": "sum", "nb": "count",
+                                        "label": lambda vals: "".join(vals)})
+    assert trans == {1: 0, 4: 0}
+    assert sorted(g.edges()) == [0, 2, 3, 5, 6]
+    assert g.edge_property("weight") == {0: 1., 2: 2., 3: 3., 5: 5., 6: 6.}
+    assert g.edge_property("nb") == {0: 3, 2: 1, 3: 1, 5: 1, 6: 1}
+    assert g.edge_property("label") == {0: "bc"}
+    assert is_simple(g)
+
+
+def test_collapse_undirected():
+    g = build_graph()
+    g.add_edge_property("weight", dict((eid, 1.) for eid in range(7)))
+    trans = collapse_parallel_edges(g, {"weight": "mean"}, directed=False)
+    assert trans == {1: 0, 2: 0, 4: 0, 6: 5}
+    assert g.edge_vertices(5) == (2, 3)
+    assert g.edge_property("weight") == {0: 1., 3: 1., 5: 1.}
+
+    assert_raises(UserWarning,
+                  lambda: collapse_parallel_edges(g, {"weight": "median"}))
+
+
+def test_collapse_graph_without_properties():
+    g = build_graph(Graph)
+    assert collapse_parallel_edges(g) == {1: 0, 4: 0}
+    assert g.nb_edges() == 5
+    assert_raises(InvalidProperty,
+                  lambda: collapse_parallel_edges(g, {"weight": "sum"}))
+    assert g.nb_edges() == 5
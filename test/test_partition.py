@@ -0,0 +1,84 @@
+from nose.tools import assert_raises
+
+from openalea.container.graph import Graph
+from openalea.container.property_graph import PropertyGraph
+from openalea.container.partition import (partition,
+                                          edge_cut,
+                                          extract_parts,
+                                          merge_properties)
+
+
+def build_grid(nb, graph_type=Graph):
+    g = graph_type()
+    for vid in range(nb * nb):
+        g.add_vertex(vid)
+    for i in range(nb):
+        for j in range(nb):
+            vid = i * nb + j
+            if j < nb - 1:
+                g.add_edge(vid, vid + 1)
+            if i < nb - 1:
+                g.add_edge(vid, vid + nb)
+    return g
+
+
+def part_sizes(parts, nb_parts):
+    sizes = [0] * nb_parts
+    for part in parts.values():
+        sizes[part] += 1
+    return sizes
+
+
+def test_partition_assign_all_vertices():
+    g = build_grid(10)
+    for method in ("bfs", "label_propagation", "multilevel"):
+        parts = partition(g, 4, method, seed=0)
+        assert sorted(parts) == range(100)
+        sizes = part_sizes(parts, 4)
+        assert min(sizes) > 0
+        assert max(sizes) <= 27
+
+
+def test_partition_refinement_do_not_increase_cut():
+    g = build_grid(12)
+    cut_bfs = edge_cut(g, partition(g, 4, "bfs"))
+    assert edge_cut(g, partition(g, 4, "label_propagation", seed=0)) <= cut_bfs
+    assert edge_cut(g, partition(g, 4, "multilevel", seed=0)) <= cut_bfs
+
+
+def test_partition_invalid_arguments():
+    g = build_grid(3)
+    assert partition(Graph(), 2) == {}
+    assert_raises(ValueError, lambda: partition(g, 0))
+    assert_raises(UserWarning, lambda: partition(g, 2, "toto"))
+
+
+def test_extract_parts_with_halo():
+    g = build_grid(4)
+    parts = dict((vid, 0 if vid < 8 else 1) for vid in g.vertices())
+    (sg0, ghosts0), (sg1, ghosts1) = extract_parts(g, parts)
+    assert ghosts0 == set([8, 9, 10, 11])
+    assert ghosts1 == set([4, 5, 6, 7])
+    assert sorted(sg0.vertices()) == range(12)
+    assert sg0.nb_edges() == 3 * 3 + 2 * 4
+
+    (sg0, ghosts0), (sg1, ghosts1) = extract_parts(g, parts, halo=0)
+    assert len(ghosts0) == 0
+    assert sg0.nb_edges() + sg1.nb_edges() + edge_cut(g, parts) == g.nb_edges()
+
+
+def test_merge_properties():
+    g = build_grid(4, PropertyGraph)
+    g.add_vertex_property("val", dict((vid, vid) for vid in g.vertices()))
+    parts = partition(g, 2)
+    sub_graphs = extract_parts(g, parts)
+    for i, (sg, ghosts) in enumerate(sub_graphs):
+        assert dict(sg.vertex_property("val")) == dict(
+            (vid, vid) for vid in sg.vertices())
+        sg.add_vertex_property("part", dict((vid, i) for vid in sg.vertices()))
+        sg.add_edge_property("part", dict((eid, i) for eid in sg.edges()))
+
+    merge_properties(g, sub_graphs, ["part"], ["part"])
+    assert dict(g.vertex_property("part")) == parts
+    for eid in g.edges():
+        assert g.edge_property("part")[eid] == parts[g.source(eid)]
@@ -0,0 +1,66 @@
+import numpy as np
+from nose.tools import assert_raises
+
+from openalea.container.property_array import (values_array,
+                                               set_values,
+                                               reduce_values,
+                                               neighbor_reduce)
+
+
+def test_values_array():
+    prop = {0: 1., 1: 2., 3: 4.}
+    assert values_array(prop, [3, 0]).tolist() == [4., 1.]
+    assert_raises(KeyError, lambda: values_array(prop, [2]))
+    arr = values_array(prop, [0, 2], default=-1, dtype=int)
+    assert arr.dtype == int
+    assert arr.tolist() == [1, -1]
+    arr = values_array({0: 'a'}, [0, 1], default='b')
+    assert arr.tolist() == ['a', 'b']
+
+
+def test_set_values():
+    prop = {}
+    set_values(prop, [0, 2], np.array([1, 3]))
+    assert prop == {0: 1, 2: 3}
+    assert type(prop[0]) is int
+    assert_raises(ValueError, lambda: set_values(prop, [0], [1, 2]))
+
+
+def test_reduce_values():
+    assert reduce_values([1, 2, 3], "sum") == 6
+    assert reduce_values([1, 2, 3], "mean") == 2.
+    assert reduce_values([1, 2, 3], "min") == 1
+    assert reduce_values([1, 2, 3], "max") == 3
+    assert reduce_values([], "sum") == 0
+    assert reduce_values([], "max") is None
+    assert reduce_values(['b', 'a'], "min") == 'a'
+    assert reduce_values(['b', 'a'], "sum") == 'ba'
+    assert_raises(TypeError, lambda: reduce_values(['a'], "mean"))
+    assert_raises(UserWarning, lambda: reduce_values([1], "toto"))
+
+
+def test_neighbor_reduce():
+    vids = np.array([0, 1, 2, 5])
+    sources = np.array([0, 0, 1, 0])
+    targets = np.array([1, 2, 5, 5])
+    values = np.array([1, 2, 3, 4])
+    res = neighbor_reduce(vids, sources, targets, values, "sum", 0)
+    assert res.tolist() == [9, 4, 0, 0]
+    res = neighbor_reduce(vids, sources, targets, values, "max", None)
+    assert res.tolist() == [4, 4, None, None]
+    res = neighbor_reduce(vids, sources, targets, values, "min", -1)
+    assert res.tolist() == [2, 4, -1, -1]
+    res = neighbor_reduce(vids, sources, targets, values, "mean", 0.)
+    assert res.tolist() == [3., 4., 0., 0.]
+    res = neighbor_reduce(vids, sources, targets,
+                          np.array(['a', 'b', 'c', 'd']), "sum", '')
+    assert res.tolist() == ['bcd', 'd', '', '']
+
+    res = neighbor_reduce(vids, sources, targets,
+                          np.array([True, True, False, True]), "sum", 0)
+    assert res.tolist() == [2, 1, 0, 0]
+    big = 2 ** 53 + 1
+    res = neighbor_reduce(vids, sources, targets,
+                          np.array([0, big, 2, big], dtype=np.int64),
+                          "sum", 0)
+    assert res.tolist() == [big + big + 2, big, 0, 0]
@@ -1,9 +1,10 @@
 from nose.tools import assert_raises, with_setup
-from openalea.container.graph import Graph
+from openalea.container.graph import Graph, GraphObserver
 from openalea.container.property_graph import (PropertyGraph,
                                                InvalidVertex,
                                                InvalidEdge,
                                                InvalidProperty)
+from openalea.container.property_map import PropertyMap
 
 
 g = PropertyGraph()
@@ -212,3 +213,225 @@ def test_pg_can_be_extended_with_another_graph_with_different_properties():
     assert len(g.edge_property("prop")) == old_len_eprop
     assert len(g.vertex_property("aprop")) == len(pg.vertex_property("aprop"))
     assert len(g.edge_property("aprop")) == len(pg.edge_property("aprop"))
+
+
+@with_setup(setup_func, teardown_func)
+def test_pg_property_values_are_stored_by_reference():
+    values = {0: 'a'}
+    g.add_vertex_property("shared", values)
+    values[1] = 'b'
+    assert g.vertex_property("shared") is values
+    assert g.vertex_property("shared")[1] == 'b'
+    g.vertex_property("shared")[2] = 'c'
+    assert values[2] == 'c'
+    # plain dicts can not be observed
+    assert_raises(InvalidProperty, lambda: g.create_vertex_index("shared"))
+    assert_raises(InvalidProperty,
+                  lambda: g.add_computed_vertex_property(
+                      "comp", lambda graph, vid: vid,
+                      vertex_inputs=["shared"]))
+    g.remove_vertex_property("shared")
+
+    values = PropertyMap({0: 'a'})
+    g.add_vertex_property("shared", values)
+    g.create_vertex_index("shared")
+    values[3] = 'a'
+    assert g.find_vertices("shared", 'a') == {0, 3}
+    g.remove_vertex_property("shared")
+
+
+@with_setup(setup_func, teardown_func)
+def test_pg_property_with_default_value():
+    g.add_vertex_property("def_prop", {1: 'a'}, default='d')
+    g.add_edge_property("def_prop", default=0)
+    prop = g.vertex_property("def_prop")
+    assert prop[0] == 'd'
+    assert prop[1] == 'a'
+    assert len(prop) == 1
+    assert_raises(KeyError, lambda: prop[100])
+    vid = g.add_vertex()
+    assert prop[vid] == 'd'
+    assert g.edge_property("def_prop")[0] == 0
+
+    g.remove_vertex_property("def_prop")
+    g.remove_edge_property("def_prop")
+
+
+@with_setup(setup_func, teardown_func)
+def test_pg_computed_property():
+    g.add_vertex_property("size", PropertyMap((vid, 1)
+                                              for vid in g.vertices()))
+    g.add_computed_vertex_property(
+        "nb_desc",
+        lambda graph, vid: sum(graph.vertex_property("size")[nid]
+                               for nid in graph.out_neighbors(vid)),
+        vertex_inputs=["size"])
+    prop = g.vertex_property("nb_desc")
+    assert prop[0] == 1
+    assert prop[9] == 0
+
+    g.vertex_property("size")[1] = 5
+    assert prop[0] == 5
+
+    vid = g.add_vertex()
+    g.vertex_property("size")[vid] = 2
+    g.add_edge(0, vid)
+    assert prop[0] == 7
+    assert prop[vid] == 0
+    assert_raises(TypeError, lambda: prop.__setitem__(0, 1))
+    assert_raises(InvalidProperty,
+                  lambda: g.add_computed_vertex_property("size", None))
+
+    g.add_computed_edge_property("length",
+                                 lambda graph, eid: graph.target(eid) -
+                                 graph.source(eid))
+    assert g.edge_property("length")[0] == 1
+
+    g.remove_vertex_property("nb_desc")
+    g.remove_vertex_property("size")
+    g.remove_edge_property("length")
+
+
+@with_setup(setup_func, teardown_func)
+def test_pg_find_without_index():
+    assert g.find_vertices("prop", 'v3') == {3}
+    assert g.find_edges("prop", 'e3') == {3}
+    assert g.find_vertices_in_range("prop", 'v1', 'v3') == [1, 2, 3]
+    assert g.find_edges_in_range("prop", 'e7') == [7, 8]
+
+
+@with_setup(setup_func, teardown_func)
+def test_pg_vertex_index_follow_graph_modifications():
+    g.add_vertex_property("label",
+                          PropertyMap((vid, vid % 2) for vid in g.vertices()))
+    g.create_vertex_index("label")
+    assert g.find_vertices("label", 1) == {1, 3, 5, 7, 9}
+    g.vertex_property("label")[1] = 0
+    assert g.find_vertices("label", 1) == {3, 5, 7, 9}
+    g.remove_vertex(3)
+    assert g.find_vertices("label", 1) == {5, 7, 9}
+    g.clear()
+    assert g.find_vertices("label", 0) == set()
+    g.remove_vertex_property("label")
+    assert_raises(InvalidProperty, lambda: g.drop_vertex_index("label"))
+
+
+@with_setup(setup_func, teardown_func)
+def test_pg_sorted_edge_index():
+    g.add_edge_property("weight", PropertyMap((eid, eid * 0.5)
+                                              for eid in g.edges()))
+    g.create_edge_index("weight", "sorted")
+    assert g.find_edges_in_range("weight", 1., 2.) == [2, 3, 4]
+    assert g.find_edges("weight", 1.) == {2}
+    g.remove_edge(3)
+    g.edge_property("weight")[8] = 1.2
+    assert g.find_edges_in_range("weight", 1., 2.) == [2, 8, 4]
+    g.clear_edges()
+    assert g.find_edges_in_range("weight") == []
+    g.drop_edge_index("weight")
+    g.remove_edge_property("weight")
+
+
+@with_setup(setup_func, teardown_func)
+def test_pg_index_refuse_invalid_requests():
+    assert_raises(InvalidProperty, lambda: g.create_vertex_index("unknown"))
+    assert_raises(UserWarning, lambda: g.create_vertex_index("prop", "toto"))
+    g.add_computed_vertex_property("comp", lambda graph, vid: vid)
+    assert_raises(InvalidProperty, lambda: g.create_vertex_index("comp"))
+    g.remove_vertex_property("comp")
+
+
+@with_setup(setup_func, teardown_func)
+def test_pg_bulk_values():
+    g.add_vertex_property("val", dict((vid, vid * 2) for vid in g.vertices()))
+    assert g.get_vertex_values("val").tolist() == [vid * 2
+                                                   for vid in range(10)]
+    g.set_vertex_values("val", [1, 2], [10, 20])
+    assert g.get_vertex_values("val", [2, 1], dtype=float).tolist() == [20.,
+                                                                        10.]
+    vid = g.add_vertex()
+    assert_raises(KeyError, lambda: g.get_vertex_values("val"))
+    assert g.get_vertex_values("val", [vid], default=0).tolist() == [0]
+
+    g.add_edge_property("w")
+    g.set_edge_values("w", range(9), [1.] * 9)
+    assert g.get_edge_values("w").sum() == 9.
+    assert g.get_edge_values("w", [0, 100], default=0.).tolist() == [1., 0.]
+
+    g.remove_vertex_property("val")
+    g.remove_edge_property("w")
+
+
+@with_setup(setup_func, teardown_func)
+def test_pg_reductions():
+    g.add_vertex_property("val", dict((vid, vid) for vid in g.vertices()))
+    assert g.reduce_vertex_property("val") == 45
+    assert g.reduce_vertex_property("val", "max") == 9
+    assert g.reduce_edge_property("prop", "min") == 'e0'
+
+    g.add_edge(0, 5)
+    vids, res = g.reduce_neighbors("val", fill=0)
+    assert vids.tolist() == range(10)
+    assert res.tolist() == [6, 2, 3, 4, 5, 6, 7, 8, 9, 0]
+    vids, res = g.reduce_neighbors("val", "max", direction="in")
+    assert res.tolist() == [None, 0, 1, 2, 3, 4, 5, 6, 7, 8]
+
+    g.remove_vertex_property("val")
+
+
+def test_pg_compact_translate_properties():
+    pg = PropertyGraph()
+    for vid in (4, 8, 6):
+        pg.add_vertex(vid)
+    pg.add_edge(4, 8, 10)
+    pg.add_edge(8, 6, 3)
+    pg.add_vertex_property("name", {4: 'a', 8: 'b', 6: 'c'}, default='')
+    pg.add_edge_property("name", {10: 'ab', 3: 'bc'})
+    pg.add_computed_vertex_property("deg",
+                                    lambda graph, vid: graph.nb_edges(vid))
+    pg.create_vertex_index("name")
+    assert pg.vertex_property("deg")[4] == 1
+
+    trans_vid, trans_eid = pg.compact()
+    assert dict(pg.vertex_property("name")) == {0: 'a', 2: 'b', 1: 'c'}
+    assert dict(pg.edge_property("name")) == {0: 'ab', 1: 'bc'}
+    assert pg.find_vertices("name", 'b') == {2}
+    assert pg.vertex_property("deg")[2] == 2
+    assert_raises(KeyError, lambda: pg.vertex_property("deg")[4])
+    vid = pg.add_vertex()
+    assert pg.vertex_property("name")[vid] == ''
+
+
+def test_pg_compact_notify_reset_after_translation():
+    pg = PropertyGraph()
+    for vid in (4, 8):
+        pg.add_vertex(vid)
+    pg.add_vertex_property("name", {4: 'a', 8: 'b'})
+
+    class Reader(GraphObserver):
+        seen = None
+
+        def reset(self):
+            self.seen = dict(pg.vertex_property("name"))
+
+    reader = Reader()
+    pg.add_observer(reader)
+    pg.compact()
+    assert reader.seen == {0: 'a', 1: 'b'}
+
+
+@with_setup(setup_func, teardown_func)
+def test_pg_sub_graph_copy_properties():
+    g.add_graph_property("title", "chain")
+    g.add_vertex_property("size", default=1)
+    g.vertex_property("size")[3] = 5
+    sg = g.sub_graph([2, 3, 4])
+    assert isinstance(sg, PropertyGraph)
+    assert dict(sg.vertex_property("prop")) == {2: 'v2', 3: 'v3', 4: 'v4'}
+    assert dict(sg.edge_property("prop")) == {2: 'e2', 3: 'e3'}
+    assert sg.vertex_property("size")[3] == 5
+    assert sg.vertex_property("size")[4] == 1
+    assert sg.graph_property("title") == "chain"
+
+    g.remove_vertex_property("size")
+    g.remove_graph_property("title")
@@ -0,0 +1,54 @@
+from openalea.container.property_map import PropertyMap
+from openalea.container.property_index import HashIndex, SortedIndex
+
+
+def test_hash_index_follow_modifications():
+    prop = PropertyMap({0: 'a', 1: 'b', 2: 'a'})
+    ind = HashIndex(prop)
+    assert ind.find('a') == {0, 2}
+    assert ind.find('c') == set()
+    prop[2] = 'c'
+    assert ind.find('a') == {0}
+    assert ind.find('c') == {2}
+    del prop[0]
+    assert ind.find('a') == set()
+    prop.update({3: 'b', 4: 'b'})
+    assert ind.find('b') == {1, 3, 4}
+    prop.pop(3)
+    prop.setdefault(5, 'b')
+    assert ind.find('b') == {1, 4, 5}
+    key, val = prop.popitem()
+    assert key not in ind.find(val)
+    prop.clear()
+    assert ind.find('b') == set()
+
+
+def test_hash_index_detach():
+    prop = PropertyMap({0: 'a'})
+    ind = HashIndex(prop)
+    ind.detach()
+    prop[1] = 'a'
+    assert ind.find('a') == {0}
+
+
+def test_sorted_index_range():
+    prop = PropertyMap((i, i % 5) for i in range(20))
+    ind = SortedIndex(prop)
+    assert ind.find(3) == {3, 8, 13, 18}
+    assert sorted(ind.find_range(1, 2)) == [1, 2, 6, 7, 11, 12, 16, 17]
+    assert len(ind.find_range(None, 0)) == 4
+    assert len(ind.find_range(4)) == 4
+    assert len(ind.find_range()) == 20
+    prop[0] = 10
+    assert ind.find_range(5) == [0]
+    del prop[1]
+    prop.pop(6)
+    assert sorted(ind.find_range(1, 1)) == [11, 16]
+    prop.clear()
+    assert ind.find_range() == []
+
+
+def test_sorted_index_order_by_value():
+    prop = PropertyMap({0: 3., 1: 1., 2: 2.})
+    ind = SortedIndex(prop)
+    assert ind.find_range() == [1, 2, 0]
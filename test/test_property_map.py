@@ -0,0 +1,99 @@
+import pickle
+
+from nose.tools import assert_raises
+
+from openalea.container.property_map import (PropertyMap,
+                                             DefaultPropertyMap,
+                                             ComputedProperty)
+
+
+def test_property_map_count_modifications():
+    prop = PropertyMap({0: 'a'})
+    rev = prop._revision
+    prop[1] = 'b'
+    assert prop._revision > rev
+    for action in (lambda: prop.pop(1),
+                   lambda: prop.setdefault(2, 'c'),
+                   lambda: prop.update({3: 'd'}),
+                   lambda: prop.__delitem__(3),
+                   lambda: prop.popitem(),
+                   lambda: prop.clear()):
+        rev = prop._revision
+        action()
+        assert prop._revision > rev
+
+
+def test_property_map_do_not_count_reads():
+    prop = PropertyMap({0: 'a'})
+    rev = prop._revision
+    assert prop[0] == 'a'
+    assert prop.get(1) is None
+    assert prop.pop(1, None) is None
+    assert prop.setdefault(0, 'b') == 'a'
+    assert prop._revision == rev
+
+
+def test_default_property_map_return_default_for_valid_elements():
+    elements = {0: None, 1: None}
+    prop = DefaultPropertyMap(elements, 'd', {1: 'a'})
+    assert prop[0] == 'd'
+    assert prop.get(0) == 'd'
+    assert prop[1] == 'a'
+    assert 0 not in prop
+    assert len(prop) == 1
+    assert_raises(KeyError, lambda: prop[2])
+    assert prop.get(2) is None
+
+
+class Graph(object):
+    _revision = 0
+
+
+def test_computed_property_is_memoized():
+    calls = []
+    elements = {0: None, 1: None}
+
+    def func(graph, key):
+        calls.append(key)
+        return key * 10
+
+    prop = ComputedProperty(Graph(), elements, func)
+    assert prop[1] == 10
+    assert prop[1] == 10
+    assert calls == [1]
+    assert prop.is_computed(1)
+    assert not prop.is_computed(0)
+    assert sorted(prop.items()) == [(0, 0), (1, 10)]
+    assert_raises(KeyError, lambda: prop[2])
+    assert_raises(TypeError, lambda: prop.__setitem__(0, 1))
+
+
+def test_computed_property_invalidated_by_inputs_and_graph():
+    g = Graph()
+    inp = PropertyMap({0: 1, 1: 2})
+    prop = ComputedProperty(g, inp, lambda graph, key: inp[key] * 2, [inp])
+    assert prop[0] == 2
+    inp[0] = 5
+    assert not prop.is_computed(0)
+    assert prop[0] == 10
+    g._revision += 1
+    assert not prop.is_computed(0)
+
+
+def test_computed_property_can_be_chained():
+    g = Graph()
+    inp = PropertyMap({0: 1})
+    prop1 = ComputedProperty(g, inp, lambda graph, key: inp[key] + 1, [inp])
+    prop2 = ComputedProperty(g, inp, lambda graph, key: prop1[key] * 2,
+                             [prop1])
+    assert prop2[0] == 4
+    inp[0] = 2
+    assert prop2[0] == 6
+
+
+def test_property_map_pickle():
+    prop = DefaultPropertyMap(set([0, 1]), 'z', {0: 'a'})
+    nprop = pickle.loads(pickle.dumps(prop, pickle.HIGHEST_PROTOCOL))
+    assert nprop[0] == 'a'
+    assert nprop[1] == 'z'
+    assert nprop._revision == prop._revision
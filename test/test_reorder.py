@@ -0,0 +1,63 @@
+from nose.tools import assert_raises
+
+from openalea.container.graph import Graph, GraphError
+from openalea.container.reorder import (insertion_order,
+                                        degree_order,
+                                        bfs_order,
+                                        rcm_order,
+                                        vertex_order)
+
+
+def build_path(vids):
+    g = Graph()
+    for vid in vids:
+        g.add_vertex(vid)
+    for sid, tid in zip(vids[:-1], vids[1:]):
+        g.add_edge(sid, tid)
+    return g
+
+
+def bandwidth(g, order):
+    pos = dict((vid, i) for i, vid in enumerate(order))
+    return max(abs(pos[g.source(eid)] - pos[g.target(eid)])
+               for eid in g.edges())
+
+
+def test_orders_are_permutations():
+    g = build_path([5, 0, 9, 3, 7, 1])
+    g.add_vertex(20)
+    for func in (insertion_order, degree_order, bfs_order, rcm_order):
+        assert sorted(func(g)) == sorted(g.vertices())
+
+
+def test_degree_order():
+    g = build_path([5, 0, 9])
+    assert degree_order(g) == [0, 5, 9]
+
+
+def test_bfs_order():
+    g = build_path([5, 0, 9, 3])
+    assert bfs_order(g) == [0, 5, 9, 3]
+    assert bfs_order(g, [3]) == [3, 9, 0, 5]
+
+
+def test_rcm_order_reduce_bandwidth():
+    vids = [5, 0, 9, 3, 7, 1, 8, 2, 6, 4]
+    g = build_path(vids)
+    assert bandwidth(g, insertion_order(g)) > 1
+    assert bandwidth(g, rcm_order(g)) == 1
+
+
+def test_vertex_order_by_name():
+    g = build_path([5, 0, 9])
+    assert vertex_order(g, "bfs") == bfs_order(g)
+    assert_raises(UserWarning, lambda: vertex_order(g, "toto"))
+
+
+def test_compact_with_rcm_or_explicit_order():
+    g = build_path([5, 0, 9, 3, 7, 1, 8, 2, 6, 4])
+    g.compact("rcm")
+    assert bandwidth(g, range(10)) == 1
+    trans_vid, trans_eid = g.compact(list(reversed(range(10))))
+    assert trans_vid[0] == 9
+    assert_raises(GraphError, lambda: g.compact([0, 1]))
@@ -0,0 +1,176 @@
+import gc
+
+from nose.tools import assert_raises
+
+from openalea.container.graph import Graph
+from openalea.container.instrument import (instrument, is_instrumented,
+                                           uninstrument)
+from openalea.container.property_graph import PropertyGraph
+from openalea.container.property_map import PropertyMap
+from openalea.container.snapshot import SnapshotError
+
+from . import chain_graph
+
+
+def test_snapshot_is_not_affected_by_modifications():
+    g = chain_graph()
+    snap = g.snapshot()
+    g.remove_vertex(2)
+    g.add_edge(4, 0, 10)
+    vid = g.add_vertex(7)
+    g.add_edge(vid, 4)
+
+    assert sorted(snap.vertices()) == range(5)
+    assert snap.nb_vertices() == 5
+    assert sorted(snap.edges()) == range(4)
+    assert snap.edge_vertices(1) == (1, 2)
+    assert sorted(snap.neighbors(2)) == [1, 3]
+    assert list(snap.out_edges(4)) == []
+    assert not snap.has_edge(10)
+    assert vid not in snap
+
+    assert sorted(g.vertices()) == [0, 1, 3, 4, vid]
+    assert sorted(g.out_neighbors(4)) == [0]
+
+
+def test_snapshot_share_unmodified_elements():
+    g = chain_graph()
+    snap = g.snapshot()
+    g.add_edge(0, 4, 10)
+    journal = g._journal
+    assert sorted(journal.current.tables["vertices"]) == [0, 4]
+    assert journal.current.tables["edges"] == {10: journal.current.tables[
+        "edges"][10]}
+    assert snap._vertices[2] is g._vertices[2]
+
+
+def test_successive_snapshots():
+    g = chain_graph()
+    snaps = []
+    for i in range(3):
+        snaps.append(g.snapshot())
+        g.remove_edge(i)
+    g.clear()
+
+    for i, snap in enumerate(snaps):
+        assert sorted(snap.edges()) == range(i, 4)
+        assert snap.nb_vertices() == 5
+    assert g.nb_vertices() == 0
+
+
+def test_snapshot_release_journal():
+    g = chain_graph()
+    snap0 = g.snapshot()
+    g.remove_edge(0)
+    snap1 = g.snapshot()
+    g.remove_edge(1)
+    snap2 = g.snapshot()
+    g.remove_edge(2)
+
+    del snap1
+    gc.collect()
+    assert sorted(snap0.edges()) == range(4)
+    assert sorted(snap2.edges()) == [2, 3]
+    del snap0
+    del snap2
+    gc.collect()
+    assert "_journal" not in g.__dict__
+    assert "remove_edge" not in g.__dict__
+
+
+def test_snapshot_is_read_only():
+    g = chain_graph(PropertyGraph)
+    snap = g.snapshot()
+    assert_raises(SnapshotError, lambda: snap.add_vertex())
+    assert_raises(SnapshotError, lambda: snap.remove_edge(0))
+    assert_raises(SnapshotError, lambda: snap.add_vertex_property("toto"))
+
+
+def test_snapshot_compact_and_copy():
+    g = chain_graph()
+    g.remove_vertex(0)
+    snap = g.snapshot()
+    g.compact()
+    assert sorted(snap.vertices()) == [1, 2, 3, 4]
+    assert sorted(g.vertices()) == [0, 1, 2, 3]
+
+    cg = snap.copy()
+    assert type(cg) is Graph
+    assert sorted(cg.vertices()) == [1, 2, 3, 4]
+    assert cg.edge_vertices(3) == (3, 4)
+    cg.add_vertex()
+
+
+def test_property_graph_snapshot():
+    g = chain_graph(PropertyGraph)
+    g.add_vertex_property("name", PropertyMap((i, 'v%d' % i)
+                                              for i in range(5)))
+    g.add_vertex_property("size", default=0)
+    g.add_edge_property("weight", PropertyMap((i, i * 2.)
+                                              for i in range(4)))
+    g.add_graph_property("step", 0)
+    g.add_computed_vertex_property("deg",
+                                   lambda graph, vid: graph.nb_edges(vid))
+    g.create_vertex_index("name")
+
+    snap = g.snapshot()
+    g.vertex_property("name")[1] = 'new'
+    g.vertex_property("size")[2] = 5
+    g.remove_vertex(3)
+    g.edge_property("weight").clear()
+    g.graph_property("step")
+    g.remove_graph_property("step")
+
+    assert snap.vertex_property("name")[1] == 'v1'
+    assert snap.vertex_property("name")[3] == 'v3'
+    assert snap.vertex_property("size")[2] == 0
+    assert dict(snap.edge_property("weight")) == {0: 0., 1: 2., 2: 4.,
+                                                  3: 6.}
+    assert snap.graph_property("step") == 0
+    assert "deg" not in list(snap.vertex_property_names())
+    assert snap.find_vertices("name", 'v1') == {1}
+    assert g.find_vertices("name", 'new') == {1}
+
+    cg = snap.copy()
+    assert type(cg) is PropertyGraph
+    assert cg.vertex_property("name")[1] == 'v1'
+    assert cg.vertex_property("size")[4] == 0
+
+    prop = snap.vertex_property("name")
+    del snap
+    gc.collect()
+    g.vertex_property("name")[0] = 'new'
+    assert prop[0] == 'v0'
+
+
+def test_snapshot_independent_of_other_trackers():
+    g = chain_graph()
+    tracker = g.track_components()
+    snap = g.snapshot()
+    tracker.detach()
+    g.add_edge(0, 4)
+    assert snap.nb_edges() == 4
+    assert g.nb_edges() == 5
+
+
+def test_snapshot_release_keep_instrumentation():
+    g = chain_graph()
+    stats = instrument(g)
+    snap = g.snapshot()
+    g.add_vertex()
+    del snap
+    gc.collect()
+    assert "_journal" not in g.__dict__
+    g.add_vertex()
+    assert stats.nb_calls("Graph.add_vertex") == 2
+    uninstrument(g)
+    assert not is_instrumented(g)
+
+
+def test_snapshot_copy_plain_dict_properties():
+    g = chain_graph(PropertyGraph)
+    values = {0: 'a'}
+    g.add_vertex_property("plain", values)
+    snap = g.snapshot()
+    values[0] = 'b'
+    assert snap.vertex_property("plain")[0] == 'a'
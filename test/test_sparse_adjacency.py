@@ -0,0 +1,72 @@
+import numpy as np
+from nose.tools import assert_raises
+
+from openalea.container.graph import Graph
+from openalea.container.property_graph import PropertyGraph
+
+
+def build_graph(cls=Graph):
+    g = cls()
+    for vid in (0, 2, 5, 7):
+        g.add_vertex(vid)
+    g.add_edge(0, 2, 0)
+    g.add_edge(0, 2, 1)
+    g.add_edge(2, 5, 2)
+    g.add_edge(7, 0, 3)
+    return g
+
+
+def test_to_sparse_count_edges():
+    g = build_graph()
+    mat, index = g.to_sparse()
+    assert index == {0: 0, 2: 1, 5: 2, 7: 3}
+    assert mat.shape == (4, 4)
+    assert mat.format == "csr"
+    dense = mat.toarray()
+    assert dense[0, 1] == 2
+    assert dense[1, 2] == 1
+    assert dense[3, 0] == 1
+    assert dense.sum() == 4
+
+
+def test_to_sparse_use_vertex_order():
+    g = build_graph()
+    mat, index = g.to_sparse(vertex_order=[2, 0], fmt="coo")
+    assert mat.format == "coo"
+    assert index == {2: 0, 0: 1}
+    assert mat.toarray().tolist() == [[0, 0], [2, 0]]
+    assert_raises(ValueError, lambda: g.to_sparse(vertex_order=[0, 0]))
+    assert_raises(UserWarning, lambda: g.to_sparse(fmt="toto"))
+
+
+def test_to_sparse_use_weights():
+    g = build_graph(PropertyGraph)
+    g.add_edge_property("w", {0: 1., 1: 2., 2: 3., 3: 4.})
+    mat, index = g.to_sparse("w")
+    assert mat.toarray()[0, 1] == 3.
+    mat, index = g.to_sparse(g.edge_property("w"))
+    assert mat.toarray()[3, 0] == 4.
+    # edges outside vertex_order need no weight
+    mat, index = g.to_sparse({0: 1., 1: 2.}, vertex_order=[0, 2])
+    assert mat.toarray().tolist() == [[0., 3.], [0., 0.]]
+
+
+def test_from_sparse():
+    dense = np.array([[0, 1, 0], [0, 0, 2], [3, 0, 0]])
+    g = Graph.from_sparse(dense)
+    assert sorted(g.vertices()) == [0, 1, 2]
+    assert g.edge_vertices(0) == (0, 1)
+    assert g.edge_vertices(1) == (1, 2)
+    assert g.edge_vertices(2) == (2, 0)
+
+    pg = PropertyGraph.from_sparse(dense, "w")
+    assert pg.edge_property("w") == {0: 1, 1: 2, 2: 3}
+    assert_raises(ValueError, lambda: Graph.from_sparse(np.zeros((2, 3))))
+
+
+def test_sparse_round_trip():
+    g = build_graph(PropertyGraph)
+    g.add_edge_property("w", {0: 1., 1: 2., 2: 3., 3: 4.})
+    mat, index = g.to_sparse("w")
+    ng = PropertyGraph.from_sparse(mat, "w")
+    assert (ng.to_sparse("w")[0] != mat).nnz == 0
@@ -0,0 +1,98 @@
+from random import Random
+
+from nose.tools import assert_raises
+
+from openalea.container.grid import Grid
+from openalea.container.sparse_grid import SparseGrid
+
+
+def test_sparse_grid_single_cells():
+    grid = Grid((10, 7, 5))
+    sg = SparseGrid(grid, (4, 4, 4))
+    assert len(sg) == 0
+    ind = grid.index((9, 6, 4))
+    sg[ind] = "a"
+    sg[3] = "b"
+    sg[3] = "c"
+    assert len(sg) == 2
+    assert sg[ind] == "a"
+    assert sg[3] == "c"
+    assert 4 not in sg
+    assert -1 not in sg
+    assert 3. not in sg
+    assert_raises(TypeError, lambda: sg.__setitem__(4., 0))
+    assert sg.get(4, "d") == "d"
+    assert_raises(KeyError, lambda: sg[4])
+    assert_raises(IndexError, lambda: sg.__setitem__(len(grid), 0))
+    assert sg.nb_blocks() == 2
+
+    del sg[3]
+    assert len(sg) == 1
+    assert sg.nb_blocks() == 1
+    assert_raises(KeyError, lambda: sg.__delitem__(3))
+    sg.clear()
+    assert len(sg) == 0
+    assert list(sg) == []
+
+
+def test_sparse_grid_dense_blocks():
+    grid = Grid((8, 8))
+    sg = SparseGrid(grid, (4, 4), density=0.5)
+    cells = list(grid.iter_box((0, 0), (4, 3)))
+    sg.update(cells, [i * 10 for i in cells])
+    assert sg.nb_blocks() == 1
+    assert sg.nb_dense_blocks() == 1
+    assert len(sg) == 12
+    assert all(sg[i] == i * 10 for i in cells)
+    assert 1. not in sg
+    assert "a" not in sg
+
+    for ind in cells[:11]:
+        del sg[ind]
+    assert sg.nb_dense_blocks() == 0
+    assert list(sg.iteritems()) == [(cells[11], cells[11] * 10)]
+
+
+def test_sparse_grid_iterates_in_index_order():
+    grid = Grid((30, 20, 10))
+    rnd = Random(0)
+    ref = dict((rnd.randrange(len(grid)), rnd.random()) for i in range(500))
+    # a full block
+    ref.update((ind, 1.) for ind in grid.iter_box((0, 0, 0), (8, 8, 8)))
+    sg = SparseGrid(grid, (8, 8, 8))
+    sg.update(ref.keys(), ref.values())
+    assert sg.nb_dense_blocks() >= 1
+    assert len(sg) == len(ref)
+    assert sg.keys().tolist() == sorted(ref)
+    assert list(sg.iteritems()) == sorted(ref.items())
+    assert list(sg.itervalues()) == [ref[ind] for ind in sorted(ref)]
+
+
+def test_sparse_grid_neighbors():
+    grid = Grid((5, 4))
+    sg = SparseGrid(grid, (2, 2))
+    sg.update([grid.index(c) for c in [(1, 1), (2, 1), (1, 2), (0, 0)]],
+              "abcd")
+    assert sorted(sg.neighbors(grid.index((1, 1)))) == [
+        (grid.index((2, 1)), "b"), (grid.index((1, 2)), "c")]
+    assert sg.neighbors(grid.index((4, 3))) == []
+    # no wrap around along first axis
+    sg[grid.index((4, 0))] = "e"
+    assert sorted(sg.neighbors(grid.index((0, 1)))) == [
+        (grid.index((0, 0)), "d"), (grid.index((1, 1)), "a")]
+    assert_raises(IndexError, lambda: sg.neighbors(len(grid)))
+
+
+def test_sparse_grid_huge_domain():
+    grid = Grid((4096, 4096, 4096))
+    sg = SparseGrid(grid)
+    last = len(grid) - 1
+    sg.update([0, last], [1, 2])
+    sg[12345678901] = 3
+    assert sg.keys().tolist() == [0, 12345678901, last]
+    assert sg[last] == 2
+    assert sg.nb_blocks() == 3
+
+
+def test_sparse_grid_requires_row_order():
+    assert_raises(ValueError, lambda: SparseGrid(Grid((4, 4), "hilbert")))
@@ -0,0 +1,152 @@
+from nose.tools import assert_raises, with_setup
+
+from openalea.container.graph import (Graph,
+                                      GraphError,
+                                      InvalidVertex,
+                                      InvalidEdge)
+from openalea.container.tree import Tree
+
+
+t = Tree()
+
+
+def setup_func():
+    #      0
+    #    /   \
+    #   1     2
+    #  / \    |
+    # 3   4   5
+    #         |
+    #         6
+    t.add_vertex(0)
+    t.add_child(0, 1)
+    t.add_child(0, 2)
+    t.add_child(1, 3)
+    t.add_child(1, 4)
+    t.add_child(2, 5)
+    t.add_child(5, 6)
+
+
+def teardown_func():
+    t.clear()
+
+
+@with_setup(setup_func, teardown_func)
+def test_tree_parent_children():
+    assert t.root() == 0
+    assert t.parent(0) is None
+    assert t.parent(4) == 1
+    assert list(t.children(1)) == [3, 4]
+    assert t.nb_children(2) == 1
+    assert t.is_leaf(6)
+    assert not t.is_leaf(5)
+
+
+@with_setup(setup_func, teardown_func)
+def test_tree_depth():
+    assert t.depth(0) == 0
+    assert t.depth(2) == 1
+    assert t.depth(6) == 3
+
+
+@with_setup(setup_func, teardown_func)
+def test_tree_preorder_and_subtree():
+    assert t.preorder() == [0, 1, 3, 4, 2, 5, 6]
+    assert t.subtree(2) == [2, 5, 6]
+    assert t.subtree(3) == [3]
+    assert t.subtree_range(0) == (0, 7)
+    assert t.nb_descendants(1) == 2
+
+
+@with_setup(setup_func, teardown_func)
+def test_tree_is_ancestor():
+    assert t.is_ancestor(0, 6)
+    assert t.is_ancestor(2, 6)
+    assert t.is_ancestor(6, 6)
+    assert not t.is_ancestor(1, 6)
+    assert not t.is_ancestor(6, 2)
+
+
+@with_setup(setup_func, teardown_func)
+def test_tree_index_follow_modifications():
+    assert t.subtree(1) == [1, 3, 4]
+    t.add_child(4, 7)
+    assert t.subtree(1) == [1, 3, 4, 7]
+    assert t.is_ancestor(1, 7)
+    t.remove_vertex(1)
+    assert t.preorder() == [0, 2, 5, 6]
+    for vid in (1, 3, 4, 7):
+        assert vid not in t
+
+
+@with_setup(setup_func, teardown_func)
+def test_tree_preorder_extended_along_last_branch():
+    assert t.subtree_range(2) == (4, 7)
+    t.add_child(2, 7)
+    t.add_child(7, 8)
+    t.add_child(0, 9)
+    assert t.preorder() == [0, 1, 3, 4, 2, 5, 6, 7, 8, 9]
+    assert t.subtree_range(0) == (0, 10)
+    assert t.subtree_range(2) == (4, 9)
+    assert t.subtree_range(7) == (7, 9)
+    assert t.subtree_range(5) == (5, 7)
+    assert t.is_ancestor(7, 8)
+    assert not t.is_ancestor(7, 9)
+    t.add_child(3, 10)
+    assert t.subtree(1) == [1, 3, 10, 4]
+    assert t.subtree_range(9) == (10, 11)
+
+
+@with_setup(setup_func, teardown_func)
+def test_tree_graph_read_api():
+    assert t.nb_vertices() == 7
+    assert len(t) == 7
+    assert t.nb_edges() == 6
+    assert sorted(t.edges()) == [1, 2, 3, 4, 5, 6]
+    assert t.source(5) == 2
+    assert t.target(5) == 5
+    assert t.edge_vertices(4) == (1, 4)
+    assert t.edge(1, 4) == 4
+    assert t.edge(2, 4) is None
+    assert not t.has_edge(0)
+    assert list(t.in_edges(0)) == []
+    assert list(t.in_edges(5)) == [5]
+    assert list(t.out_edges(1)) == [3, 4]
+    assert sorted(t.neighbors(1)) == [0, 3, 4]
+    assert sorted(t.edges(1)) == [1, 3, 4]
+    assert t.nb_neighbors(1) == 3
+    assert t.nb_in_edges(0) == 0
+    assert t.nb_out_edges(0) == 2
+
+
+@with_setup(setup_func, teardown_func)
+def test_tree_do_not_accept_invalid_ids():
+    for vid in (None, 'a', -1, 100):
+        assert_raises(InvalidVertex, lambda: t.parent(vid))
+        assert_raises(InvalidVertex, lambda: t.depth(vid))
+        assert_raises(InvalidVertex, lambda: t.add_child(vid))
+        assert_raises(InvalidVertex, lambda: t.remove_vertex(vid))
+        assert_raises(InvalidVertex, lambda: tuple(t.in_edges(vid)))
+        assert_raises(InvalidEdge, lambda: t.source(vid))
+
+    assert_raises(InvalidEdge, lambda: t.source(0))
+    assert_raises(InvalidVertex, lambda: t.add_child(0, 1))
+    assert_raises(GraphError, lambda: t.add_vertex())
+
+
+def test_tree_from_graph():
+    g = Graph()
+    for i in range(5):
+        g.add_vertex(i)
+    g.add_edge(0, 1)
+    g.add_edge(0, 2)
+    g.add_edge(2, 3)
+    g.add_edge(2, 4)
+    tree = Tree.from_graph(g, 0)
+    assert tree.root() == 0
+    assert sorted(tree.children(2)) == [3, 4]
+    assert tree.depth(4) == 2
+
+    g.add_edge(1, 3)
+    assert_raises(GraphError, lambda: Tree.from_graph(g, 0))
+    assert_raises(GraphError, lambda: Tree.from_graph(g, 2))
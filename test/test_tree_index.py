@@ -0,0 +1,109 @@
+from random import Random
+
+from nose.tools import assert_raises
+
+from openalea.container.graph import Graph, GraphError, InvalidVertex
+from openalea.container.tree_index import TreeIndex
+
+
+def build_tree():
+    #      0
+    #    /   \
+    #   1     2
+    #  / \    |
+    # 3   4   5
+    #         |
+    #         6
+    g = Graph()
+    for i in range(7):
+        g.add_vertex(i)
+    for sid, tid in [(0, 1), (0, 2), (1, 3), (1, 4), (2, 5), (5, 6)]:
+        g.add_edge(sid, tid)
+    return g
+
+
+def test_tree_index_depth_parent():
+    ind = TreeIndex(build_tree(), 0)
+    assert ind.root() == 0
+    assert ind.depth(0) == 0
+    assert ind.depth(6) == 3
+    assert ind.parent(0) is None
+    assert ind.parent(6) == 5
+
+
+def test_tree_index_lca():
+    ind = TreeIndex(build_tree(), 0)
+    assert ind.lca(3, 4) == 1
+    assert ind.lca(3, 6) == 0
+    assert ind.lca(5, 6) == 5
+    assert ind.lca(6, 5) == 5
+    assert ind.lca(2, 2) == 2
+    assert ind.distance(3, 6) == 5
+    assert ind.distance(4, 4) == 0
+
+
+def test_tree_index_ancestor_subtree():
+    ind = TreeIndex(build_tree(), 0)
+    assert ind.is_ancestor(0, 6)
+    assert ind.is_ancestor(2, 6)
+    assert not ind.is_ancestor(1, 6)
+    assert sorted(ind.subtree(2)) == [2, 5, 6]
+    start, stop = ind.subtree_range(1)
+    assert stop - start == 3
+    assert sorted(ind.preorder()) == range(7)
+
+
+def test_tree_index_restricted_to_subtree_of_root():
+    ind = TreeIndex(build_tree(), 2)
+    assert ind.depth(6) == 2
+    assert_raises(InvalidVertex, lambda: ind.depth(1))
+    assert_raises(InvalidVertex, lambda: ind.lca(1, 6))
+
+
+def test_tree_index_is_rebuilt_after_modification():
+    g = build_tree()
+    ind = TreeIndex(g, 0)
+    assert ind.is_up_to_date()
+    vid = g.add_vertex()
+    g.add_edge(4, vid)
+    assert not ind.is_up_to_date()
+    assert ind.depth(vid) == 3
+    assert ind.lca(vid, 3) == 1
+    assert ind.is_up_to_date()
+
+    g.remove_vertex(1)
+    assert_raises(InvalidVertex, lambda: ind.depth(vid))
+
+
+def test_tree_index_refuse_non_tree():
+    g = build_tree()
+    g.add_edge(3, 6)
+    assert_raises(GraphError, lambda: TreeIndex(g, 0))
+    assert_raises(InvalidVertex, lambda: TreeIndex(g, 100))
+
+
+def test_tree_index_lca_match_naive_walk():
+    rnd = Random(0)
+    g = Graph()
+    g.add_vertex(0)
+    parent = {0: None}
+    for vid in range(1, 200):
+        pid = rnd.randrange(vid)
+        g.add_vertex(vid)
+        g.add_edge(pid, vid)
+        parent[vid] = pid
+
+    def ancestors(vid):
+        res = []
+        while vid is not None:
+            res.append(vid)
+            vid = parent[vid]
+        return res
+
+    ind = TreeIndex(g, 0)
+    for i in range(200):
+        vid1 = rnd.randrange(200)
+        vid2 = rnd.randrange(200)
+        anc2 = set(ancestors(vid2))
+        expected = [vid for vid in ancestors(vid1) if vid in anc2][0]
+        assert ind.lca(vid1, vid2) == expected
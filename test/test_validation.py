@@ -0,0 +1,112 @@
+from openalea.container.graph import Graph
+from openalea.container.validation import (consistency_errors, find_cycle,
+                                           is_acyclic, is_forest, is_tree)
+
+
+def build_tree():
+    g = Graph()
+    for i in range(6):
+        g.add_vertex(i)
+    for eid, (sid, tid) in enumerate([(0, 1), (0, 2), (1, 3),
+                                      (1, 4), (2, 5)]):
+        g.add_edge(sid, tid, eid)
+    return g
+
+
+def test_consistency():
+    g = build_tree()
+    assert consistency_errors(g) == []
+    assert g.is_valid()
+
+    # corrupt internal structures
+    g._vertices[3].remove_in_edge(2)
+    g._revision += 1
+    assert len(consistency_errors(g)) == 1
+    assert not g.is_valid()
+
+    g = build_tree()
+    g._vertices[5].add_in_edge(1)
+    g._revision += 1
+    assert len(consistency_errors(g)) == 2
+
+
+def test_find_cycle():
+    g = build_tree()
+    assert find_cycle(g) is None
+    assert is_acyclic(g)
+
+    g.add_edge(5, 0, 10)
+    cycle = g.find_cycle()
+    assert cycle == [1, 4, 10]
+    assert not g.is_acyclic()
+
+    g.remove_edge(10)
+    assert g.is_acyclic()
+
+    # diamond is acyclic
+    g.add_edge(3, 5)
+    assert g.is_acyclic()
+
+    g.add_edge(4, 4, 20)
+    assert g.find_cycle() == [20]
+
+
+def test_tree():
+    g = build_tree()
+    assert is_tree(g)
+    assert g.is_tree(0)
+    assert not g.is_tree(1)
+    assert g.is_forest()
+
+    g.remove_edge(0)
+    assert not g.is_tree()
+    assert g.is_forest()
+    assert is_forest(g)
+
+    # two parents
+    g.add_edge(2, 3)
+    assert not g.is_tree()
+    assert not g.is_forest()
+
+    # a cycle disconnected from the roots
+    g = build_tree()
+    g.add_vertex(10)
+    g.add_vertex(11)
+    g.add_edge(10, 11)
+    g.add_edge(11, 10)
+    assert not g.is_forest()
+    assert not g.is_tree()
+
+    assert not Graph().is_tree()
+    assert Graph().is_forest()
+
+
+def test_results_are_memoized_on_demand():
+    g = build_tree()
+    assert g.is_tree()
+    assert "_validation_memo" not in g.__dict__
+    assert is_tree(g, memoize=True)
+    memo = g._validation_memo
+    assert is_tree(g, memoize=True)
+    assert g._validation_memo is memo
+
+    g.add_vertex()
+    assert not is_tree(g, memoize=True)
+    assert g._validation_memo is not memo
+
+
+def test_direct_corruption_is_always_detected():
+    g = build_tree()
+    assert g.is_valid()
+    del g._edges[0]
+    assert not g.is_valid()
+    assert len(consistency_errors(g)) > 0
+
+
+def test_validation_of_snapshot():
+    g = build_tree()
+    snap = g.snapshot()
+    g.add_edge(5, 0)
+    assert not g.is_acyclic()
+    assert snap.is_tree()
+    assert snap.is_valid()
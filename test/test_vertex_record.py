@@ -0,0 +1,79 @@
+import sys
+from copy import deepcopy
+from pickle import dumps, loads
+
+from nose.tools import assert_raises
+
+from openalea.container.vertex_record import VertexRecord, INLINE_MAX
+
+
+def test_record_is_empty_on_creation():
+    rec = VertexRecord()
+    assert tuple(rec.in_edges()) == ()
+    assert tuple(rec.out_edges()) == ()
+    assert rec.nb_in_edges() == 0
+    assert rec.nb_out_edges() == 0
+
+
+def test_record_add_remove_edges():
+    rec = VertexRecord()
+    rec.add_in_edge(1)
+    rec.add_out_edge(2)
+    rec.add_out_edge(3)
+    assert tuple(rec.in_edges()) == (1,)
+    assert set(rec.out_edges()) == {2, 3}
+    rec.remove_out_edge(2)
+    assert tuple(rec.out_edges()) == (3,)
+    rec.remove_in_edge(1)
+    assert rec.nb_in_edges() == 0
+    assert_raises(KeyError, lambda: rec.remove_in_edge(1))
+    assert_raises(KeyError, lambda: rec.remove_out_edge(2))
+
+
+def test_record_does_not_store_twice_the_same_edge():
+    rec = VertexRecord()
+    rec.add_out_edge(1)
+    rec.add_out_edge(1)
+    assert rec.nb_out_edges() == 1
+
+
+def test_record_grows_past_threshold():
+    rec = VertexRecord()
+    nb = INLINE_MAX * 3
+    for eid in range(nb):
+        rec.add_out_edge(eid)
+    assert set(rec.out_edges()) == set(range(nb))
+    assert isinstance(rec.out_edges(), set)
+    for eid in range(nb - 1):
+        rec.remove_out_edge(eid)
+    assert tuple(rec.out_edges()) == (nb - 1,)
+    assert_raises(KeyError, lambda: rec.remove_out_edge(0))
+
+
+def test_record_clear():
+    rec = VertexRecord()
+    rec.add_in_edge(0)
+    rec.add_out_edge(1)
+    rec.clear()
+    assert rec.nb_in_edges() == 0
+    assert rec.nb_out_edges() == 0
+
+
+def test_record_is_smaller_than_pair_of_sets():
+    rec = VertexRecord()
+    rec.add_in_edge(0)
+    rec.add_out_edge(1)
+    rec_size = (sys.getsizeof(rec) + sys.getsizeof(rec.in_edges()) +
+                sys.getsizeof(rec.out_edges()))
+    pair = (set([0]), set([1]))
+    pair_size = sys.getsizeof(pair) + sum(sys.getsizeof(s) for s in pair)
+    assert rec_size * 2 < pair_size
+
+
+def test_record_can_be_copied():
+    rec = VertexRecord()
+    rec.add_in_edge(0)
+    rec.add_out_edge(1)
+    for other in (deepcopy(rec), loads(dumps(rec))):
+        assert tuple(other.in_edges()) == (0,)
+        assert tuple(other.out_edges()) == (1,)